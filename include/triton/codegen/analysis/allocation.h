@@ -30,12 +30,18 @@ public:
   bool has_offset(const data_layout *x)    const { return offsets_.find(x) != offsets_.end(); }
   unsigned offset(const data_layout *x)    const { return offsets_.at(x); }
   unsigned allocated_size()        const { return allocated_size_; }
+  // fraction of the allocated memory that is wasted at peak usage
+  double fragmentation()           const { return fragmentation_; }
   // run
   void run(ir::module& mod);
 
+private:
+  unsigned get_alignment(shared_layout *x);
+
 private:
   std::map<const data_layout*, unsigned> offsets_;
   size_t allocated_size_;
+  double fragmentation_;
   // dependences
   liveness *liveness_;
 };
@@ -129,6 +129,10 @@ struct scanline_layout: public data_layout {
   // accessor
   int mts(size_t k) { return mts_.at(k); }
   int nts(size_t k) { return nts_.at(k); }
+  // distance between the linear ids of consecutive threads along axis k
+  int thread_stride(size_t k);
+  // number of consecutive threads along axis k within a warp
+  int warp_span(size_t k);
 
 public:
   std::vector<int> mts_;
@@ -161,7 +165,7 @@ public:
                 const std::vector<unsigned>& shapes,
                 const std::vector<ir::value *> &values_,
                 ir::type *ty,
-                analysis::align* align);
+                analysis::align* align, target *tgt);
   void accept(layout_visitor* vst) { vst->visit_layout_shared(this); }
   // accessors
   size_t get_size()                         { return size_; }
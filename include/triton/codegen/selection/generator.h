@@ -61,6 +61,8 @@ typedef llvm::Constant Constant;
 typedef llvm::ArrayType ArrayType;
 typedef llvm::Function Function;
 typedef std::vector<Value*> indices_t;
+// (value, index) pair; the index is null for reductions that do not track it
+typedef std::pair<Value*, Value*> acc_t;
 class target;
 
 }
@@ -107,6 +109,8 @@ private:
   void init_idx(ir::value *x);
   Instruction* add_barrier();
   Value* shared_off(const std::vector<unsigned>& shapes, const std::vector<int>& order, indices_t idx);
+  Value* horner(Value *x, const std::vector<double>& coeffs);
+  Value* reduce_angle(Value *x);
   void finalize_shared_layout(analysis::shared_layout*);
   void finalize_function(ir::function*);
   void finalize_phi_node(ir::phi_node*);
@@ -153,6 +157,13 @@ public:
   void visit_downcast_inst(ir::downcast_inst*);
   void visit_exp_inst(ir::exp_inst*);
   void visit_log_inst(ir::log_inst*);
+  void visit_sin_inst(ir::sin_inst*);
+  void visit_cos_inst(ir::cos_inst*);
+  void visit_tanh_inst(ir::tanh_inst*);
+  void visit_erf_inst(ir::erf_inst*);
+  void visit_rsqrt_inst(ir::rsqrt_inst*);
+  void visit_pow_inst(ir::pow_inst*);
+  void visit_umulhi_inst(ir::umulhi_inst*);
   void visit_get_program_id_inst(ir::get_program_id_inst*);
   void visit_get_num_programs_inst(ir::get_num_programs_inst*);
   void visit_atomic_cas_inst(ir::atomic_cas_inst*);
@@ -164,9 +175,10 @@ public:
   void visit_dot_inst(ir::dot_inst*);
   void visit_trans_inst(ir::trans_inst*);
   void visit_sqrt_inst(ir::sqrt_inst*);
-  void visit_reduce1d_inst(ir::reduce_inst*, std::function<Value*(Value*,Value*)>, Value*);
-  void visit_reducend_inst(ir::reduce_inst*, std::function<Value*(Value*,Value*)>, Value*);
+  void visit_reduce1d_inst(ir::reduce_inst*, std::function<acc_t(acc_t,acc_t)>, acc_t);
+  void visit_reducend_inst(ir::reduce_inst*, std::function<acc_t(acc_t,acc_t)>, acc_t);
   void visit_reduce_inst(ir::reduce_inst*);
+  void visit_scan_inst(ir::scan_inst*);
   void visit_select_inst(ir::select_inst*);
   void visit_recoalesce_inst(ir::recoalesce_inst*);
   void visit_masked_load_async_inst(ir::masked_load_async_inst*);
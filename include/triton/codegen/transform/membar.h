@@ -14,6 +14,7 @@ namespace ir {
   class basic_block;
   class instruction;
   class masked_load_async_inst;
+  class io_inst;
   class value;
   class builder;
 }
@@ -46,14 +47,18 @@ private:
   int group_of(triton::ir::value *i, std::vector<triton::ir::value *> &async_write);
   bool intersect_with(analysis::shared_layout* a_layout, analysis::shared_layout* b_layout);
   val_set_t intersect_with(const val_set_t& as, const val_set_t& bs);
+  bool global_hazard(ir::io_inst* i, const val_set_t& accesses);
   void transfer(ir::basic_block *block, val_vec_t &async_write, val_set_t &sync_write, val_set_t &sync_read,
+                val_set_t &global_write, val_set_t &global_read,
                 std::set<triton::ir::value *> &safe_war, bool &inserted, ir::builder &builder);
 
 public:
   membar(analysis::liveness *liveness, analysis::layouts *layouts, analysis::allocation *alloc, 
          transform::prefetch *prefetch, target* tgt):
-    liveness_(liveness), layouts_(layouts), alloc_(alloc), prefetch_(prefetch), tgt_(tgt) {}
+    liveness_(liveness), layouts_(layouts), alloc_(alloc), prefetch_(prefetch), tgt_(tgt), num_barriers_(0) {}
   void run(ir::module &mod);
+  // number of barriers in the module after the pass has run
+  size_t get_num_barriers() const { return num_barriers_; }
 
 private:
   analysis::liveness *liveness_;
@@ -62,6 +67,11 @@ private:
   transform::prefetch *prefetch_;
 
   target* tgt_;
+  // barriers inserted by this pass
+  std::set<ir::instruction*> inserted_;
+  // inserted barriers that turned out to be unnecessary
+  std::set<ir::instruction*> redundant_;
+  size_t num_barriers_;
 };
 
 
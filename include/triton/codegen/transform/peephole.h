@@ -34,6 +34,7 @@ private:
   bool rewrite_gep_ptr_min_off_plus_off(ir::instruction *value, ir::builder& builder);
   bool rewrite_select_masked_load(ir::instruction *value, ir::builder& builder);
   bool rewrite_load_to_shared(ir::instruction *value, ir::builder& builder);
+  bool rewrite_nonneg_lower_bound(ir::instruction *value, ir::builder& builder);
 
 private:
 
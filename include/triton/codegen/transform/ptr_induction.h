@@ -0,0 +1,41 @@
+#ifndef TDL_INCLUDE_CODEGEN_OPTIMIZE_PTR_INDUCTION_H
+#define TDL_INCLUDE_CODEGEN_OPTIMIZE_PTR_INDUCTION_H
+
+namespace triton {
+
+namespace ir {
+  class module;
+  class value;
+  class phi_node;
+  class builder;
+}
+
+namespace codegen{
+namespace transform{
+
+// Strength reduction of pointer induction variables
+// advanced by a uniform increment:
+//   p = phi(gep(splat(base), off), gep(p, splat(inc)))
+// becomes
+//   b = phi(base, gep(b, inc)); p = gep(splat(b), off)
+// where `off` is the loop-invariant offset block of the
+// initial value. Only the scalar base pointer is carried
+// across iterations and incremented, rather than a block
+// of 64-bit pointers.
+class ptr_induction {
+private:
+  bool is_uniform(ir::value *v, ir::value *&scalar);
+  bool decompose(ir::value *v, ir::value *&base, ir::value *&off, ir::builder &builder);
+  ir::value *rebuild(ir::value *base, ir::value *off, ir::value *like, ir::builder &builder);
+  bool rewrite_phi(ir::phi_node *phi, ir::builder &builder);
+
+public:
+  ptr_induction() {}
+  void run(ir::module &mod);
+};
+
+}
+}
+}
+
+#endif
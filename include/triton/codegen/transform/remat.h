@@ -0,0 +1,44 @@
+#ifndef TDL_INCLUDE_CODEGEN_OPTIMIZE_REMAT_H
+#define TDL_INCLUDE_CODEGEN_OPTIMIZE_REMAT_H
+
+#include <map>
+
+namespace triton {
+
+namespace ir {
+  class module;
+  class function;
+  class value;
+  class builder;
+}
+
+namespace codegen{
+namespace transform{
+
+// Register-pressure-aware rematerialization:
+// cheap block values (ranges, broadcasts, integer and pointer
+// arithmetic on them) that are live across a loop without being
+// used inside of it are re-computed after the loop when the
+// estimated register pressure within the loop exceeds a budget
+class remat {
+private:
+  bool is_cheap(ir::value *v, int depth);
+  unsigned get_num_regs(ir::value *v);
+  ir::value *clone(ir::value *v, ir::builder &builder, std::map<ir::value*, ir::value*> &cloned);
+  void run(ir::function *fn, ir::builder &builder);
+
+public:
+  remat(int num_warps): num_warps_(num_warps) {}
+  // registers available per thread
+  unsigned get_budget() const;
+  void run(ir::module &mod);
+
+private:
+  int num_warps_;
+};
+
+}
+}
+}
+
+#endif
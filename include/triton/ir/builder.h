@@ -130,10 +130,16 @@ public:
   value *create_xor(value *lhs, value *rhs);
   value *create_or(value *lhs, value *rhs);
   // Input/Output
-  value *create_load(value *arg);
-  value *create_store(value *ptr, value *val);
-  value *create_masked_load(value *arg, value *mask, value *false_value);
-  value *create_masked_store(value *ptr, value *val, value *mask);
+  value *create_load(value *arg, load_inst::CACHE_MODIFIER cache = load_inst::NONE,
+                     load_inst::EVICTION_POLICY eviction = load_inst::NORMAL);
+  value *create_store(value *ptr, value *val, store_inst::CACHE_MODIFIER cache = store_inst::NONE,
+                      store_inst::EVICTION_POLICY eviction = store_inst::NORMAL);
+  value *create_masked_load(value *arg, value *mask, value *false_value,
+                            load_inst::CACHE_MODIFIER cache = load_inst::NONE,
+                            load_inst::EVICTION_POLICY eviction = load_inst::NORMAL);
+  value *create_masked_store(value *ptr, value *val, value *mask,
+                             store_inst::CACHE_MODIFIER cache = store_inst::NONE,
+                             store_inst::EVICTION_POLICY eviction = store_inst::NORMAL);
   // Block instruction
   value *create_splat(value *arg, const type::block_shapes_t &shapes);
   value *create_reshape(value *arg, const type::block_shapes_t &shapes);
@@ -146,10 +152,19 @@ public:
   value *create_atomic_rmw(ir::atomic_rmw_op_t op, value *ptr, value *val, value *msk);
   value *create_exp(value* arg);
   value *create_log(value* arg);
+  value *create_sin(value* arg);
+  value *create_cos(value* arg);
+  value *create_tanh(value* arg);
+  value *create_erf(value* arg);
+  value *create_rsqrt(value* arg);
+  value *create_pow(value* x, value* y);
+  value *create_umulhi(value* x, value* y);
   value *create_dot(value *A, value *B, value *C);
   value *create_trans(value *A, const std::vector<int> &perm = {});
   value *create_sqrt(value *A);
   value *create_reduce(value *A, reduce_inst::op_t op, unsigned axis);
+  value *create_scan(value *A, scan_inst::op_t op, unsigned axis, bool exclusive);
+  value *create_scan(value *A, basic_block *combine, value *lhs, value *rhs, value *res, unsigned axis);
   value *create_select(value *pred, value *if_value, value *else_value);
   // Intrinsics
   value *create_copy_to_shared(value *arg);
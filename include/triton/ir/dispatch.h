@@ -66,8 +66,12 @@ struct dispatch{
   static ir::value *cast(ir::value *input, ir::type *type, ir::builder *builder);
 
   // memory operators
-  static ir::value *load(ir::value* ptr, ir::value* mask, ir::value* other, ir::builder *builder);
-  static ir::value *store(ir::value* ptr, ir::value *value, ir::value *mask, ir::builder *builder);
+  static ir::value *load(ir::value* ptr, ir::value* mask, ir::value* other,
+                         const std::string &cache_modifier, const std::string &eviction_policy,
+                         ir::builder *builder);
+  static ir::value *store(ir::value* ptr, ir::value *value, ir::value *mask,
+                          const std::string &cache_modifier, const std::string &eviction_policy,
+                          ir::builder *builder);
   static ir::value *atomic_cas(ir::value* ptr, ir::value *cmp, ir::value *val, ir::builder *builder);
   static ir::value *atomic_xchg(ir::value* ptr, ir::value *val, ir::builder *builder);
   static ir::value *atomic_add(ir::value* ptr, ir::value *val, ir::value *msk, ir::builder *builder);
@@ -87,11 +91,27 @@ struct dispatch{
   static ir::value *min(ir::value *input, unsigned int axis, ir::builder *builder);
   static ir::value *max(ir::value *input, unsigned int axis, ir::builder *builder);
   static ir::value *sum(ir::value *input, unsigned int axis, ir::builder *builder);
+  static ir::value *argmin(ir::value *input, unsigned int axis, ir::builder *builder);
+  static ir::value *argmax(ir::value *input, unsigned int axis, ir::builder *builder);
+
+  // scan
+  static ir::value *cumsum(ir::value *input, unsigned int axis, bool exclusive, ir::builder *builder);
+  static ir::value *cummax(ir::value *input, unsigned int axis, bool exclusive, ir::builder *builder);
+  static ir::value *cummin(ir::value *input, unsigned int axis, bool exclusive, ir::builder *builder);
+  static ir::value *associative_scan(ir::value *input, unsigned int axis, ir::basic_block *combine,
+                                     ir::value *lhs, ir::value *rhs, ir::value *res, ir::builder *builder);
 
   // math
   static ir::value *exp(ir::value *x, ir::builder *builder);
   static ir::value *log(ir::value *x, ir::builder *builder);
   static ir::value *sqrt(ir::value *x, ir::builder *builder);
+  static ir::value *sin(ir::value *x, ir::builder *builder);
+  static ir::value *cos(ir::value *x, ir::builder *builder);
+  static ir::value *tanh(ir::value *x, ir::builder *builder);
+  static ir::value *erf(ir::value *x, ir::builder *builder);
+  static ir::value *rsqrt(ir::value *x, ir::builder *builder);
+  static ir::value *pow(ir::value *x, ir::value *y, ir::builder *builder);
+  static ir::value *umulhi(ir::value *x, ir::value *y, ir::builder *builder);
 
   // internal (debug/optimization)
   static ir::value *multiple_of(ir::value *x, int value, ir::builder *builder);
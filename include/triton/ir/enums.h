@@ -143,9 +143,17 @@ enum value_id_t: unsigned {
   // math
   INST_EXP,
   INST_LOG,
+  INST_SIN,
+  INST_COS,
+  INST_TANH,
+  INST_ERF,
+  INST_RSQRT,
+  INST_POW,
+  INST_UMULHI,
   // array arithmetic
   INST_TRANS,
   INST_REDUCE,
+  INST_SCAN,
   INST_DOT,
   // intrinsics
   INST_COPY_TO_SHARED,
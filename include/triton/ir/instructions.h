@@ -381,19 +381,42 @@ private:
 //===----------------------------------------------------------------------===//
 
 class io_inst: public instruction {
+public:
+  // cache operators of the generated memory instructions
+  enum CACHE_MODIFIER {
+    NONE,
+    CA,
+    CG,
+    CS,
+    WB,
+    WT,
+  };
+  // L1 eviction priority hints
+  enum EVICTION_POLICY {
+    NORMAL,
+    EVICT_FIRST,
+    EVICT_LAST,
+  };
+
 protected:
-  io_inst(type *ty, value_id_t id, unsigned num_ops,
+  io_inst(type *ty, value_id_t id, unsigned num_ops, CACHE_MODIFIER cache, EVICTION_POLICY eviction,
           const std::string &name = "", instruction *next = nullptr);
 
 public:
   // accessors
   value *get_pointer_operand() { return get_operand(0); }
+  CACHE_MODIFIER get_cache_modifier() const { return cache_; }
+  EVICTION_POLICY get_eviction_policy() const { return eviction_; }
+
+private:
+  CACHE_MODIFIER cache_;
+  EVICTION_POLICY eviction_;
 };
 
 // load
 class load_inst: public io_inst {
 protected:
-  load_inst(value *ptr, value_id_t id, unsigned num_ops,
+  load_inst(value *ptr, value_id_t id, unsigned num_ops, CACHE_MODIFIER cache, EVICTION_POLICY eviction,
           const std::string &name = "", instruction *next = nullptr);
 
 private:
@@ -404,10 +427,12 @@ private:
 class unmasked_load_inst: public load_inst {
 private:
   std::string repr_impl() const { return "unmasked_load"; }
-  unmasked_load_inst(value *ptr, const std::string &name, instruction *next);
+  unmasked_load_inst(value *ptr, CACHE_MODIFIER cache, EVICTION_POLICY eviction,
+                     const std::string &name, instruction *next);
 
 public:
   static unmasked_load_inst* create(value *ptr,
+                                    CACHE_MODIFIER cache = NONE, EVICTION_POLICY eviction = NORMAL,
                                     const std::string &name = "",
                                     instruction *next = nullptr);
   _TRITON_DEFINE_CLONE(unmasked_load_inst)
@@ -419,6 +444,7 @@ class masked_load_inst: public load_inst {
 private:
   std::string repr_impl() const { return "masked_load"; }
   masked_load_inst(value *ptr, value *mask, value *false_value,
+                   CACHE_MODIFIER cache, EVICTION_POLICY eviction,
                    const std::string &name, instruction *next);
 
 public:
@@ -427,6 +453,7 @@ public:
   value *get_false_value_operand() { return get_operand(2); }
   // factory method
   static masked_load_inst* create(value *ptr, value *mask, value *false_value,
+                                  CACHE_MODIFIER cache = NONE, EVICTION_POLICY eviction = NORMAL,
                                   const std::string &name = "",
                                   instruction *next = nullptr);
   _TRITON_DEFINE_CLONE(masked_load_inst)
@@ -457,7 +484,7 @@ public:
 // store
 class store_inst: public io_inst {
 protected:
-  store_inst(value *ptr, value_id_t id, unsigned num_ops,
+  store_inst(value *ptr, value_id_t id, unsigned num_ops, CACHE_MODIFIER cache, EVICTION_POLICY eviction,
             const std::string &name = "", instruction *next = nullptr);
 
 public:
@@ -468,11 +495,13 @@ public:
 class unmasked_store_inst: public store_inst{
 private:
   std::string repr_impl() const { return "unmasked_store"; }
-  unmasked_store_inst(value *ptr, value *v, const std::string &name, instruction *next);
+  unmasked_store_inst(value *ptr, value *v, CACHE_MODIFIER cache, EVICTION_POLICY eviction,
+                      const std::string &name, instruction *next);
 
 public:
   // factory method
   static unmasked_store_inst* create(value* ptr, value *v,
+                                    CACHE_MODIFIER cache = NONE, EVICTION_POLICY eviction = NORMAL,
                                     const std::string &name = "",
                                     instruction *next = nullptr);
   _TRITON_DEFINE_CLONE(unmasked_store_inst)
@@ -483,6 +512,7 @@ class masked_store_inst: public store_inst{
 private:
   std::string repr_impl() const { return "masked_store"; }
   masked_store_inst(value *ptr, value *v, value *mask,
+                    CACHE_MODIFIER cache, EVICTION_POLICY eviction,
                     const std::string &name, instruction *next);
 
 public:
@@ -490,6 +520,7 @@ public:
   value *get_mask_operand() { return get_operand(2); }
   // factory method
   static masked_store_inst* create(value *ptr, value *v, value *mask,
+                                   CACHE_MODIFIER cache = NONE, EVICTION_POLICY eviction = NORMAL,
                                    const std::string &name = "",
                                    instruction *next = nullptr);
   _TRITON_DEFINE_CLONE(masked_store_inst)
@@ -605,7 +636,8 @@ private:
 
 class atomic_inst: public io_inst {
 public:
-  using io_inst::io_inst;
+  atomic_inst(type *ty, value_id_t id, unsigned num_ops, const std::string &name = "", instruction *next = nullptr)
+    : io_inst(ty, id, num_ops, NONE, NORMAL, name, next) { }
 };
 
 class atomic_rmw_inst: public atomic_inst {
@@ -668,6 +700,83 @@ public:
   static instruction* create(value *val, const std::string &name = "", instruction *next = nullptr);
 };
 
+class sin_inst: public builtin_inst {
+private:
+  sin_inst(value *val, const std::string &name = "", instruction *next = nullptr);
+  std::string repr_impl() const { return "sin"; }
+  _TRITON_DEFINE_CLONE(sin_inst)
+  _TRITON_DEFINE_ACCEPT(sin_inst)
+
+public:
+  static instruction* create(value *val, const std::string &name = "", instruction *next = nullptr);
+};
+
+class cos_inst: public builtin_inst {
+private:
+  cos_inst(value *val, const std::string &name = "", instruction *next = nullptr);
+  std::string repr_impl() const { return "cos"; }
+  _TRITON_DEFINE_CLONE(cos_inst)
+  _TRITON_DEFINE_ACCEPT(cos_inst)
+
+public:
+  static instruction* create(value *val, const std::string &name = "", instruction *next = nullptr);
+};
+
+class tanh_inst: public builtin_inst {
+private:
+  tanh_inst(value *val, const std::string &name = "", instruction *next = nullptr);
+  std::string repr_impl() const { return "tanh"; }
+  _TRITON_DEFINE_CLONE(tanh_inst)
+  _TRITON_DEFINE_ACCEPT(tanh_inst)
+
+public:
+  static instruction* create(value *val, const std::string &name = "", instruction *next = nullptr);
+};
+
+class erf_inst: public builtin_inst {
+private:
+  erf_inst(value *val, const std::string &name = "", instruction *next = nullptr);
+  std::string repr_impl() const { return "erf"; }
+  _TRITON_DEFINE_CLONE(erf_inst)
+  _TRITON_DEFINE_ACCEPT(erf_inst)
+
+public:
+  static instruction* create(value *val, const std::string &name = "", instruction *next = nullptr);
+};
+
+class rsqrt_inst: public builtin_inst {
+private:
+  rsqrt_inst(value *val, const std::string &name = "", instruction *next = nullptr);
+  std::string repr_impl() const { return "rsqrt"; }
+  _TRITON_DEFINE_CLONE(rsqrt_inst)
+  _TRITON_DEFINE_ACCEPT(rsqrt_inst)
+
+public:
+  static instruction* create(value *val, const std::string &name = "", instruction *next = nullptr);
+};
+
+class pow_inst: public builtin_inst {
+private:
+  pow_inst(value *x, value *y, const std::string &name = "", instruction *next = nullptr);
+  std::string repr_impl() const { return "pow"; }
+  _TRITON_DEFINE_CLONE(pow_inst)
+  _TRITON_DEFINE_ACCEPT(pow_inst)
+
+public:
+  static instruction* create(value *x, value *y, const std::string &name = "", instruction *next = nullptr);
+};
+
+class umulhi_inst: public builtin_inst {
+private:
+  umulhi_inst(value *x, value *y, const std::string &name = "", instruction *next = nullptr);
+  std::string repr_impl() const { return "umulhi"; }
+  _TRITON_DEFINE_CLONE(umulhi_inst)
+  _TRITON_DEFINE_ACCEPT(umulhi_inst)
+
+public:
+  static instruction* create(value *x, value *y, const std::string &name = "", instruction *next = nullptr);
+};
+
 
 class dot_inst: public builtin_inst {
 public:
@@ -732,11 +841,12 @@ class reduce_inst: public builtin_inst {
 public:
   enum op_t{
     ADD, SUB, MAX, MIN,
-    FADD, FSUB, FMAX, FMIN
+    FADD, FSUB, FMAX, FMIN,
+    ARGMAX, ARGMIN, ARGFMAX, ARGFMIN
   };
 
 private:
-  static type* get_res_type(value *arg, unsigned axis);
+  static type* get_res_type(value *arg, op_t op, unsigned axis);
   static std::string to_str(op_t op);
 
 private:
@@ -749,10 +859,54 @@ public:
   static instruction* create(value *arg, op_t op, unsigned axis, const std::string &name = "", instruction *next = nullptr);
   unsigned get_axis() const { return axis_; }
   op_t get_op() const { return op_; }
+  // whether the reduction returns the index of its result
+  static bool with_index(op_t op) { return op == ARGMAX || op == ARGMIN || op == ARGFMAX || op == ARGFMIN; }
+  bool with_index() const { return with_index(op_); }
+
+private:
+  unsigned axis_;
+  op_t op_;
+};
+
+class scan_inst: public builtin_inst {
+public:
+  enum op_t{
+    ADD, MAX, MIN,
+    FADD, FMAX, FMIN,
+    CUSTOM
+  };
+
+private:
+  static std::string to_str(op_t op);
+
+private:
+  scan_inst(value* arg, op_t op, unsigned axis, bool exclusive, const std::string& name, instruction* next);
+  std::string repr_impl() const { return "scan"; }
+  _TRITON_DEFINE_CLONE(scan_inst)
+  _TRITON_DEFINE_ACCEPT(scan_inst)
+
+public:
+  static instruction* create(value *arg, op_t op, unsigned axis, bool exclusive, const std::string &name = "", instruction *next = nullptr);
+  static instruction* create(value *arg, basic_block *combine, value *lhs, value *rhs, value *res, unsigned axis,
+                             const std::string &name = "", instruction *next = nullptr);
+  unsigned get_axis() const { return axis_; }
+  op_t get_op() const { return op_; }
+  bool is_exclusive() const { return exclusive_; }
+  // custom combine function: `res` is computed from the scalars `lhs` and `rhs`
+  // by the instructions of `combine`, a block that is not part of any function
+  basic_block* get_combine() const { return combine_; }
+  value* get_combine_lhs() const { return lhs_; }
+  value* get_combine_rhs() const { return rhs_; }
+  value* get_combine_res() const { return res_; }
 
 private:
   unsigned axis_;
   op_t op_;
+  bool exclusive_;
+  basic_block *combine_;
+  value *lhs_;
+  value *rhs_;
+  value *res_;
 };
 
 class select_inst: public builtin_inst {
@@ -23,6 +23,9 @@ public:
 
 void for_each_instruction(ir::module& mod, const std::function<void(triton::ir::instruction*)> &fn);
 void for_each_value(ir::module& mod, const std::function<void(triton::ir::value *)> &fn);
+// value a pointer (block) is derived from, through GEPs, retiles
+// and loop-carried phi nodes
+ir::value* get_base_ptr(ir::value* ptr);
 
 }
 }
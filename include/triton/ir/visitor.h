@@ -50,6 +50,13 @@ class downcast_inst;
 
 class exp_inst;
 class log_inst;
+class sin_inst;
+class cos_inst;
+class tanh_inst;
+class erf_inst;
+class rsqrt_inst;
+class pow_inst;
+class umulhi_inst;
 
 class get_program_id_inst;
 class get_num_programs_inst;
@@ -61,6 +68,7 @@ class dot_inst;
 class trans_inst;
 class sqrt_inst;
 class reduce_inst;
+class scan_inst;
 class select_inst;
 
 class recoalesce_inst;
@@ -123,6 +131,13 @@ public:
 
   virtual void visit_exp_inst(exp_inst*) = 0;
   virtual void visit_log_inst(log_inst*) = 0;
+  virtual void visit_sin_inst(sin_inst*) = 0;
+  virtual void visit_cos_inst(cos_inst*) = 0;
+  virtual void visit_tanh_inst(tanh_inst*) = 0;
+  virtual void visit_erf_inst(erf_inst*) = 0;
+  virtual void visit_rsqrt_inst(rsqrt_inst*) = 0;
+  virtual void visit_pow_inst(pow_inst*) = 0;
+  virtual void visit_umulhi_inst(umulhi_inst*) = 0;
 
   virtual void visit_reshape_inst(reshape_inst*) = 0;
   virtual void visit_splat_inst(splat_inst*) = 0;
@@ -138,6 +153,7 @@ public:
   virtual void visit_trans_inst(trans_inst*) = 0;
   virtual void visit_sqrt_inst(sqrt_inst*) = 0;
   virtual void visit_reduce_inst(reduce_inst*) = 0;
+  virtual void visit_scan_inst(scan_inst*) = 0;
   virtual void visit_select_inst(select_inst*) = 0;
 
   virtual void visit_recoalesce_inst(recoalesce_inst*) = 0;
@@ -9,97 +9,77 @@ namespace triton{
 namespace codegen{
 namespace analysis{
 
+// buffers are aligned on the next power of two of their size,
+// up to the width of a shared memory bank row (128 bytes)
+unsigned allocation::get_alignment(shared_layout *x) {
+  unsigned align = 4;
+  while(align < x->get_size() && align < 128)
+    align *= 2;
+  return align;
+}
 
 void allocation::run(ir::module &mod) {
-  using std::max;
-  using std::min;
-  typedef std::multimap<unsigned, segment> triples_map_type;
-
-  std::vector<shared_layout*> I;
-  for(auto x: liveness_->get())
-    I.push_back(x.first);
-  std::vector<shared_layout*> J = I;
-
-  triples_map_type H;
-  H.insert({0, segment{0, INT_MAX}});
-
+  offsets_.clear();
+  // Largest buffers are placed first; ties are broken
+  // by order of appearance
   std::vector<shared_layout*> V;
-  std::map<shared_layout*, unsigned> starts;
-  while(!J.empty()){
-    auto h_it = H.begin();
-    unsigned w = h_it->first;
-    segment xh = h_it->second;
-    H.erase(h_it);
-    auto j_it = std::find_if(J.begin(), J.end(), [&](shared_layout* JJ){
-      segment xj = liveness_->get(JJ);
-      bool res = xj.intersect(xh);
-      for(auto val: H)
-        res = res && !val.second.intersect(xj);
-      return res;
-    });
-    if(j_it != J.end()){
-      unsigned size = (*j_it)->get_size();
-      segment xj = liveness_->get(*j_it);
-      starts[*j_it] = w;
-      H.insert({w + size, segment{max(xh.start, xj.start), min(xh.end, xj.end)}});
-      if(xh.start < xj.start)
-        H.insert({w, segment{xh.start, xj.end}});
-      if(xj.end < xh.end)
-        H.insert({w, segment{xj.start, xh.end}});
-      V.push_back(*j_it);
-      J.erase(j_it);
-    }
-  }
-
-  // Build interference graph
-  std::map<shared_layout*, std::set<shared_layout*>> interferences;
-  for(shared_layout* x: V)
-  for(shared_layout* y: V){
-    if(x == y)
-      continue;
-    unsigned X0 = starts[x], Y0 = starts[y];
-    unsigned NX = x->get_size();
-    unsigned NY = y->get_size();
-    segment XS = {X0, X0 + NX};
-    segment YS = {Y0, Y0 + NY};
-    if(liveness_->get(x).intersect(liveness_->get(y))
-        && XS.intersect(YS))
-      interferences[x].insert(y);
-  }
-
-  // Initialize colors
-  std::map<shared_layout*, int> colors;
-  for(shared_layout* X: V)
-    colors[X] = (X==V[0])?0:-1;
-
+  for(auto x: liveness_->get())
+    V.push_back(x.first);
+  std::stable_sort(V.begin(), V.end(), [&](shared_layout* x, shared_layout* y){
+    if(x->get_size() != y->get_size())
+      return x->get_size() > y->get_size();
+    return liveness_->get(x).start < liveness_->get(y).start;
+  });
 
-  // First-fit graph coloring
-  std::vector<bool> available(V.size());
+  // Best-fit placement: each buffer goes in the smallest gap
+  // left between the (already placed) buffers whose live
+  // ranges overlap with its own, or on top of them otherwise.
+  // Memory is re-used by buffers with disjoint live ranges
+  std::vector<shared_layout*> placed;
   for(shared_layout* x: V){
-    // Non-neighboring colors are available
-    std::fill(available.begin(), available.end(), true);
-    for(shared_layout* Y: interferences[x]){
-      int color = colors[Y];
-      if(color >= 0)
-        available[color] = false;
+    segment xs = liveness_->get(x);
+    unsigned size = x->get_size();
+    unsigned align = get_alignment(x);
+    // memory occupied by interfering buffers
+    std::vector<std::pair<unsigned, unsigned>> busy;
+    for(shared_layout* y: placed)
+      if(xs.intersect(liveness_->get(y)))
+        busy.push_back({offsets_.at(y), offsets_.at(y) + y->get_size()});
+    std::sort(busy.begin(), busy.end());
+    // find best-fitting gap
+    unsigned best = UINT_MAX;
+    unsigned best_waste = UINT_MAX;
+    unsigned curr = 0;
+    for(const auto& b: busy){
+      unsigned start = (curr + align - 1) / align * align;
+      if(start + size <= b.first && b.first - start - size < best_waste){
+        best = start;
+        best_waste = b.first - start - size;
+      }
+      curr = std::max(curr, b.second);
     }
-    // Assigns first available color
-    auto It = std::find(available.begin(), available.end(), true);
-    colors[x] = std::distance(available.begin(), It);
-  }
-
-  // Finalize allocation
-  for(shared_layout* x: V){
-    unsigned Adj = 0;
-    for(shared_layout* y: interferences[x])
-      Adj = std::max<unsigned>(Adj, starts[y] + y->get_size());
-    offsets_[x] = starts[x] + colors[x] * Adj;
+    if(best == UINT_MAX)
+      best = (curr + align - 1) / align * align;
+    offsets_[x] = best;
+    placed.push_back(x);
   }
 
   // Save maximum size of induced memory space
   allocated_size_ = 0;
   for(shared_layout* x: V)
-    allocated_size_ = std::max<size_t>(allocated_size_, starts[x] + x->get_size());
+    allocated_size_ = std::max<size_t>(allocated_size_, offsets_.at(x) + x->get_size());
+
+  // Fragmentation w.r.t. the peak amount of simultaneously live memory,
+  // which is a lower bound for any allocation
+  size_t peak = 0;
+  for(shared_layout* x: V){
+    size_t live = 0;
+    for(shared_layout* y: V)
+      if(liveness_->get(y).contains(liveness_->get(x).start))
+        live += y->get_size();
+    peak = std::max(peak, live);
+  }
+  fragmentation_ = allocated_size_ ? 1. - (double)peak / allocated_size_ : 0.;
 }
 
 }
@@ -23,15 +23,14 @@ inline unsigned clamp(unsigned x, unsigned a, unsigned b) {
   return std::min(std::max(x, lo), hi);
 }
 
-inline bool is_hmma_c(ir::value *v){
+inline bool is_hmma_c(ir::value *v, int sm){
   bool result = false;
   if(auto *x = dynamic_cast<ir::dot_inst*>(v)){
-    ir::value *a = x->get_operand(0);
-    ir::type *a_ty = a->get_type();
-    ir::value *b = x->get_operand(1);
-    ir::type *b_ty = b->get_type();
-    result = a_ty->get_scalar_ty()->is_fp16_ty() &&
-             b_ty->get_scalar_ty()->is_fp16_ty();
+    ir::type *a_ty = x->get_operand(0)->get_type()->get_scalar_ty();
+    ir::type *b_ty = x->get_operand(1)->get_type()->get_scalar_ty();
+    // bf16 tensor cores are only available from sm_80
+    result = (a_ty->is_fp16_ty() && b_ty->is_fp16_ty()) ||
+             (sm >= 80 && a_ty->is_bf16_ty() && b_ty->is_bf16_ty());
   }
   return result;
 }
@@ -52,10 +51,10 @@ inline void extract_dot_use(ir::value *v, ir::value*& result, size_t n) {
   }
 }
 
-inline void extract_hmma_dot_use(ir::value *v, ir::value*& result, size_t n) {
+inline void extract_hmma_dot_use(ir::value *v, ir::value*& result, size_t n, int sm) {
   for(ir::user* u: v->get_users()){
     auto i = dynamic_cast<ir::dot_inst*>(u);
-    if(i && is_hmma_c(i) && i->get_operand(n) == v)
+    if(i && is_hmma_c(i, sm) && i->get_operand(n) == v)
       result = i;
   }
 }
@@ -232,6 +231,18 @@ scanline_layout::scanline_layout(size_t num_warps,
   }
 }
 
+int scanline_layout::thread_stride(size_t k) {
+  int stride = 1;
+  for(size_t d = 0; order_[d] != (int)k; d++)
+    stride *= mts_[order_[d]];
+  return stride;
+}
+
+int scanline_layout::warp_span(size_t k) {
+  int stride = thread_stride(k);
+  return stride >= 32 ? 1 : std::min(mts_[k], 32 / stride);
+}
+
 
 /* -------------------------------- *
  *          Shared Layout           *
@@ -356,7 +367,7 @@ shared_layout::shared_layout(data_layout *arg,
                                  const std::vector<unsigned>& shape,
                                  const std::vector<ir::value *> &values,
                                  ir::type *ty,
-                                 analysis::align* align): data_layout(SHARED, axes, shape, values, align), ty_(ty) {
+                                 analysis::align* align, target *tgt): data_layout(SHARED, axes, shape, values, align), ty_(ty) {
 
   size_ = 0;
   arg_layout_ = arg;
@@ -379,11 +390,12 @@ shared_layout::shared_layout(data_layout *arg,
   ir::value* dot_b = nullptr;
   ir::value* hmma_dot_a = nullptr;
   ir::value* hmma_dot_b = nullptr;
+  int sm = tgt->is_gpu() ? tgt->as_nvidia()->sm() : 0;
   for(ir::value* v: values){
     extract_dot_use(v, dot_a, 0);
     extract_dot_use(v, dot_b, 1);
-    extract_hmma_dot_use(v, hmma_dot_a, 0);
-    extract_hmma_dot_use(v, hmma_dot_b, 1);
+    extract_hmma_dot_use(v, hmma_dot_a, 0, sm);
+    extract_hmma_dot_use(v, hmma_dot_b, 1, sm);
   }
   hmma_dot_a_ = hmma_dot_a;
   hmma_dot_b_ = hmma_dot_b;
@@ -451,7 +463,8 @@ void layouts::make_graph(ir::instruction *i) {
 void layouts::create(size_t id, const std::vector<ir::value*>& values) {
 //  if(layouts_.find(id) != layouts_.end())
 //    return;
-  auto it_hmma_c = std::find_if(values.begin(), values.end(), &is_hmma_c);
+  int sm = tgt_->is_gpu() ? tgt_->as_nvidia()->sm() : 0;
+  auto it_hmma_c = std::find_if(values.begin(), values.end(), [&](ir::value *v) { return is_hmma_c(v, sm); });
   auto cmp = [](ir::value* x, ir::value *y) {
     std::pair<int, int> xx = {x->get_type()->get_tile_rank(), x->get_type()->get_tile_num_elements()};
     std::pair<int, int> yy = {y->get_type()->get_tile_rank(), y->get_type()->get_tile_num_elements()};
@@ -479,7 +492,7 @@ void layouts::create(size_t id, const std::vector<ir::value*>& values) {
     ir::instruction *cts = (ir::instruction*)*it_cts;
     ir::value *arg = cts->get_operand(0);
     create(groups_.at(arg), values_.at(groups_.at(arg)));
-    layouts_[id] = new shared_layout(get(arg), axes, shapes, values, largest->get_type()->get_scalar_ty(), align_);
+    layouts_[id] = new shared_layout(get(arg), axes, shapes, values, largest->get_type()->get_scalar_ty(), align_, tgt_);
   }
   else{
     layouts_[id] = new scanline_layout(num_warps_, axes, shapes, values, align_, tgt_);
@@ -504,17 +517,48 @@ void layouts::run(ir::module &mod) {
   size_t id = values_.size();
   ir::for_each_instruction(mod, [this, &id](ir::instruction* i) {
     if(auto *red = dynamic_cast<ir::reduce_inst*>(i)) {
-      id++;
       ir::value *arg = red->get_operand(0);
       unsigned axis = red->get_axis();
       // shape
       auto shapes = arg->get_type()->get_block_shapes();
       scanline_layout *layout = get(arg)->to_scanline();
+      // N-D reductions whose threads along `axis` belong to the same warp
+      // are done with shuffles only
+      if(shapes.size() > 1 && layout->mts(axis) == layout->warp_span(axis) &&
+         arg->get_type()->get_scalar_ty()->get_primitive_size_in_bits() <= 32)
+        return;
+      id++;
       shapes[axis] = layout->mts(axis);
+      // 1D reductions go through one slot per lane
+      if(shapes.size() == 1)
+        shapes[axis] = std::max<unsigned>(shapes[axis], 32);
+      // index-carrying reductions store values then (32-bit) indices
+      ir::type *ty = arg->get_type()->get_scalar_ty();
+      if(red->with_index()){
+        shapes[axis] *= 2;
+        if(ty->get_primitive_size_in_bits() < 32)
+          ty = red->get_type()->get_scalar_ty();
+      }
       // create layout
-      layouts_[id] = new shared_layout(layout, axes_->get(arg), shapes, {red}, red->get_type()->get_scalar_ty(), align_);
+      layouts_[id] = new shared_layout(layout, axes_->get(arg), shapes, {red}, ty, align_, tgt_);
       tmp_[red] = id;
     }
+    if(auto *scan = dynamic_cast<ir::scan_inst*>(i)) {
+      ir::value *arg = scan->get_operand(0);
+      unsigned axis = scan->get_axis();
+      scanline_layout *layout = get(arg)->to_scanline();
+      // threads along `axis` are split into segments of consecutive lanes
+      // of the same warp; segments exchange their totals through shared memory
+      unsigned num_segs = layout->mts(axis) / layout->warp_span(axis);
+      if(num_segs == 1)
+        return;
+      id++;
+      // one slot per segment, plus one that idle threads write to
+      auto shapes = arg->get_type()->get_block_shapes();
+      shapes[axis] = num_segs + 1;
+      layouts_[id] = new shared_layout(layout, axes_->get(arg), shapes, {scan}, arg->get_type()->get_scalar_ty(), align_, tgt_);
+      tmp_[scan] = id;
+    }
     if(auto *recoalasce = dynamic_cast<ir::recoalesce_inst*>(i)){
       ir::value *val = recoalasce->get_operand(0);
       mma_layout* in_layout = get(val)->to_mma();
@@ -530,12 +574,12 @@ void layouts::run(ir::module &mod) {
         if(k != ld)
           shape[k] = in_layout->to_mma()->spt(k);
       // create layout
-      layouts_[id] = new shared_layout(out_layout, axes_->get(val), shape, {recoalasce}, val->get_type()->get_scalar_ty(), align_);
+      layouts_[id] = new shared_layout(out_layout, axes_->get(val), shape, {recoalasce}, val->get_type()->get_scalar_ty(), align_, tgt_);
       tmp_[recoalasce] = id;
     }
     if(auto *atom = dynamic_cast<ir::atomic_inst*>(i)){
       id++;
-      layouts_[id] = new shared_layout(nullptr, {}, {1}, {atom}, atom->get_type()->get_scalar_ty(), align_);
+      layouts_[id] = new shared_layout(nullptr, {}, {1}, {atom}, atom->get_type()->get_scalar_ty(), align_, tgt_);
       tmp_[atom] = id;
     }
   });
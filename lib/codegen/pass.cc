@@ -13,6 +13,8 @@
 #include "triton/codegen/transform/peephole.h"
 #include "triton/codegen/transform/pipeline.h"
 #include "triton/codegen/transform/prefetch.h"
+#include "triton/codegen/transform/ptr_induction.h"
+#include "triton/codegen/transform/remat.h"
 #include "triton/driver/device.h"
 #include "triton/driver/kernel.h"
 #include "triton/driver/module.h"
@@ -27,7 +29,8 @@ namespace codegen {
 // TODO:
 // There should be a proper pass manager there!
 void add_passes_to_emit_bin(ir::module &ir, driver::device *dev, int num_warps, int num_stages,
-                            driver::module *&mod, driver::kernel *&ker, size_t &shared_mem) {
+                            driver::module *&mod, driver::kernel *&ker, size_t &shared_mem,
+                            size_t &num_barriers, double &shared_fragmentation) {
   // generate llvm code
   llvm::LLVMContext ctx;
   std::string name = ir.get_function_list()[0]->get_name();
@@ -40,7 +43,9 @@ void add_passes_to_emit_bin(ir::module &ir, driver::device *dev, int num_warps,
   codegen::analysis::axes axes;
   codegen::transform::cts cts(cts_use_async);
   codegen::transform::pipeline pipeline(cts_use_async, num_stages);
+  codegen::transform::ptr_induction ptr_induction;
   codegen::transform::disassociate disassociate;
+  codegen::transform::remat remat(num_warps);
   codegen::analysis::layouts layouts(&axes, &align, num_warps, target.get());
   codegen::analysis::liveness liveness(&layouts);
   codegen::analysis::swizzle swizzle(&layouts, target.get());
@@ -59,9 +64,13 @@ void add_passes_to_emit_bin(ir::module &ir, driver::device *dev, int num_warps,
   // ir::print(ir, std::cout);
   pipeline.run(ir);
   dce.run(ir);
+  ptr_induction.run(ir);
+  dce.run(ir);
   // ir::print(ir, std::cout);
   disassociate.run(ir);
   dce.run(ir);
+  remat.run(ir);
+  dce.run(ir);
   align.run(ir);
   axes.run(ir);
   layouts.run(ir);
@@ -101,6 +110,8 @@ void add_passes_to_emit_bin(ir::module &ir, driver::device *dev, int num_warps,
   mod = driver::module::create(dev, std::move(llvm));
   ker = driver::kernel::create(&*mod, name.c_str());
   shared_mem = allocation.allocated_size();
+  shared_fragmentation = allocation.fragmentation();
+  num_barriers = barriers.get_num_barriers();
 }
 
 } // namespace codegen
@@ -107,13 +107,17 @@ Value* geper::operator()(Value *ptr, Value* off, const std::string& name){
 #define extract_val(...)     builder_->CreateExtractValue(__VA_ARGS__)
 #define fadd(...)            builder_->CreateFAdd(__VA_ARGS__)
 #define fcmp(...)            builder_->CreateFCmp(__VA_ARGS__)
+#define fdiv(...)            builder_->CreateFDiv(__VA_ARGS__)
 #define fmul(...)            builder_->CreateFMul(__VA_ARGS__)
+#define fneg(...)            builder_->CreateFNeg(__VA_ARGS__)
 #define fpcast(...)          builder_->CreateFPCast(__VA_ARGS__)
 #define fsub(...)            builder_->CreateFSub(__VA_ARGS__)
 #define icmp(...)            builder_->CreateICmp(__VA_ARGS__)
 #define icmp_eq(...)         builder_->CreateICmpEQ(__VA_ARGS__)
 #define icmp_sge(...)        builder_->CreateICmpSGE(__VA_ARGS__)
 #define icmp_sle(...)        builder_->CreateICmpSLE(__VA_ARGS__)
+#define icmp_uge(...)        builder_->CreateICmpUGE(__VA_ARGS__)
+#define icmp_ugt(...)        builder_->CreateICmpUGT(__VA_ARGS__)
 #define icmp_ult(...)        builder_->CreateICmpULT(__VA_ARGS__)
 #define insert_elt(...)      builder_->CreateInsertElement(__VA_ARGS__)
 #define intrinsic(...)       builder_->CreateIntrinsic(__VA_ARGS__)
@@ -577,6 +581,28 @@ void generator::visit_uncond_branch_inst(ir::uncond_branch_inst* br) {
   br(dest);
 }
 
+/**
+ * \brief PTX qualifiers for the cache operator and eviction priority of `x`
+ */
+static std::string io_qualifiers(ir::io_inst* x){
+  // loads default to caching in L2 only
+  bool is_load = dynamic_cast<ir::load_inst*>(x) != nullptr;
+  // eviction priorities and cache operators are mutually exclusive in PTX
+  switch(x->get_eviction_policy()){
+    case ir::io_inst::EVICT_FIRST: return ".L1::evict_first";
+    case ir::io_inst::EVICT_LAST: return ".L1::evict_last";
+    default: break;
+  }
+  switch(x->get_cache_modifier()){
+    case ir::io_inst::CA: return ".ca";
+    case ir::io_inst::CG: return ".cg";
+    case ir::io_inst::CS: return ".cs";
+    case ir::io_inst::WB: return ".wb";
+    case ir::io_inst::WT: return ".wt";
+    default: return is_load ? ".cg" : "";
+  }
+}
+
 /**
  * \brief Code Generation for a (synchronous) `load`
  */
@@ -626,7 +652,7 @@ void generator::visit_load_inst(ir::load_inst* x){
     // -----
     std::ostringstream asm_oss;
     asm_oss << "@$" << n_words; // predicate
-    asm_oss << " ld.global.cg";
+    asm_oss << " ld.global" << io_qualifiers(x);
     if(n_words > 1)
       asm_oss << ".v" << n_words; // vector width
     asm_oss << ".b" << width; // word size
@@ -738,6 +764,8 @@ void generator::visit_store_inst(ir::store_inst * x){
   }
   auto idxs    = idxs_.at(val_op);
   Type *ty = cvt(val_op->get_type()->get_scalar_ty());
+  // stores with cache/eviction hints are emitted as inline PTX
+  std::string qualifiers = io_qualifiers(x);
   for(size_t i = 0; i < idxs.size(); i += vec){
     auto idx = idxs[i];
     // pointer
@@ -747,7 +775,33 @@ void generator::visit_store_inst(ir::store_inst * x){
     Value* val = UndefValue::get(vec_ty(ty, vec));
     for(size_t ii = 0; ii < vec; ii++)
       val = insert_elt(val, vals_.at(val_op)[idxs[i + ii]], ii);
-    if(mx){
+    if(!qualifiers.empty()){
+      // pack sub-words into words, as for loads
+      size_t nbits = ty->getPrimitiveSizeInBits();
+      int width = std::min<int>(nbits*vec, std::max<int>(32, nbits));
+      int n_words = std::max<int>(1, nbits*vec / width);
+      Value *words = bit_cast(val, vec_ty(IntegerType::get(*ctx_, width), n_words));
+      std::string cstrt = (width == 64) ? "l" : ((width == 32) ? "r" : ((width == 16) ? "h" : "c"));
+      std::ostringstream asm_oss;
+      asm_oss << "@$0 st.global" << qualifiers;
+      if(n_words > 1)
+        asm_oss << ".v" << n_words;
+      asm_oss << ".b" << width << " [ $1 + 0 ], {";
+      std::string asm_cstrt = "b,l";
+      std::vector<Value*> args = {mx ? vals_[mx->get_mask_operand()][idx] : builder_->getTrue(), ptr};
+      for(int ii = 0; ii < n_words; ii++){
+        asm_oss << (ii > 0 ? ", $" : "$") << 2 + ii;
+        asm_cstrt += "," + cstrt;
+        args.push_back(extract_elt(words, ii));
+      }
+      asm_oss << "};";
+      std::vector<Type*> arg_tys;
+      for(Value *v: args)
+        arg_tys.push_back(v->getType());
+      FunctionType *asm_ty = FunctionType::get(builder_->getVoidTy(), arg_tys, false);
+      call(InlineAsm::get(asm_ty, asm_oss.str(), asm_cstrt, true), args);
+    }
+    else if(mx){
       Value *msk = vals_[mx->get_mask_operand()][idx];
       Instruction *no_op = intrinsic(Intrinsic::donothing, {}, {});
       builder_->SetInsertPoint(no_op->getParent());
@@ -858,6 +912,147 @@ void generator::visit_log_inst(ir::log_inst* x){
   }
 }
 
+/**
+ * \brief Evaluates the polynomial with the given coefficients
+ * (highest degree first) at `x`
+ */
+Value* generator::horner(Value *x, const std::vector<double>& coeffs) {
+  Type *ty = x->getType();
+  Value *ret = ConstantFP::get(ty, coeffs[0]);
+  for(size_t i = 1; i < coeffs.size(); i++)
+    ret = intrinsic(Intrinsic::fma, {ty}, {ret, x, ConstantFP::get(ty, coeffs[i])});
+  return ret;
+}
+
+/**
+ * \brief Reduces `x` to [-pi, pi], where approximate sin/cos are accurate
+ */
+Value* generator::reduce_angle(Value *x) {
+  // 2*pi is split in two parts so that k*hi is exact
+  Constant *rcp_2pi = ConstantFP::get(f32_ty, 0.15915494309189535);
+  Constant *two_pi_hi = ConstantFP::get(f32_ty, 6.28125);
+  Constant *two_pi_lo = ConstantFP::get(f32_ty, 0.0019353071795864769);
+  Value *k = fneg(intrinsic(Intrinsic::rint, {f32_ty}, {fmul(x, rcp_2pi)}));
+  x = intrinsic(Intrinsic::fma, {f32_ty}, {k, two_pi_hi, x});
+  return intrinsic(Intrinsic::fma, {f32_ty}, {k, two_pi_lo, x});
+}
+
+/**
+ * \brief Code Generation for `sin`
+ */
+void generator::visit_sin_inst(ir::sin_inst* x){
+  FunctionType *fn_ty = FunctionType::get(f32_ty, {f32_ty}, false);
+  InlineAsm *sin = InlineAsm::get(fn_ty, "sin.approx.f32 $0, $1;", "=f,f", false);
+  for(auto idx: idxs_.at(x))
+    vals_[x][idx] = call(sin, {reduce_angle(vals_[x->get_operand(0)][idx])});
+}
+
+/**
+ * \brief Code Generation for `cos`
+ */
+void generator::visit_cos_inst(ir::cos_inst* x){
+  FunctionType *fn_ty = FunctionType::get(f32_ty, {f32_ty}, false);
+  InlineAsm *cos = InlineAsm::get(fn_ty, "cos.approx.f32 $0, $1;", "=f,f", false);
+  for(auto idx: idxs_.at(x))
+    vals_[x][idx] = call(cos, {reduce_angle(vals_[x->get_operand(0)][idx])});
+}
+
+/**
+ * \brief Code Generation for `tanh`
+ */
+void generator::visit_tanh_inst(ir::tanh_inst* x){
+  FunctionType *fn_ty = FunctionType::get(f32_ty, {f32_ty}, false);
+  InlineAsm *ex2 = InlineAsm::get(fn_ty, "ex2.approx.f32 $0, $1;", "=f,f", false);
+  Constant *one = ConstantFP::get(f32_ty, 1.);
+  Constant *two = ConstantFP::get(f32_ty, 2.);
+  Constant *two_log2e = ConstantFP::get(f32_ty, 2.8853900817779268);
+  for(auto idx: idxs_.at(x)){
+    Value *val = vals_[x->get_operand(0)][idx];
+    Value *abs = intrinsic(Intrinsic::fabs, {f32_ty}, {val});
+    // tanh(|x|) = 1 - 2 / (exp(2|x|) + 1)
+    Value *ex = call(ex2, {fmul(abs, two_log2e)});
+    Value *large = fsub(one, fdiv(two, fadd(ex, one)));
+    large = intrinsic(Intrinsic::copysign, {f32_ty}, {large, val});
+    // taylor expansion avoids cancellation around 0
+    Value *small = fmul(val, horner(fmul(val, val), {62./2835, -17./315, 2./15, -1./3, 1.}));
+    Value *is_small = fcmp(llvm::CmpInst::FCMP_OLT, abs, ConstantFP::get(f32_ty, 0.3));
+    vals_[x][idx] = select(is_small, small, large);
+  }
+}
+
+/**
+ * \brief Code Generation for `erf`
+ */
+void generator::visit_erf_inst(ir::erf_inst* x){
+  FunctionType *fn_ty = FunctionType::get(f32_ty, {f32_ty}, false);
+  InlineAsm *ex2 = InlineAsm::get(fn_ty, "ex2.approx.f32 $0, $1;", "=f,f", false);
+  Constant *one = ConstantFP::get(f32_ty, 1.);
+  Constant *neg_log2e = ConstantFP::get(f32_ty, -1.4426950408889634);
+  const double c = 1.1283791670955126; // 2/sqrt(pi)
+  for(auto idx: idxs_.at(x)){
+    Value *val = vals_[x->get_operand(0)][idx];
+    Value *abs = intrinsic(Intrinsic::fabs, {f32_ty}, {val});
+    Value *sq = fmul(val, val);
+    // Abramowitz & Stegun 7.1.26, absolute error < 1.5e-7
+    Value *t = fdiv(one, fadd(one, fmul(abs, ConstantFP::get(f32_ty, 0.3275911))));
+    Value *p = fmul(t, horner(t, {1.061405429, -1.453152027, 1.421413741, -0.284496736, 0.254829592}));
+    Value *large = fsub(one, fmul(p, call(ex2, {fmul(sq, neg_log2e)})));
+    large = intrinsic(Intrinsic::copysign, {f32_ty}, {large, val});
+    // taylor expansion keeps the relative error small around 0
+    Value *small = fmul(val, horner(sq, {-c/1320, c/216, -c/42, c/10, -c/3, c}));
+    Value *is_small = fcmp(llvm::CmpInst::FCMP_OLT, abs, ConstantFP::get(f32_ty, 0.5));
+    vals_[x][idx] = select(is_small, small, large);
+  }
+}
+
+/**
+ * \brief Code Generation for `rsqrt`
+ */
+void generator::visit_rsqrt_inst(ir::rsqrt_inst* x){
+  FunctionType *fn_ty = FunctionType::get(f32_ty, {f32_ty}, false);
+  InlineAsm *rsqrt = InlineAsm::get(fn_ty, "rsqrt.approx.f32 $0, $1;", "=f,f", false);
+  for(auto idx: idxs_.at(x))
+    vals_[x][idx] = call(rsqrt, {vals_[x->get_operand(0)][idx]});
+}
+
+/**
+ * \brief Code Generation for `pow`
+ */
+void generator::visit_pow_inst(ir::pow_inst* x){
+  FunctionType *fn_ty = FunctionType::get(f32_ty, {f32_ty}, false);
+  InlineAsm *ex2 = InlineAsm::get(fn_ty, "ex2.approx.f32 $0, $1;", "=f,f", false);
+  InlineAsm *lg2 = InlineAsm::get(fn_ty, "lg2.approx.f32 $0, $1;", "=f,f", false);
+  Constant *zero = ConstantFP::get(f32_ty, 0.);
+  Constant *one = ConstantFP::get(f32_ty, 1.);
+  Constant *half = ConstantFP::get(f32_ty, 0.5);
+  Constant *nan = ConstantFP::getNaN(f32_ty);
+  for(auto idx: idxs_.at(x)){
+    Value *base = vals_[x->get_operand(0)][idx];
+    Value *exponent = vals_[x->get_operand(1)][idx];
+    // |x|^y = 2^(y * log2|x|)
+    Value *abs = intrinsic(Intrinsic::fabs, {f32_ty}, {base});
+    Value *ret = call(ex2, {fmul(exponent, call(lg2, {abs}))});
+    // negative bases: the sign depends on the parity of (integer) exponents
+    Value *is_int = fcmp(llvm::CmpInst::FCMP_OEQ, intrinsic(Intrinsic::rint, {f32_ty}, {exponent}), exponent);
+    Value *half_exp = fmul(exponent, half);
+    Value *is_odd = and_(is_int, fcmp(llvm::CmpInst::FCMP_ONE, intrinsic(Intrinsic::rint, {f32_ty}, {half_exp}), half_exp));
+    Value *neg_ret = select(is_int, select(is_odd, fneg(ret), ret), nan);
+    ret = select(fcmp(llvm::CmpInst::FCMP_OLT, base, zero), neg_ret, ret);
+    vals_[x][idx] = select(fcmp(llvm::CmpInst::FCMP_OEQ, exponent, zero), one, ret);
+  }
+}
+
+/**
+ * \brief Code Generation for `umulhi`
+ */
+void generator::visit_umulhi_inst(ir::umulhi_inst* x){
+  for(auto idx: idxs_.at(x)){
+    Value *lhs = vals_[x->get_operand(0)][idx];
+    Value *rhs = vals_[x->get_operand(1)][idx];
+    vals_[x][idx] = intrinsic(Intrinsic::nvvm_mulhi_ui, {}, {lhs, rhs});
+  }
+}
+
 /**
  * \brief Code Generation for `atomic_cas`
  */
@@ -924,6 +1119,14 @@ void generator::visit_atomic_rmw_inst(ir::atomic_rmw_inst *atom) {
   ir::value* ptr = atom->get_operand(0);
   ir::value* val = atom->get_operand(1);
   ir::value* msk = atom->get_operand(2);
+  ir::type* sca_ty = val->get_type()->get_scalar_ty();
+  using tt = ir::atomic_rmw_op_t;
+  int sm = tgt_->as_nvidia()->sm();
+  bool is_fadd = atom->get_op() == tt::FAdd;
+  // old values that are never used only need reductions (`red`)
+  bool is_red = atom->get_type()->is_block_ty() && atom->get_users().empty();
+  // bf16 additions are only natively supported from sm_90
+  bool emulate_bf16 = is_fadd && sca_ty->is_bf16_ty() && sm < 90;
 
   // vector size
   int vec = 1;
@@ -931,60 +1134,118 @@ void generator::visit_atomic_rmw_inst(ir::atomic_rmw_inst *atom) {
     int ld = ords_.at(ptr)[0];
     unsigned alignment = alignment_->get(ptr, ld);
     vec = std::min<int>(layouts_->get(ptr)->to_scanline()->nts(ld), alignment);
-    vec = std::min(vec, val->get_type()->get_tile_element_ty()->is_fp16_ty() ? 2 : 1);
+    // fp16x2/bf16x2 atomics operate on packed pairs;
+    // fp32 reductions are issued back-to-back from a single address
+    int max_vec = 1;
+    if(is_fadd && (sca_ty->is_fp16_ty() || (sca_ty->is_bf16_ty() && !emulate_bf16)))
+      max_vec = 2;
+    if(is_fadd && sca_ty->is_fp32_ty() && is_red)
+      max_vec = 4;
+    vec = std::min(vec, max_vec);
   }
+  bool is_packed = vec > 1 && !sca_ty->is_fp32_ty();
 
   for(int i = 0; i < idxs_.at(val).size(); i += vec){
     auto idx = idxs_[val][i];
-    Value *rmw_val = UndefValue::get(vec_ty(vals_[val][idx]->getType(), vec));
-    for(int ii = 0; ii < vec; ii++)
-      rmw_val = insert_elt(rmw_val, vals_[val][idxs_[val][i+ii]], ii);
     Value *rmw_ptr = vals_[ptr][idx];
     Value *rmw_msk = vals_[msk][idx];
-    if(vec == 1)
-      rmw_val = extract_elt(rmw_val, i32(0));
-    Type* ty = rmw_val->getType();
-    size_t nbits = ty->getScalarSizeInBits();
+    std::vector<Value*> rmw_vals;
+    for(int ii = 0; ii < vec; ii++)
+      rmw_vals.push_back(vals_[val][idxs_[val][i+ii]]);
+    Type* elt_ty = rmw_vals[0]->getType();
+    size_t nbits = elt_ty->getScalarSizeInBits();
+    // pack sub-word values
+    if(is_packed){
+      Value *packed = UndefValue::get(vec_ty(elt_ty, vec));
+      for(int ii = 0; ii < vec; ii++)
+        packed = insert_elt(packed, rmw_vals[ii], ii);
+      rmw_vals = {packed};
+    }
+    Type* ty = rmw_vals[0]->getType();
     // extract pointer offset
     std::string offset = "";
+    int64_t byte_offset = 0;
     if(GetElementPtrInst *gep = dyn_cast<GetElementPtrInst>(rmw_ptr))
     if(gep->getNumIndices() == 1)
     if(ConstantInt *cst = dyn_cast<ConstantInt>(gep->idx_begin())){
-      offset = " + " + std::to_string(cst->getValue().getSExtValue()*nbits/8);
+      byte_offset = cst->getValue().getSExtValue()*nbits/8;
+      offset = " + " + std::to_string(byte_offset);
       rmw_ptr = gep->getPointerOperand();
     }
     rmw_ptr = bit_cast(rmw_ptr, ty->getPointerTo(1));
-    // asm argument type
-    std::vector<Type*> arg_ty = {rmw_msk->getType(), rmw_ptr->getType(), rmw_val->getType()};
-    // asm function type
-    FunctionType *fn_ty = FunctionType::get(ty, arg_ty, false);
     // asm string
     std::string s_nbits = std::to_string(nbits);
     std::string name;
     std::string s_ty;
-    using tt = ir::atomic_rmw_op_t;
     switch(atom->get_op()){
       case tt::Or: name = "or"; s_ty = "b"; break;
       case tt::And: name = "and"; s_ty = "b"; break;
       case tt::Xor: name = "xor", s_ty = "b"; break;
-      case tt::Add: name = "add" , s_ty = "s"; break;
+      case tt::Add: name = "add" , s_ty = nbits == 64 ? "u" : "s"; break;
       case tt::Min: name = "min", s_ty = "s"; break;
       case tt::Max: name = "max", s_ty = "s"; break;
       case tt::UMin: name = "min", s_ty = "u"; break;
       case tt::UMax: name = "max", s_ty = "u"; break;
-      case tt::FAdd: name = "add", s_ty = "f"; break;
+      case tt::FAdd: name = "add", s_ty = sca_ty->is_bf16_ty() ? "bf" : "f"; break;
     }
-    std::string s_vec = vec == 2 ? "x2" : "";
-    std::string mod = nbits == 32 ? "" : ".noftz";
-
-    std::string asm_str = "@$1 atom.global.gpu." + name + mod + "." + s_ty + s_nbits + s_vec + " $0, [$2" + offset + "], $3;";
-    std::string ty_id = nbits*vec == 32 ? "r" : "h";
+    std::string s_vec = is_packed ? "x2" : "";
+    std::string mod = (is_fadd && nbits == 16) ? ".noftz" : "";
+    std::string op = name + mod + "." + s_ty + s_nbits + s_vec;
+    auto reg = [](size_t bits) { return bits == 64 ? "l" : (bits == 32 ? "r" : "h"); };
+    std::string ty_id = reg(ty->getPrimitiveSizeInBits());
+    // reductions: no return value
+    if(is_red && !emulate_bf16){
+      std::string asm_str;
+      std::string constraint = "b,l";
+      for(int ii = 0; ii < rmw_vals.size(); ii++){
+        asm_str += "@$0 red.global.gpu." + op + " [$1 + " + std::to_string(byte_offset + ii*nbits/8) + "], $" + std::to_string(2 + ii) + ";\n";
+        constraint += std::string(",") + ty_id;
+      }
+      std::vector<Value*> args = {rmw_msk, rmw_ptr};
+      args.insert(args.end(), rmw_vals.begin(), rmw_vals.end());
+      std::vector<Type*> arg_tys;
+      for(Value *v: args)
+        arg_tys.push_back(v->getType());
+      call(InlineAsm::get(FunctionType::get(builder_->getVoidTy(), arg_tys, false), asm_str, constraint, true), args);
+      continue;
+    }
+    Value *rmw_val = rmw_vals[0];
+    std::string asm_str = "@$1 atom.global.gpu." + op + " $0, [$2" + offset + "], $3;";
     std::string constraint = "=" + ty_id + ",b,l," + ty_id;
+    if(emulate_bf16){
+      // compare-and-swap loop on the bf16 value, with additions carried out in fp32
+      rmw_val = bf16_to_fp32(rmw_val);
+      std::string to_bf16 = sm >= 80 ? "cvt.rn.bf16.f32 %new, %sum;" : "mov.b32 {%lo, %new}, %sum;";
+      asm_str = "{\n"
+                ".reg .pred %p;\n"
+                ".reg .b16 %old, %new, %lo, %zero;\n"
+                ".reg .f32 %sum;\n"
+                "mov.b16 %zero, 0;\n"
+                "@!$1 bra atom_done${:uid};\n"
+                "ld.global.b16 $0, [$2" + offset + "];\n"
+                "atom_loop${:uid}:\n"
+                "mov.b32 %sum, {%zero, $0};\n"
+                "add.f32 %sum, %sum, $3;\n" +
+                to_bf16 + "\n"
+                "atom.global.gpu.cas.b16 %old, [$2" + offset + "], $0, %new;\n"
+                "setp.ne.b16 %p, %old, $0;\n"
+                "mov.b16 $0, %old;\n"
+                "@%p bra atom_loop${:uid};\n"
+                "atom_done${:uid}:\n"
+                "}";
+      constraint = "=h,b,l,r";
+    }
+    // asm function type
+    std::vector<Type*> arg_ty = {rmw_msk->getType(), rmw_ptr->getType(), rmw_val->getType()};
+    FunctionType *fn_ty = FunctionType::get(ty, arg_ty, false);
     // create inline asm
     InlineAsm *iasm = InlineAsm::get(fn_ty, asm_str, constraint, true);
     // call asm
-    if(atom->get_type()->is_block_ty())
-      vals_[atom][idx] = call(iasm, (ArrayRef<Value*>{rmw_msk, rmw_ptr, rmw_val}));
+    if(atom->get_type()->is_block_ty()){
+      Value *old = call(iasm, (ArrayRef<Value*>{rmw_msk, rmw_ptr, rmw_val}));
+      for(int ii = 0; ii < vec; ii++)
+        vals_[atom][idxs_[val][i+ii]] = is_packed ? extract_elt(old, ii) : old;
+    }
     else{
       Module *mod = builder_->GetInsertBlock()->getModule();
       tgt_->add_memfence(mod, *builder_);
@@ -1381,8 +1642,11 @@ void generator::visit_mma16816(ir::dot_inst* C, ir::value *A, ir::value *B, ir::
   for(int i = 0; i < num_ptr_b; i++)
     ptrs_b[i] = gep(shmems_[B], {off_b[i]});
 
+  // fp16 and bf16 operands share fragment layouts; registers are
+  // handled as opaque pairs of 16-bit values until the mma itself
+  std::string ab_ty = A->get_type()->get_scalar_ty()->is_bf16_ty() ? "bf16" : "f16";
   FunctionType *mma_ty = FunctionType::get(fp32_pack4_ty, std::vector<llvm::Type*>{fp16x2_ty, fp16x2_ty, fp16x2_ty, fp16x2_ty, fp16x2_ty, fp16x2_ty, fp32_ty, fp32_ty, fp32_ty, fp32_ty}, false);
-  InlineAsm *mma_fn = InlineAsm::get(mma_ty, "mma.sync.aligned.m16n8k16.row.col.f32.f16.f16.f32 "
+  InlineAsm *mma_fn = InlineAsm::get(mma_ty, "mma.sync.aligned.m16n8k16.row.col.f32." + ab_ty + "." + ab_ty + ".f32 "
                                              "{$0, $1, $2, $3}, "
                                              "{$4, $5, $6, $7}, "
                                              "{$8, $9}, "
@@ -1449,7 +1713,7 @@ void generator::visit_mma16816(ir::dot_inst* C, ir::value *A, ir::value *B, ir::
                                                 "{$0, $1, $2, $3}, [$4 + " +
                                                 std::to_string(2*step_am*16*layout->wpt(0)*stride_a_m + 2*step_ak*stride_a_k) + "];",
                                                 "=r,=r,=r,=r,r", true);
-      Value *haa = call(ld_x4_ty, ld_a0_fn, {ptra});
+      Value *haa = call(ld_x4_ty, ld_a0_fn, {bit_cast(ptra, ptr_ty(f16_ty, 3))});
       if(K == 0 && inc == 1 && is_prefetch)
           prefetch_latch_to_bb_[phiA->get_incoming_value(1)].push_back(haa);
       Value *ha0 = extract_val(haa, std::vector<unsigned>{0});
@@ -1477,7 +1741,7 @@ void generator::visit_mma16816(ir::dot_inst* C, ir::value *A, ir::value *B, ir::
                                                     "{$0, $1, $2, $3}, [$4 + " +
                                                     std::to_string(2*step_bn*8*layout->wpt(1)*stride_b_n + 2*step_bk*stride_b_k) + "];",
                                                     "=r,=r,=r,=r,r", true);
-      Value *hbb = call(ld_x4_ty, ld_b_fn, {ptrb});
+      Value *hbb = call(ld_x4_ty, ld_b_fn, {bit_cast(ptrb, ptr_ty(f16_ty, 3))});
       if(K == 0 && inc == 1 && is_prefetch)
           prefetch_latch_to_bb_[phiB->get_incoming_value(1)].push_back(hbb);
       Value *hb0 = extract_val(hbb, std::vector<unsigned>{0});
@@ -1615,26 +1879,64 @@ void generator::visit_fmadot(ir::dot_inst* C, ir::value* A, ir::value* B, ir::va
   for(int i = 0; i < num_ptr_b; i++)
     ptrs_b[i] = gep(shmems_[B], off_b[i]);
 
+  // 8-bit operands are processed `kw` values at a time along k:
+  // int8 products are accumulated 4 at a time by dp4a (sm_61+),
+  // fp8 values are converted to fp32 4 at a time;
+  // bf16 values are converted to fp32 one at a time
+  ir::type *ab_ty = A->get_type()->get_scalar_ty();
+  bool is_int8 = ab_ty->is_integer_ty(8);
+  bool is_fp8 = ab_ty->is_fp8_ty();
+  bool is_bf16 = ab_ty->is_bf16_ty();
+  bool use_dp4a = is_int8 && NK % 4 == 0 && tgt_->as_nvidia()->sm() >= 61;
+  unsigned kw = (use_dp4a || (is_fp8 && NK % 4 == 0)) ? 4 : 1;
+  InlineAsm *dp4a = InlineAsm::get(FunctionType::get(i32_ty, {i32_ty, i32_ty, i32_ty}, false),
+                                   "dp4a.s32.s32 $0, $1, $2, $3;", "=r,r,r,r", false);
+  auto get_vals = [&](Value *ptr, int off, int stride_k) {
+    std::vector<Value*> vals(kw);
+    for(unsigned i = 0; i < kw; i++)
+      vals[i] = load(gep(ptr, i32(off + i*stride_k)));
+    if(is_fp8 && kw == 4)
+      std::tie(vals[0], vals[1], vals[2], vals[3]) = fp8x4_to_fp32x4(vals[0], vals[1], vals[2], vals[3]);
+    if(is_fp8 && kw == 1)
+      vals[0] = std::get<0>(fp8x4_to_fp32x4(vals[0], vals[0], vals[0], vals[0]));
+    if(use_dp4a){
+      Value *packed = UndefValue::get(vec_ty(i8_ty, 4));
+      for(unsigned i = 0; i < kw; i++)
+        packed = insert_elt(packed, vals[i], i);
+      return std::vector<Value*>{bit_cast(packed, i32_ty)};
+    }
+    if(is_int8)
+      for(unsigned i = 0; i < kw; i++)
+        vals[i] = builder_->CreateSExt(vals[i], i32_ty);
+    if(is_bf16)
+      vals[0] = bf16_to_fp32(vals[0]);
+    return vals;
+  };
+  auto mul_add = [&](Value *a, Value *b, Value *acc) -> Value* {
+    if(use_dp4a)
+      return call(dp4a, {a, b, acc});
+    if(is_int8)
+      return add(mul(a, b), acc);
+    return call(f_mul_add, {a, b, acc});
+  };
+
   std::map<indices_t, Value*> ret = vals_[D];
-  std::map<std::pair<int, int>, Value*> has, hbs;
-  for(unsigned k = 0; k < NK; k++){
+  std::map<std::pair<int, int>, std::vector<Value*>> has, hbs;
+  for(unsigned k = 0; k < NK; k += kw){
     int z = 0;
     for(unsigned m = 0; m < shape_c[0]; m+=layout_c->mts(0)*layout_c->nts(0))
     for(unsigned n = 0; n < shape_c[1]; n+=layout_c->mts(1)*layout_c->nts(1))
     for(unsigned mm = 0; mm < layout_c->nts(0); mm++)
     for(unsigned nn = 0; nn < layout_c->nts(1); nn++)
     {
-      if(has.find({m + mm, k}) == has.end()){
-        Value* pa = gep(ptrs_a[0], i32((m + mm)*stride_a_m + k*stride_a_k));
-        Value* va = load(pa);
-        has[{m + mm, k}] = va;
-      }
-      if(hbs.find({n + nn, k}) == hbs.end()){
-        Value* pb = gep(ptrs_b[0], i32((n + nn)*stride_b_n + k*stride_b_k));
-        Value* vb = load(pb);
-        hbs[{n + nn, k}] = vb;
-      }
-      ret[idxs_[C].at(z)] = call(f_mul_add, {has[{m+mm,k}], hbs[{n+nn, k}], ret[idxs_[C].at(z)]});
+      if(has.find({m + mm, k}) == has.end())
+        has[{m + mm, k}] = get_vals(ptrs_a[0], (m + mm)*stride_a_m + k*stride_a_k, stride_a_k);
+      if(hbs.find({n + nn, k}) == hbs.end())
+        hbs[{n + nn, k}] = get_vals(ptrs_b[0], (n + nn)*stride_b_n + k*stride_b_k, stride_b_k);
+      std::vector<Value*> &va = has[{m + mm, k}];
+      std::vector<Value*> &vb = hbs[{n + nn, k}];
+      for(size_t i = 0; i < va.size(); i++)
+        ret[idxs_[C].at(z)] = mul_add(va[i], vb[i], ret[idxs_[C].at(z)]);
       z++;
     }
   }
@@ -1655,7 +1957,10 @@ void generator::visit_dot_inst(ir::dot_inst* dot) {
   ir::value *B = dot->get_operand(1);
   ir::value *D = dot->get_operand(2);
   Type *c_ty = cvt(D->get_type()->get_scalar_ty());
-  Function *f_mul_add = Intrinsic::getDeclaration(module, Intrinsic::fmuladd, std::vector<llvm::Type*>{c_ty});
+  // integer dots are accumulated with integer instructions
+  Function *f_mul_add = nullptr;
+  if(c_ty->isFloatingPointTy())
+    f_mul_add = Intrinsic::getDeclaration(module, Intrinsic::fmuladd, std::vector<llvm::Type*>{c_ty});
   auto A_shapes = A->get_type()->get_block_shapes();
   size_t red_axis = 1;
   unsigned NK = A_shapes[red_axis];
@@ -1699,33 +2004,66 @@ Value* generator::shared_off(const std::vector<unsigned>& shapes, const std::vec
 /**
  * \brief Code Generation for `reduce` (1D case)
  */
-void generator::visit_reduce1d_inst(ir::reduce_inst* x, std::function<Value*(Value*,Value*)> do_acc, Value *neutral) {
-  std::map<indices_t, Value*> partial;
+void generator::visit_reduce1d_inst(ir::reduce_inst* x, std::function<acc_t(acc_t,acc_t)> do_acc, acc_t neutral) {
   ir::value *arg = x->get_operand(0);
-  Type *ret_ty = cvt(x->get_type()->get_scalar_ty());
-  Value *acc = nullptr;
+  bool with_index = x->with_index();
+  Type *ty = cvt(arg->get_type()->get_scalar_ty());
+  // shuffles move 32-bit registers: widen narrower operands
+  Type *acc_ty = ty;
+  if(with_index && ty->getPrimitiveSizeInBits() < 32)
+    acc_ty = ty->isFloatingPointTy() ? f32_ty : i32_ty;
+  auto widen = [&](Value *v) -> Value* {
+    if(acc_ty == ty)
+      return v;
+    return ty->isFloatingPointTy() ? builder_->CreateFPExt(v, acc_ty) : builder_->CreateSExt(v, acc_ty);
+  };
+  neutral.first = widen(neutral.first);
+  acc_t acc(nullptr, nullptr);
 
   // reduce within thread
   for(indices_t idx: idxs_.at(arg)){
-    Value *val = vals_[arg][idx];
-    acc = !acc ? val : do_acc(acc, val);
+    acc_t val(widen(vals_[arg][idx]), with_index ? idx[0] : nullptr);
+    acc = !acc.first ? val : do_acc(acc, val);
   }
   // reduce within wrap
-  InlineAsm *shfl = InlineAsm::get(FunctionType::get(ret_ty, {ret_ty, i32_ty}, false),
-                                   "shfl.sync.bfly.b32 $0, $1, $2, 0x1f, 0xffffffff;", "=f,f,r", false);
+  InlineAsm *shfl = InlineAsm::get(FunctionType::get(acc_ty, {acc_ty, i32_ty}, false),
+                                   "shfl.sync.bfly.b32 $0, $1, $2, 0x1f, 0xffffffff;",
+                                   acc_ty->isFloatingPointTy() ? "=f,f,r" : "=r,r,r", false);
+  InlineAsm *shfl_idx = InlineAsm::get(FunctionType::get(i32_ty, {i32_ty, i32_ty}, false),
+                                       "shfl.sync.bfly.b32 $0, $1, $2, 0x1f, 0xffffffff;", "=r,r,r", false);
+  auto do_shfl = [&](acc_t v, int i) -> acc_t {
+    return acc_t(call(shfl, {v.first, i32(i)}),
+                 with_index ? call(shfl_idx, {v.second, i32(i)}) : nullptr);
+  };
   for(int i = 16; i > 0; i >>= 1)
-    acc = do_acc(acc, call(shfl, {acc, i32(i)}));
+    acc = do_acc(acc, do_shfl(acc, i));
   // pointers
-  unsigned addr_space = shmem_->getType()->getPointerAddressSpace();
-  Value *base = bit_cast(shmem_, ptr_ty(ret_ty, addr_space));
+  analysis::shared_layout* layout = layouts_->get(layouts_->tmp(x))->to_shared();
+  Value *base = shared_ptr_.at(layout);
+  unsigned addr_space = base->getType()->getPointerAddressSpace();
+  // indices are stored after the values
+  Value *idx_base = nullptr;
+  if(with_index){
+    idx_base = gep(bit_cast(base, ptr_ty(i8_ty, addr_space)), i32(layout->get_size()/2));
+    idx_base = bit_cast(idx_base, ptr_ty(i32_ty, addr_space));
+  }
+  base = bit_cast(base, ptr_ty(acc_ty, addr_space));
+  auto do_store = [&](acc_t v, Value *off) {
+    store(v.first, gep(base, off));
+    if(with_index)
+      store(v.second, gep(idx_base, off));
+  };
+  auto do_load = [&](Value *off) -> acc_t {
+    return acc_t(load(gep(base, off)), with_index ? load(gep(idx_base, off)) : nullptr);
+  };
   Value* thread = tgt_->get_local_id(mod_, *builder_, 0);
   Value* warp = udiv(thread, i32(32));
   Value* lane = urem(thread, i32(32));
   // store warp result in shared memory
   add_barrier();
-  store(neutral, gep(base, lane));
+  do_store(neutral, lane);
   add_barrier();
-  store(acc, gep(base, warp));
+  do_store(acc, warp);
   add_barrier();
 
   // reduce across warps
@@ -1736,57 +2074,103 @@ void generator::visit_reduce1d_inst(ir::reduce_inst* x, std::function<Value*(Val
   Instruction *term = llvm::SplitBlockAndInsertIfThen(cond, barrier, false);
   dummy->removeFromParent();
   builder_->SetInsertPoint(term);
-  Value* ret = load(gep(base, thread));
-  for(int i = (num_warps_+1)/2; i > 0; i >>= 1){
-    Value *current = call(shfl, {ret, i32(i)});
-    ret = do_acc(ret, current);
-  }
-  store(ret, gep(base, thread));
+  acc_t ret = do_load(thread);
+  for(int i = (num_warps_+1)/2; i > 0; i >>= 1)
+    ret = do_acc(ret, do_shfl(ret, i));
+  do_store(ret, thread);
 
   // store first warp done
   builder_->SetInsertPoint(barrier->getParent());
-  ret = load(base);
+  Value *res = with_index ? load(idx_base) : load(base);
   for(indices_t idx: idxs_.at(x))
-    vals_[x][idx] = ret;
+    vals_[x][idx] = res;
 }
 
 /**
  * \brief Code Generation for `reduce` (ND case)
  */
-void generator::visit_reducend_inst(ir::reduce_inst* x, std::function<Value*(Value*,Value*)> do_acc, Value *neutral) {
+void generator::visit_reducend_inst(ir::reduce_inst* x, std::function<acc_t(acc_t,acc_t)> do_acc, acc_t neutral) {
   ir::value *arg = x->get_operand(0);
-  Type *ty = cvt(x->get_type()->get_scalar_ty());
+  bool with_index = x->with_index();
+  Type *ty = cvt(arg->get_type()->get_scalar_ty());
   unsigned axis = x->get_axis();
 
   // reduce within thread
-  std::map<indices_t, Value*> accs;
+  std::map<indices_t, acc_t> accs;
   for(indices_t idx: idxs_.at(arg)){
     indices_t pidx = idx;
     pidx[axis] = i32(0);
-    Value *current = vals_[arg][idx];
+    acc_t current(vals_[arg][idx], with_index ? idx[axis] : nullptr);
     bool is_first = accs.find(pidx) == accs.end();
     accs[pidx] = is_first ? current : do_acc(accs[pidx], current);
   };
 
+  // reduce within warp: every thread along `axis` ends up with the result,
+  // which is therefore already laid out like `arg` along the other axes
+  if(!layouts_->has_tmp(x)){
+    analysis::scanline_layout* layout = layouts_->get(arg)->to_scanline();
+    // shuffles move 32-bit registers: widen narrower operands
+    Type *acc_ty = ty;
+    if(ty->getPrimitiveSizeInBits() < 32)
+      acc_ty = ty->isFloatingPointTy() ? f32_ty : i32_ty;
+    InlineAsm *shfl = InlineAsm::get(FunctionType::get(acc_ty, {acc_ty, i32_ty}, false),
+                                     "shfl.sync.bfly.b32 $0, $1, $2, 0x1f, 0xffffffff;",
+                                     acc_ty->isFloatingPointTy() ? "=f,f,r" : "=r,r,r", false);
+    InlineAsm *shfl_idx = InlineAsm::get(FunctionType::get(i32_ty, {i32_ty, i32_ty}, false),
+                                         "shfl.sync.bfly.b32 $0, $1, $2, 0x1f, 0xffffffff;", "=r,r,r", false);
+    int stride = layout->thread_stride(axis);
+    for(auto& x: accs){
+      acc_t &acc = x.second;
+      if(acc_ty != ty)
+        acc.first = ty->isFloatingPointTy() ? builder_->CreateFPExt(acc.first, acc_ty)
+                                            : builder_->CreateSExt(acc.first, acc_ty);
+      for(int i = layout->mts(axis) / 2; i > 0; i >>= 1){
+        acc_t other(call(shfl, {acc.first, i32(i*stride)}),
+                    with_index ? call(shfl_idx, {acc.second, i32(i*stride)}) : nullptr);
+        acc = do_acc(acc, other);
+      }
+      if(acc_ty != ty)
+        acc.first = ty->isFloatingPointTy() ? builder_->CreateFPTrunc(acc.first, ty)
+                                            : builder_->CreateTrunc(acc.first, ty);
+    }
+    for(indices_t idx: idxs_.at(x)){
+      indices_t read_idx = idx;
+      read_idx.insert(read_idx.begin() + axis, i32(0));
+      acc_t &acc = accs.at(read_idx);
+      vals_[x][idx] = with_index ? acc.second : acc.first;
+    }
+    return;
+  }
+
   // reduce within blocks
-  analysis::data_layout* layout = layouts_->get(layouts_->tmp(x));
+  analysis::shared_layout* layout = layouts_->get(layouts_->tmp(x))->to_shared();
   Value *base = shared_ptr_.at(layout);
   auto shape  = layout->get_shape();
   auto order  = layout->get_order();
   int  space = base->getType()->getPointerAddressSpace();
   Value *ptr = bit_cast(base, ptr_ty(ty, space));
+  // indices are stored after the values
+  Value *idx_ptr = nullptr;
+  if(with_index){
+    shape[axis] /= 2;
+    idx_ptr = gep(bit_cast(base, ptr_ty(i8_ty, space)), i32(layout->get_size()/2));
+    idx_ptr = bit_cast(idx_ptr, ptr_ty(i32_ty, space));
+  }
   Value *lane = axes_.at(a_axes_->get(arg, axis)).thread_id;
   for(auto& x: accs) {
     // current element being computed
-    Value *&acc = x.second;
+    acc_t &acc = x.second;
     indices_t write_idx = x.first;
     write_idx[axis] = lane;
     // shared memory write  pointer
     Value *write_off = shared_off(shape, order, write_idx);
     Value *write_ptr = gep(ptr, write_off);
+    Value *write_idx_ptr = with_index ? gep(idx_ptr, write_off) : nullptr;
     // initialize shared memory
     add_barrier();
-    store(acc, write_ptr);
+    store(acc.first, write_ptr);
+    if(with_index)
+      store(acc.second, write_idx_ptr);
     // build result
     indices_t idx(write_idx.size(), i32(0));
     for(size_t i = shape[axis]/2; i > 0; i >>= 1){
@@ -1794,11 +2178,14 @@ void generator::visit_reducend_inst(ir::reduce_inst* x, std::function<Value*(Val
       // read pointer
       Value *read_msk = icmp_ult(lane, i32(i));
       Value *read_off = select(read_msk, shared_off(shape, order, idx), i32(0));
-      Value *read_ptr = gep(write_ptr, read_off);
       add_barrier();
       // update accumulator
-      acc = do_acc(acc, load(read_ptr));
-      store(acc, write_ptr);
+      acc_t current(load(gep(write_ptr, read_off)),
+                    with_index ? load(gep(write_idx_ptr, read_off)) : nullptr);
+      acc = do_acc(acc, current);
+      store(acc.first, write_ptr);
+      if(with_index)
+        store(acc.second, write_idx_ptr);
     }
   }
   add_barrier();
@@ -1808,8 +2195,7 @@ void generator::visit_reducend_inst(ir::reduce_inst* x, std::function<Value*(Val
     indices_t read_idx = idx;
     read_idx.insert(read_idx.begin() + axis, i32(0));
     Value *read_off = shared_off(shape, order, read_idx);
-    Value *read_ptr = gep(ptr, read_off);
-    vals_[x][idx] = load(read_ptr);
+    vals_[x][idx] = load(gep(with_index ? idx_ptr : ptr, read_off));
   };
 }
 
@@ -1817,10 +2203,11 @@ void generator::visit_reducend_inst(ir::reduce_inst* x, std::function<Value*(Val
  * \brief Code Generation for `reduce` (generic case)
  */
 void generator::visit_reduce_inst(ir::reduce_inst* x) {
-  Type *ty = cvt(x->get_type()->get_scalar_ty());
+  ir::value *arg = x->get_operand(0);
+  Type *ty = cvt(arg->get_type()->get_scalar_ty());
   // accumulation function
   ir::reduce_inst::op_t op = x->get_op();
-  auto do_acc = [&](Value *x, Value *y) -> Value* {
+  auto do_acc_op = [&](Value *x, Value *y) -> Value* {
     switch(op){
     case ir::reduce_inst::ADD: return add(x, y);
     case ir::reduce_inst::SUB: return sub(x, y);
@@ -1833,6 +2220,26 @@ void generator::visit_reduce_inst(ir::reduce_inst* x) {
     default: throw std::runtime_error("unreachable");
     }
   };
+  // whether `y` should replace `x` in an index-carrying reduction
+  auto do_arg_cmp = [&](Value *x, Value *y) -> Value* {
+    switch(op){
+    case ir::reduce_inst::ARGMAX: return icmp(llvm::CmpInst::ICMP_SGT, y, x);
+    case ir::reduce_inst::ARGMIN: return icmp(llvm::CmpInst::ICMP_SLT, y, x);
+    case ir::reduce_inst::ARGFMAX: return fcmp(llvm::CmpInst::FCMP_OGT, y, x);
+    case ir::reduce_inst::ARGFMIN: return fcmp(llvm::CmpInst::FCMP_OLT, y, x);
+    default: throw std::runtime_error("unreachable");
+    }
+  };
+  auto do_acc = [&](acc_t x, acc_t y) -> acc_t {
+    if(!x.second)
+      return acc_t(do_acc_op(x.first, y.first), nullptr);
+    // ties go to the smallest index
+    Value *eq = x.first->getType()->isFloatingPointTy() ? fcmp(llvm::CmpInst::FCMP_OEQ, x.first, y.first)
+                                                        : icmp_eq(x.first, y.first);
+    Value *pred = builder_->CreateOr(do_arg_cmp(x.first, y.first),
+                                     and_(eq, icmp(llvm::CmpInst::ICMP_SLT, y.second, x.second)));
+    return acc_t(select(pred, y.first, x.first), select(pred, y.second, x.second));
+  };
   // neutral element
   Value *neutral;
   switch(op) {
@@ -1844,13 +2251,199 @@ void generator::visit_reduce_inst(ir::reduce_inst* x) {
     case ir::reduce_inst::FSUB: neutral = ConstantFP::get(ty, 0); break;
     case ir::reduce_inst::FMAX: neutral = ConstantFP::get(ty, -INFINITY); break;
     case ir::reduce_inst::FMIN: neutral = ConstantFP::get(ty, INFINITY); break;
+    case ir::reduce_inst::ARGMAX: neutral = ConstantInt::get(ty, INT32_MIN); break;
+    case ir::reduce_inst::ARGMIN: neutral = ConstantInt::get(ty, INT32_MAX); break;
+    case ir::reduce_inst::ARGFMAX: neutral = ConstantFP::get(ty, -INFINITY); break;
+    case ir::reduce_inst::ARGFMIN: neutral = ConstantFP::get(ty, INFINITY); break;
     default: throw std::runtime_error("unreachable");
   }
-  ir::value *arg = x->get_operand(0);
+  acc_t neutral_acc(neutral, x->with_index() ? i32(INT32_MAX) : nullptr);
   if(arg->get_type()->get_tile_rank() == 1)
-    visit_reduce1d_inst(x, do_acc, neutral);
+    visit_reduce1d_inst(x, do_acc, neutral_acc);
   else
-    visit_reducend_inst(x, do_acc, neutral);
+    visit_reducend_inst(x, do_acc, neutral_acc);
+}
+
+/**
+ * \brief Code Generation for `scan`
+ */
+void generator::visit_scan_inst(ir::scan_inst* x) {
+  ir::value *arg = x->get_operand(0);
+  Type *ty = cvt(arg->get_type()->get_scalar_ty());
+  unsigned axis = x->get_axis();
+  bool exclusive = x->is_exclusive();
+  // accumulation function
+  ir::scan_inst::op_t op = x->get_op();
+  auto do_acc = [&](Value *a, Value *b) -> Value* {
+    switch(op){
+    case ir::scan_inst::ADD: return add(a, b);
+    case ir::scan_inst::MAX: return select(icmp_sge(a, b), a, b);
+    case ir::scan_inst::MIN: return select(icmp_sle(a, b), a, b);
+    case ir::scan_inst::FADD: return fadd(a, b);
+    case ir::scan_inst::FMAX: return max_num(a, b);
+    case ir::scan_inst::FMIN: return min_num(a, b);
+    case ir::scan_inst::CUSTOM: {
+      // inline the combine function
+      vals_[x->get_combine_lhs()][{}] = a;
+      vals_[x->get_combine_rhs()][{}] = b;
+      for(ir::instruction *i: x->get_combine()->get_inst_list()){
+        for(ir::value *op: i->ops())
+          if(dynamic_cast<ir::constant*>(op))
+            visit_value(op);
+        init_idx(i);
+        i->accept(this);
+      }
+      ir::value *res = x->get_combine_res();
+      if(dynamic_cast<ir::constant*>(res))
+        visit_value(res);
+      return vals_[res][{}];
+    }
+    default: throw std::runtime_error("unreachable");
+    }
+  };
+  // neutral element (exclusive scans only)
+  Value *neutral = nullptr;
+  switch(op) {
+    case ir::scan_inst::ADD: neutral = ConstantInt::get(ty, 0); break;
+    case ir::scan_inst::MAX: neutral = ConstantInt::get(ty, INT32_MIN); break;
+    case ir::scan_inst::MIN: neutral = ConstantInt::get(ty, INT32_MAX); break;
+    case ir::scan_inst::FADD: neutral = ConstantFP::get(ty, 0); break;
+    case ir::scan_inst::FMAX: neutral = ConstantFP::get(ty, -INFINITY); break;
+    case ir::scan_inst::FMIN: neutral = ConstantFP::get(ty, INFINITY); break;
+    default: break;
+  }
+  if(exclusive && !neutral)
+    throw std::runtime_error("exclusive scans require a neutral element");
+  // trivial axis
+  if(arg->get_type()->get_block_shapes()[axis] == 1){
+    for(indices_t idx: idxs_.at(arg))
+      vals_[x][idx] = exclusive ? neutral : vals_[arg][idx];
+    return;
+  }
+  analysis::scanline_layout* layout = layouts_->get(arg)->to_scanline();
+  if(!layout)
+    throw std::runtime_error("scan: unsupported layout");
+  // 32-bit warp shuffle; other widths are moved through 32-bit words
+  auto shfl = [&](Value *v, Value *src, bool up) -> Value* {
+    std::string mode = up ? "up" : "idx";
+    std::string clamp = up ? "0x0" : "0x1f";
+    InlineAsm *fn = InlineAsm::get(FunctionType::get(i32_ty, {i32_ty, i32_ty}, false),
+                                   "shfl.sync." + mode + ".b32 $0, $1, $2, " + clamp + ", 0xffffffff;", "=r,r,r", false);
+    unsigned bits = ty->getPrimitiveSizeInBits();
+    Type *int_ty = builder_->getIntNTy(bits);
+    Value *i = bit_cast(v, int_ty);
+    if(bits <= 32){
+      Value *ret = call(fn, {builder_->CreateZExt(i, i32_ty), src});
+      return bit_cast(builder_->CreateTrunc(ret, int_ty), ty);
+    }
+    Value *lo = call(fn, {builder_->CreateTrunc(i, i32_ty), src});
+    Value *hi = call(fn, {builder_->CreateTrunc(lshr(i, bits/2), i32_ty), src});
+    Value *ret = builder_->CreateOr(builder_->CreateZExt(lo, int_ty), shl(builder_->CreateZExt(hi, int_ty), bits/2));
+    return bit_cast(ret, ty);
+  };
+  // threads along `axis` are split into segments of `span` consecutive lanes
+  // of the same warp, `stride` lanes apart
+  unsigned nts = layout->nts(axis);
+  unsigned mts = layout->mts(axis);
+  unsigned reps = arg->get_type()->get_block_shapes()[axis] / (nts * mts);
+  int stride = layout->thread_stride(axis);
+  int span = layout->warp_span(axis);
+  unsigned num_segs = mts / span;
+  Value *tid = axes_.at(a_axes_->get(arg, axis)).thread_id;
+  Value *lane = urem(tgt_->get_local_id(mod_, *builder_, 0), i32(32));
+  Value *lane_k = urem(tid, i32(span));
+  Value *seg = udiv(tid, i32(span));
+  // segment totals are exchanged through shared memory
+  Value *tmp = nullptr;
+  std::vector<unsigned> tmp_shape;
+  std::vector<int> tmp_order;
+  if(num_segs > 1){
+    analysis::shared_layout* tmp_layout = layouts_->get(layouts_->tmp(x))->to_shared();
+    Value *base = shared_ptr_.at(tmp_layout);
+    tmp = bit_cast(base, ptr_ty(ty, base->getType()->getPointerAddressSpace()));
+    tmp_shape = tmp_layout->get_shape();
+    tmp_order = tmp_layout->get_order();
+  }
+  Value *is_writer = and_(icmp_eq(lane_k, i32(span - 1)), icmp_ult(tid, i32(mts)));
+  // group elements by row, in increasing order along `axis`
+  std::vector<indices_t> keys;
+  std::map<indices_t, std::vector<indices_t>> rows;
+  for(indices_t idx: idxs_.at(arg)){
+    indices_t key = idx;
+    key[axis] = i32(0);
+    if(rows.find(key) == rows.end())
+      keys.push_back(key);
+    rows[key].push_back(idx);
+  }
+  for(indices_t key: keys){
+    std::vector<indices_t>& idxs = rows.at(key);
+    Value *carry = nullptr;
+    for(unsigned r = 0; r < reps; r++){
+      // scan within thread
+      std::vector<Value*> loc(nts);
+      for(unsigned j = 0; j < nts; j++){
+        Value *current = vals_[arg][idxs[r*nts + j]];
+        loc[j] = j == 0 ? current : do_acc(loc[j - 1], current);
+      }
+      Value *inc = loc[nts - 1];
+      // scan within warp segment
+      for(int d = 1; d < span; d <<= 1){
+        Value *other = shfl(inc, i32(d*stride), true);
+        inc = select(icmp_uge(lane_k, i32(d)), do_acc(other, inc), inc);
+      }
+      // prefix of preceding threads, when `valid`
+      Value *pfx = inc;
+      Value *valid = builder_->getFalse();
+      if(span > 1){
+        pfx = shfl(inc, i32(stride), true);
+        valid = icmp_ugt(lane_k, i32(0));
+      }
+      // scan across warp segments
+      Value *total = nullptr;
+      if(num_segs > 1){
+        indices_t tmp_idx = key;
+        tmp_idx[axis] = select(is_writer, seg, i32(num_segs));
+        add_barrier();
+        store(inc, gep(tmp, shared_off(tmp_shape, tmp_order, tmp_idx)));
+        add_barrier();
+        Value *seg_pfx = nullptr;
+        for(unsigned s = 0; s < num_segs; s++){
+          tmp_idx[axis] = i32(s);
+          Value *current = load(gep(tmp, shared_off(tmp_shape, tmp_order, tmp_idx)));
+          total = s == 0 ? current : do_acc(total, current);
+          seg_pfx = s == 0 ? total : select(icmp_eq(seg, i32(s + 1)), total, seg_pfx);
+        }
+        Value *seg_valid = icmp_ugt(seg, i32(0));
+        pfx = select(seg_valid, select(valid, do_acc(seg_pfx, pfx), seg_pfx), pfx);
+        valid = builder_->CreateOr(valid, seg_valid);
+      }
+      else if(r + 1 < reps){
+        // broadcast the total from the last thread of the segment
+        Value *src = add(lane, mul(sub(i32(span - 1), lane_k), i32(stride)));
+        total = shfl(inc, src, false);
+      }
+      // prefix of preceding repetitions
+      if(carry){
+        pfx = select(valid, do_acc(carry, pfx), carry);
+        valid = builder_->getTrue();
+      }
+      // write back
+      for(unsigned j = 0; j < nts; j++){
+        Value *ret;
+        if(!exclusive)
+          ret = select(valid, do_acc(pfx, loc[j]), loc[j]);
+        else if(j == 0)
+          ret = select(valid, pfx, neutral);
+        else
+          ret = select(valid, do_acc(pfx, loc[j - 1]), loc[j - 1]);
+        vals_[x][idxs[r*nts + j]] = ret;
+      }
+      if(r + 1 < reps)
+        carry = carry ? do_acc(carry, total) : total;
+    }
+  }
+  if(num_segs > 1)
+    add_barrier();
 }
 
 /**
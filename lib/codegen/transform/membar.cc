@@ -48,7 +48,7 @@ inline bool membar::intersect_with(analysis::shared_layout* a_layout, analysis::
   int a_end = a_start + a_layout->get_size();
   int b_start = alloc_->offset(b_layout);
   int b_end = b_start + b_layout->get_size();
-  if(a_start < b_end || b_start < a_end)
+  if(a_start < b_end && b_start < a_end)
     return true;
   return false;
 }
@@ -75,6 +75,23 @@ membar::val_set_t membar::intersect_with(const val_set_t& as, const val_set_t& b
   return ret;
 }
 
+/// Whether `i` may access global memory that has been written (or read) by
+/// another thread through one of `accesses`. Block accesses through the same
+/// pointer value share the same layout and are thus made by the same thread;
+/// accesses through distinct base pointers are assumed not to alias
+bool membar::global_hazard(ir::io_inst* i, const val_set_t& accesses) {
+  ir::value* ptr = i->get_pointer_operand();
+  ir::value* base = ir::get_base_ptr(ptr);
+  for(ir::value* v: accesses){
+    ir::value* other_ptr = static_cast<ir::io_inst*>(v)->get_pointer_operand();
+    if(other_ptr == ptr && ptr->get_type()->is_block_ty())
+      continue;
+    if(ir::get_base_ptr(other_ptr) == base)
+      return true;
+  }
+  return false;
+}
+
 bool membar::check_safe_war(ir::instruction* i) {
   bool is_i_shared_block = i->get_type()->is_block_ty() &&
                           layouts_->get(i)->to_shared();
@@ -97,10 +114,13 @@ void membar::transfer(ir::basic_block *block,
                       val_vec_t& async_write,
                       val_set_t& sync_write,
                       val_set_t& sync_read,
+                      val_set_t& global_write,
+                      val_set_t& global_read,
                       std::set<ir::value*>& safe_war,
                       bool& inserted, ir::builder& builder) {
   std::vector<ir::async_wait_inst*> async_waits;
   ir::basic_block::inst_list_t instructions = block->get_inst_list();
+  ir::instruction* prev = nullptr;
   for(ir::instruction *i: instructions){
     if(dynamic_cast<ir::phi_node*>(i))
       continue;
@@ -108,10 +128,17 @@ void membar::transfer(ir::basic_block *block,
        dynamic_cast<ir::masked_load_async_inst*>(i)){
       async_write.push_back(i);
     }
-    if(dynamic_cast<ir::copy_to_shared_inst*>(i))
-      sync_write.insert(i);
     ir::barrier_inst* barrier = dynamic_cast<ir::barrier_inst*>(i);
     ir::async_wait_inst* async_wait = dynamic_cast<ir::async_wait_inst*>(i);
+    // a barrier we inserted is redundant if nothing needs to be
+    // synchronized, unless it makes asynchronous copies visible
+    if(barrier && inserted_.find(i) != inserted_.end()){
+      bool is_empty = sync_write.empty() && sync_read.empty() &&
+                      global_write.empty() && global_read.empty();
+      if(is_empty && !dynamic_cast<ir::async_wait_inst*>(prev))
+        redundant_.insert(i);
+    }
+    prev = i;
     // Get shared memory reads
     std::set<ir::value*> read;
     std::copy_if(i->op_begin(), i->op_end(), std::inserter(read, read.begin()),
@@ -129,6 +156,7 @@ void membar::transfer(ir::basic_block *block,
         builder.set_insert_point(i);
         async_wait = (ir::async_wait_inst*)builder.create_async_wait(async_write.size() - 1 - N);
         barrier = (ir::barrier_inst*)builder.create_barrier();
+        inserted_.insert(barrier);
         inserted = true;
         async_waits.push_back(async_wait);
       }
@@ -136,10 +164,21 @@ void membar::transfer(ir::basic_block *block,
     // RAW, WAR
     bool is_safe_war = check_safe_war(i);
     // WAR barrier is not required when data is double-buffered
-    if(!intersect_with(read, sync_write).empty() || 
-       (!intersect_with({i}, sync_read).empty() && !is_safe_war)) {
+    bool shared_hazard = !intersect_with(read, sync_write).empty() ||
+                         (!intersect_with({i}, sync_read).empty() && !is_safe_war);
+    // RAW, WAR on global memory
+    // (atomics both read and write global memory)
+    auto* global_ld = dynamic_cast<ir::load_inst*>(i);
+    auto* global_st = dynamic_cast<ir::store_inst*>(i);
+    auto* global_atom = dynamic_cast<ir::atomic_inst*>(i);
+    bool is_global_hazard = (global_ld && global_hazard(global_ld, global_write)) ||
+                            (global_st && global_hazard(global_st, global_read)) ||
+                            (global_atom && (global_hazard(global_atom, global_read) ||
+                                             global_hazard(global_atom, global_write)));
+    if(!barrier && (shared_hazard || is_global_hazard)) {
       builder.set_insert_point(i);
       barrier = (ir::barrier_inst*)builder.create_barrier();
+      inserted_.insert(barrier);
       inserted = true;
     }
     // update state of asynchronous copies
@@ -151,8 +190,16 @@ void membar::transfer(ir::basic_block *block,
     if(barrier){
       sync_write.clear();
       sync_read.clear();
+      global_write.clear();
+      global_read.clear();
     }
+    if(dynamic_cast<ir::copy_to_shared_inst*>(i))
+      sync_write.insert(i);
     sync_read.insert(read.begin(), read.end());
+    if(global_ld || global_atom)
+      global_read.insert(i);
+    if(global_st || global_atom)
+      global_write.insert(i);
   }
 
   // coalesce barriers
@@ -183,8 +230,10 @@ void membar::transfer(ir::basic_block *block,
             }
           } else 
             break;
-          for (ir::instruction *i : to_erase)
+          for (ir::instruction *i : to_erase){
             block->erase(i);
+            inserted_.erase(i);
+          }
         }
       }
     }
@@ -207,21 +256,31 @@ void membar::run(ir::module &mod) {
       }
   }
 
+  inserted_.clear();
   for(ir::function *fn: mod.get_function_list()){
     std::vector<ir::basic_block*> rpo = ir::cfg::reverse_post_order(fn);
     std::map<ir::basic_block*, val_vec_t> async_writes;
     std::map<ir::basic_block*, val_set_t> sync_writes;
     std::map<ir::basic_block*, val_set_t> sync_reads;
+    std::map<ir::basic_block*, val_set_t> global_writes;
+    std::map<ir::basic_block*, val_set_t> global_reads;
     std::list<ir::value *> pipelined;
     bool inserted;
+    bool changed;
+    // iterate until both the barriers and the
+    // states at the end of each block are stable
     do{
       inserted = false;
+      changed = false;
+      redundant_.clear();
       // find barrier location
       for(ir::basic_block *block: rpo){
         // join inputs
         val_vec_t async_write;
         val_set_t sync_write;
         val_set_t sync_read;
+        val_set_t global_write;
+        val_set_t global_read;
         val_set_t tmp;
         for(ir::basic_block* pred: block->get_predecessors()){
           for(ir::value* v: async_writes[pred])
@@ -229,14 +288,36 @@ void membar::run(ir::module &mod) {
               async_write.push_back(v);
           sync_write.insert(sync_writes[pred].begin(), sync_writes[pred].end());
           sync_read.insert(sync_reads[pred].begin(), sync_reads[pred].end());
+          global_write.insert(global_writes[pred].begin(), global_writes[pred].end());
+          global_read.insert(global_reads[pred].begin(), global_reads[pred].end());
         }
-        transfer(block, async_write, sync_write, sync_read, safe_war, inserted, builder);
+        transfer(block, async_write, sync_write, sync_read, global_write, global_read,
+                 safe_war, inserted, builder);
+        changed = changed || sync_writes[block] != sync_write
+                          || sync_reads[block] != sync_read
+                          || global_writes[block] != global_write
+                          || global_reads[block] != global_read;
         async_writes[block] = async_write;
         sync_writes[block] = sync_write;
         sync_reads[block] = sync_read;
+        global_writes[block] = global_write;
+        global_reads[block] = global_read;
       }
-    }while(inserted);
+    }while(inserted || changed);
+    // remove barriers that don't synchronize anything.
+    // This doesn't change the state of any other barrier
+    for(ir::instruction* i: redundant_){
+      i->get_parent()->erase(i);
+      inserted_.erase(i);
+    }
   }
+
+  // count barriers
+  num_barriers_ = 0;
+  ir::for_each_instruction(mod, [&](ir::instruction* i){
+    if(dynamic_cast<ir::barrier_inst*>(i))
+      num_barriers_++;
+  });
 }
 
 }
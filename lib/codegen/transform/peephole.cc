@@ -129,7 +129,7 @@ bool peephole::rewrite_load_to_shared(ir::instruction *value, ir::builder& build
 
 bool peephole::rewrite_unit_red(ir::instruction *value, ir::builder& builder){
   auto x = dynamic_cast<ir::reduce_inst*>(value);
-  if(!x)
+  if(!x || x->with_index())
     return false;
   ir::value *arg = x->get_operand(0);
   auto shapes = arg->get_type()->get_block_shapes();
@@ -206,11 +206,85 @@ bool peephole::rewrite_select_masked_load(ir::instruction *value, ir::builder& b
   builder.set_insert_point(select);
   ir::value* new_load = builder.create_masked_load(if_value->get_pointer_operand(),
                                                    if_value->get_mask_operand(),
-                                                   select->get_else_value_op());
+                                                   select->get_else_value_op(),
+                                                   if_value->get_cache_modifier(),
+                                                   if_value->get_eviction_policy());
   select->replace_all_uses_with(new_load);
   return true;
 }
 
+/// Whether the integer `v` is provably non-negative. Phi nodes in `visiting`
+/// are assumed non-negative, so that induction variables which start from and
+/// are incremented by non-negative values are non-negative
+static bool is_nonneg(ir::value* v, std::set<ir::phi_node*>& visiting) {
+  if(auto* cst = dynamic_cast<ir::constant_int*>(v)){
+    unsigned bits = cst->get_type()->get_integer_bitwidth();
+    return ((cst->get_value() >> (bits - 1)) & 1) == 0;
+  }
+  if(auto* range = dynamic_cast<ir::make_range*>(v))
+    return is_nonneg(const_cast<ir::constant_int*>(range->get_first()), visiting);
+  if(dynamic_cast<ir::get_program_id_inst*>(v) || dynamic_cast<ir::get_num_programs_inst*>(v))
+    return true;
+  if(dynamic_cast<ir::splat_inst*>(v) || dynamic_cast<ir::broadcast_inst*>(v) ||
+     dynamic_cast<ir::reshape_inst*>(v))
+    return is_nonneg(static_cast<ir::instruction*>(v)->get_operand(0), visiting);
+  if(auto* phi = dynamic_cast<ir::phi_node*>(v)){
+    if(!visiting.insert(phi).second)
+      return true;
+    bool ret = true;
+    for(unsigned n = 0; n < phi->get_num_incoming() && ret; n++)
+      ret = is_nonneg(phi->get_incoming_value(n), visiting);
+    visiting.erase(phi);
+    return ret;
+  }
+  if(auto* binop = dynamic_cast<ir::binary_operator*>(v)){
+    ir::value* lhs = binop->get_operand(0);
+    ir::value* rhs = binop->get_operand(1);
+    switch(binop->get_op()){
+      case ir::binary_op_t::Add:
+      case ir::binary_op_t::Mul:
+      case ir::binary_op_t::SDiv:
+      case ir::binary_op_t::SRem:
+        return is_nonneg(lhs, visiting) && is_nonneg(rhs, visiting);
+      case ir::binary_op_t::And:
+        return is_nonneg(lhs, visiting) || is_nonneg(rhs, visiting);
+      default:
+        return false;
+    }
+  }
+  return false;
+}
+
+/// Drops `x >= 0` from the masks it is and-ed into when `x` is provably
+/// non-negative, e.g., the lower bound of the boundary checks of block pointers
+bool peephole::rewrite_nonneg_lower_bound(ir::instruction *value, ir::builder& builder){
+  auto cmp = dynamic_cast<ir::icmp_inst*>(value);
+  if(!cmp || cmp->get_pred() != ir::cmp_pred_t::ICMP_SGE)
+    return false;
+  ir::value* zero = cmp->get_operand(1);
+  if(auto* splat = dynamic_cast<ir::splat_inst*>(zero))
+    zero = splat->get_operand(0);
+  auto* cst = dynamic_cast<ir::constant_int*>(zero);
+  if(!cst || cst->get_value() != 0)
+    return false;
+  std::set<ir::phi_node*> visiting;
+  if(!is_nonneg(cmp->get_operand(0), visiting))
+    return false;
+  bool modified = false;
+  std::set<ir::user*> users = cmp->get_users();
+  for(ir::user* u: users){
+    auto* binop = dynamic_cast<ir::binary_operator*>(u);
+    if(!binop || binop->get_op() != ir::binary_op_t::And)
+      continue;
+    ir::value* other = binop->get_operand(0) == cmp ? binop->get_operand(1) : binop->get_operand(0);
+    if(other == cmp)
+      continue;
+    binop->replace_all_uses_with(other);
+    modified = true;
+  }
+  return modified;
+}
+
 void peephole::run(ir::module &mod) {
   ir::builder &builder = mod.get_builder();
   // keep track of whether any modification was made
@@ -248,6 +322,7 @@ void peephole::run(ir::module &mod) {
       was_modified = was_modified || rewrite_unit_red(i, builder);
       was_modified = was_modified || rewrite_gep_ptr_min_off_plus_off(i, builder);
       was_modified = was_modified || rewrite_select_masked_load(i, builder);
+      was_modified = was_modified || rewrite_nonneg_lower_bound(i, builder);
       if(tgt_->as_nvidia()->sm() >= 80)
         was_modified = was_modified || rewrite_load_to_shared(i, builder);
       if(was_modified)
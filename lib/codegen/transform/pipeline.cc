@@ -117,21 +117,119 @@ void finalize_iv_vals(ir::builder& builder, std::map<ir::phi_node*, ir::value*>&
   }
 }
 
+/// collects the phi nodes that `v` depends on. Returns false if `v`
+/// depends on memory operations, which cannot be rematerialized
+bool collect_phi_deps(ir::value* v, std::set<ir::phi_node*>& phis, std::set<ir::value*>& seen) {
+  ir::instruction* i = dynamic_cast<ir::instruction*>(v);
+  if(!i || !seen.insert(v).second)
+    return true;
+  if(auto* phi = dynamic_cast<ir::phi_node*>(i)) {
+    phis.insert(phi);
+    return true;
+  }
+  if(dynamic_cast<ir::io_inst*>(i))
+    return false;
+  for(ir::value* op: i->ops())
+    if(!collect_phi_deps(op, phis, seen))
+      return false;
+  return true;
+}
+
+/// A load that does not feed a dot instruction is pipelined through registers if:
+///   - its loop consists of a single basic block with a guarded pre-header
+///   - its pointer, mask and `other` operands only depend on the pointer
+///     and on the loop induction variables, which can then be
+///     rematerialized for future iterations
+///   - no memory it may read from is written to inside the loop
+/// Whether `v` is a kernel argument declared not to alias other arguments
+static bool is_noalias(ir::value* v) {
+  auto* arg = dynamic_cast<ir::argument*>(v);
+  if(!arg)
+    return false;
+  for(ir::attribute attr: arg->get_parent()->get_attributes(arg))
+    if(attr.get_kind() == ir::noalias)
+      return true;
+  return false;
+}
+
+bool is_register_pipelinable(ir::load_inst* load, ir::phi_node* ptr) {
+  ir::basic_block* block = load->get_parent();
+  if(ptr->get_parent() != block || ptr->get_num_incoming() != 2
+     || !load->get_type()->is_block_ty())
+    return false;
+  const std::vector<ir::basic_block*>& preds = block->get_predecessors();
+  if(preds.size() != 2 || preds[0] == block)
+    return false;
+  auto* block_br = dynamic_cast<ir::cond_branch_inst*>(block->get_inst_list().back());
+  auto* header_br = dynamic_cast<ir::cond_branch_inst*>(preds[0]->get_inst_list().back());
+  if(!block_br || !header_br || !dynamic_cast<ir::instruction*>(block_br->get_cond()))
+    return false;
+  // phi nodes that can be rematerialized
+  std::set<ir::phi_node*> ivs;
+  get_induction_vars(block_br->get_cond(), ivs);
+  ivs.insert(ptr);
+  for(ir::phi_node* iv: ivs) {
+    std::set<ir::phi_node*> deps;
+    std::set<ir::value*> seen;
+    if(iv->get_parent() != block || iv->get_num_incoming() != 2
+       || !collect_phi_deps(iv->get_incoming_value(1), deps, seen))
+      return false;
+    if(deps.size() > 1 || (deps.size() == 1 && *deps.begin() != iv))
+      return false;
+  }
+  if(auto* masked_load = dynamic_cast<ir::masked_load_inst*>(load)) {
+    std::set<ir::phi_node*> deps;
+    std::set<ir::value*> seen;
+    if(!collect_phi_deps(masked_load->get_mask_operand(), deps, seen) ||
+       !collect_phi_deps(masked_load->get_false_value_operand(), deps, seen))
+      return false;
+    for(ir::phi_node* phi: deps)
+      if(ivs.find(phi) == ivs.end())
+        return false;
+  }
+  // prefetching must not be reordered with (possibly) aliasing writes;
+  // atomics and instructions with unknown side effects may write anywhere
+  ir::value* base = ir::get_base_ptr(ptr);
+  for(ir::instruction* i: block->get_inst_list()) {
+    if(dynamic_cast<ir::load_inst*>(i) || dynamic_cast<ir::terminator_inst*>(i))
+      continue;
+    if(dynamic_cast<ir::atomic_inst*>(i))
+      return false;
+    // distinct kernel arguments may alias unless they are declared `noalias`
+    if(auto* store = dynamic_cast<ir::store_inst*>(i)) {
+      ir::value* dst_base = ir::get_base_ptr(store->get_pointer_operand());
+      if(base == dst_base || !is_noalias(base) || !is_noalias(dst_base))
+        return false;
+    }
+    else if(i->get_type()->is_void_ty())
+      return false;
+  }
+  return true;
+}
+
 void pipeline::run(ir::module &mod) {
   // *Very* conservative heuristics for pre-fetching.
   // A load instruction can be pipelined if:
   //   - the pointer is a phi node that references a value
   //     in its basic block (i.e., pointer induction variable)
-  //   - the load has only  a single use in a dot instruction
+  //   - the load has only  a single use in a dot instruction,
+  //     in which case it is pipelined through shared memory, or
+  //     num_stages > 1 and the load can be pipelined through registers
   // As more use cases become apparent, this pass will be improved
   std::vector<std::pair<ir::load_inst*, ir::phi_node*>> to_pipeline;
+  std::set<ir::load_inst*> to_registers;
   ir::for_each_instruction(mod, [&](ir::instruction *i){
     if(auto* load = dynamic_cast<ir::load_inst*>(i)){
       ir::phi_node* ptr = dynamic_cast<ir::phi_node*>(load->get_pointer_operand());
+      if(!ptr || ptr->get_incoming_block(1) != ptr->get_parent())
+        return;
       auto users = load->get_users();
-      if(ptr && ptr->get_incoming_block(1) == ptr->get_parent()
-         && users.size() == 1 && dynamic_cast<ir::dot_inst*>(*users.begin()))
+      if(users.size() == 1 && dynamic_cast<ir::dot_inst*>(*users.begin()))
+        to_pipeline.push_back({load, ptr});
+      else if(num_stages_ > 1 && is_register_pipelinable(load, ptr)){
         to_pipeline.push_back({load, ptr});
+        to_registers.insert(load);
+      }
     }});
   // do the pipelining
   std::vector<ir::phi_node*> new_loads;
@@ -149,7 +247,9 @@ void pipeline::run(ir::module &mod) {
     assert(header_br);
     ir::type* ty = load->get_type();
     // multi-stage pipe
-    if (has_copy_async_ && num_stages > 2) {
+    // (register pipelines do not need asynchronous copies)
+    bool is_register_pipe = to_registers.find(load) != to_registers.end();
+    if ((has_copy_async_ || is_register_pipe) && num_stages > 2) {
       ir::value* header_cond = header_br->get_cond();
       ir::value* block_cond = block_br->get_cond();
       // 1. collect induction variables
@@ -183,7 +283,8 @@ void pipeline::run(ir::module &mod) {
         false_value = remat_false_value;
       } else
         false_value = builder.create_splat(ir::undef_value::get(ty->get_scalar_ty()), ty->get_block_shapes());
-      first_loads[0] = builder.create_masked_load(first_ptrs[0], first_masks[0], false_value);
+      first_loads[0] = builder.create_masked_load(first_ptrs[0], first_masks[0], false_value,
+                                                  load->get_cache_modifier(), load->get_eviction_policy());
 
       for (int stage = 1; stage < num_stages-1; ++stage) {
         // mask is the loop condition of the previous iteration
@@ -198,7 +299,8 @@ void pipeline::run(ir::module &mod) {
           first_masks[stage] = builder.create_and(first_masks[stage], remat_mask);
           false_value = remat_false_value;
         }
-        first_loads[stage] = builder.create_masked_load(first_ptrs[stage], first_masks[stage], false_value);
+        first_loads[stage] = builder.create_masked_load(first_ptrs[stage], first_masks[stage], false_value,
+                                                        load->get_cache_modifier(), load->get_eviction_policy());
       }
 
       // create new phis for induction variables
@@ -226,7 +328,8 @@ void pipeline::run(ir::module &mod) {
         next_mask = builder.create_and(next_mask, remat_mask);
         false_value = remat_false_value;
       }
-      ir::value* next_load = builder.create_masked_load(next_ptr, next_mask, false_value);
+      ir::value* next_load = builder.create_masked_load(next_ptr, next_mask, false_value,
+                                                        load->get_cache_modifier(), load->get_eviction_policy());
 
 
       // phi node
@@ -261,7 +364,8 @@ void pipeline::run(ir::module &mod) {
       }
       else
         false_value = builder.create_splat(ir::undef_value::get(ty->get_scalar_ty()), ty->get_block_shapes());
-      ir::value* first_load = builder.create_masked_load(first_ptr, first_mask, false_value);
+      ir::value* first_load = builder.create_masked_load(first_ptr, first_mask, false_value,
+                                                         load->get_cache_modifier(), load->get_eviction_policy());
       // pre-fetch next iteration
       builder.set_insert_point(block->get_inst_list().back());
       ir::value* next_ptr = ptr->get_value_for_block(block);
@@ -272,7 +376,8 @@ void pipeline::run(ir::module &mod) {
         next_mask = builder.create_and(next_mask, remat_mask);
         false_value = remat_false_value;
       }
-      ir::value* next_load = builder.create_masked_load(next_ptr, next_mask, false_value);
+      ir::value* next_load = builder.create_masked_load(next_ptr, next_mask, false_value,
+                                                        load->get_cache_modifier(), load->get_eviction_policy());
       // phi node
       builder.set_insert_point(block->get_first_non_phi());
       ir::phi_node* new_load = builder.create_phi(ty, 2);
@@ -285,12 +390,16 @@ void pipeline::run(ir::module &mod) {
 
   // try to reorder prefetched value from a0, a1, a2, ..., b0, b1, b2, ...  to
   // a0, b0, a1, b1, ...
-  if (!preheader_loads.empty()) {
-    ir::basic_block* header = preheader_loads.begin()->first->get_incoming_block(0);
+  // (loads of different loops are reordered separately)
+  std::map<ir::basic_block*, std::vector<std::vector<ir::value*>>> preheader_loads_of;
+  for (auto& x : preheader_loads)
+    preheader_loads_of[x.first->get_incoming_block(0)].push_back(x.second);
+  for (auto& x : preheader_loads_of) {
+    ir::basic_block* header = x.first;
     builder.set_insert_point(header->get_inst_list().back());
     for (int i=1; i<num_stages-1; ++i) {
-      for (auto iter = preheader_loads.begin(); iter != preheader_loads.end(); ++iter) {
-        ir::instruction* original_load = static_cast<ir::instruction*>(iter->second.at(i));
+      for (auto iter = x.second.begin(); iter != x.second.end(); ++iter) {
+        ir::instruction* original_load = static_cast<ir::instruction*>(iter->at(i));
         ir::instruction* moved_load = original_load->clone();
         builder.insert(moved_load);
         original_load->replace_all_uses_with(moved_load);
@@ -0,0 +1,127 @@
+#include "triton/codegen/transform/ptr_induction.h"
+#include "triton/ir/module.h"
+#include "triton/ir/function.h"
+#include "triton/ir/basic_block.h"
+#include "triton/ir/instructions.h"
+#include "triton/ir/builder.h"
+#include "triton/ir/utils.h"
+
+namespace triton {
+namespace codegen{
+namespace transform{
+
+/// returns true if all the elements of v are equal to `scalar`
+bool ptr_induction::is_uniform(ir::value *v, ir::value *&scalar) {
+  if(!v->get_type()->is_block_ty()){
+    scalar = v;
+    return true;
+  }
+  if(dynamic_cast<ir::splat_inst*>(v) || dynamic_cast<ir::broadcast_inst*>(v))
+    return is_uniform(((ir::instruction*)v)->get_operand(0), scalar);
+  return false;
+}
+
+/// decomposes the block of pointers v into gep(splat(base), off),
+/// where `off` is a block of offsets, or nullptr if all the pointers
+/// are equal. Returns false if v is not of this form.
+bool ptr_induction::decompose(ir::value *v, ir::value *&base, ir::value *&off, ir::builder &builder) {
+  if(auto *splat = dynamic_cast<ir::splat_inst*>(v)){
+    base = splat->get_operand(0);
+    off = nullptr;
+    return !base->get_type()->is_block_ty();
+  }
+  if(auto *broadcast = dynamic_cast<ir::broadcast_inst*>(v)){
+    if(!decompose(broadcast->get_operand(0), base, off, builder))
+      return false;
+    if(off)
+      off = builder.create_broadcast(off, v->get_type()->get_block_shapes());
+    return true;
+  }
+  auto *gep = dynamic_cast<ir::getelementptr_inst*>(v);
+  if(!gep || gep->get_num_operands() != 2)
+    return false;
+  if(!decompose(gep->get_pointer_operand(), base, off, builder))
+    return false;
+  ir::value *idx = *gep->idx_begin();
+  ir::value *scalar;
+  // uniform offsets are applied to the base pointer
+  if(is_uniform(idx, scalar)){
+    base = builder.create_gep(base, {scalar});
+    return true;
+  }
+  if(!off){
+    off = idx;
+    return true;
+  }
+  if(off->get_type() != idx->get_type())
+    return false;
+  off = builder.create_add(off, idx);
+  return true;
+}
+
+/// re-creates a block of pointers of the shape of `like`
+/// from its base pointer and its offsets
+ir::value* ptr_induction::rebuild(ir::value *base, ir::value *off, ir::value *like, ir::builder &builder) {
+  ir::value *ret = builder.create_splat(base, like->get_type()->get_block_shapes());
+  if(off)
+    ret = builder.create_gep(ret, {off});
+  return ret;
+}
+
+bool ptr_induction::rewrite_phi(ir::phi_node *phi, ir::builder &builder) {
+  ir::type *ty = phi->get_type();
+  if(!ty->is_block_ty() || !ty->get_scalar_ty()->is_pointer_ty())
+    return false;
+  if(phi->get_num_incoming() != 2)
+    return false;
+  // find the latch: p_next = gep(p, splat(inc))
+  int latch = -1;
+  ir::value *inc = nullptr;
+  for(int n = 0; n < 2; n++){
+    auto *gep = dynamic_cast<ir::getelementptr_inst*>(phi->get_incoming_value(n));
+    if(gep && gep->get_num_operands() == 2 && gep->get_pointer_operand() == phi
+       && is_uniform(*gep->idx_begin(), inc))
+      latch = n;
+  }
+  if(latch < 0)
+    return false;
+  auto *next = (ir::getelementptr_inst*)phi->get_incoming_value(latch);
+  ir::basic_block *init_block = phi->get_incoming_block(1 - latch);
+  // split the initial value into a scalar base pointer and
+  // a block of offsets, both computed before the loop
+  builder.set_insert_point(init_block->get_inst_list().back());
+  ir::value *init, *off;
+  if(!decompose(phi->get_incoming_value(1 - latch), init, off, builder))
+    return false;
+  // scalar induction variable
+  builder.set_insert_point(phi);
+  ir::phi_node *base_phi = builder.create_phi(init->get_type(), 2);
+  builder.set_insert_point(next);
+  ir::value *base_next = builder.create_gep(base_phi, {inc});
+  for(int n = 0; n < 2; n++)
+    base_phi->add_incoming((n == latch) ? base_next : init, phi->get_incoming_block(n));
+  // the original blocks of pointers are re-created from the
+  // base pointer; unused ones are removed by dead-code elimination
+  builder.set_insert_point(phi->get_parent()->get_first_non_phi());
+  ir::value *new_phi = rebuild(base_phi, off, phi, builder);
+  builder.set_insert_point(next);
+  ir::value *new_next = rebuild(base_next, off, next, builder);
+  next->replace_all_uses_with(new_next);
+  phi->replace_all_uses_with(new_phi);
+  return true;
+}
+
+void ptr_induction::run(ir::module &mod) {
+  ir::builder &builder = mod.get_builder();
+  std::vector<ir::phi_node*> phis;
+  ir::for_each_instruction(mod, [&](ir::instruction *i){
+    if(auto *phi = dynamic_cast<ir::phi_node*>(i))
+      phis.push_back(phi);
+  });
+  for(ir::phi_node *phi: phis)
+    rewrite_phi(phi, builder);
+}
+
+}
+}
+}
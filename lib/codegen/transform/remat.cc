@@ -0,0 +1,188 @@
+#include <algorithm>
+#include "triton/codegen/transform/remat.h"
+#include "triton/ir/module.h"
+#include "triton/ir/function.h"
+#include "triton/ir/basic_block.h"
+#include "triton/ir/instructions.h"
+#include "triton/ir/builder.h"
+#include "triton/ir/utils.h"
+
+namespace triton {
+namespace codegen{
+namespace transform{
+
+/// maximum depth of rematerialized expressions
+static const int max_depth = 8;
+
+bool remat::is_cheap(ir::value *v, int depth) {
+  ir::instruction *i = dynamic_cast<ir::instruction*>(v);
+  // scalars are re-used as is
+  if(!i || !v->get_type()->is_block_ty())
+    return true;
+  if(depth > max_depth)
+    return false;
+  ir::type *ty = v->get_type()->get_scalar_ty();
+  bool is_int_or_ptr = ty->is_integer_ty() || ty->is_pointer_ty();
+  bool is_cheap_op = dynamic_cast<ir::make_range*>(i) ||
+                     dynamic_cast<ir::retile_inst*>(i) ||
+                     dynamic_cast<ir::getelementptr_inst*>(i) ||
+                     (is_int_or_ptr && (dynamic_cast<ir::binary_operator*>(i) ||
+                                        dynamic_cast<ir::cmp_inst*>(i) ||
+                                        dynamic_cast<ir::cast_inst*>(i)));
+  if(!is_cheap_op)
+    return false;
+  for(ir::value *op: i->ops())
+    if(!is_cheap(op, depth + 1))
+      return false;
+  return true;
+}
+
+/// rough estimate of the number of 32-bit registers
+/// used by each thread to hold `v`
+unsigned remat::get_num_regs(ir::value *v) {
+  ir::type *ty = v->get_type();
+  if(!ty->is_block_ty())
+    return 1;
+  ir::type *scalar_ty = ty->get_scalar_ty();
+  unsigned bits = scalar_ty->is_pointer_ty() ? 64 : scalar_ty->get_primitive_size_in_bits();
+  unsigned num_threads = num_warps_ * 32;
+  unsigned num_bytes = ty->get_tile_num_elements() * std::max<unsigned>(bits, 32) / 8;
+  return std::max<unsigned>(1, num_bytes / (4 * num_threads));
+}
+
+/// largest number of registers per thread that still lets
+/// two programs run concurrently on a 64K-register SM
+unsigned remat::get_budget() const {
+  return std::min<unsigned>(255, 65536 / (2 * 32 * num_warps_));
+}
+
+ir::value *remat::clone(ir::value *v, ir::builder &builder,
+                        std::map<ir::value*, ir::value*> &cloned) {
+  ir::instruction *i = dynamic_cast<ir::instruction*>(v);
+  if(!i || !v->get_type()->is_block_ty())
+    return v;
+  if(cloned.find(v) != cloned.end())
+    return cloned.at(v);
+  std::vector<ir::value*> new_ops;
+  for(ir::value *op: i->ops())
+    new_ops.push_back(clone(op, builder, cloned));
+  ir::instruction *ret = i->clone();
+  for(size_t k = 0; k < new_ops.size(); k++)
+    ret->set_operand(k, new_ops[k]);
+  builder.insert(ret);
+  cloned[v] = ret;
+  return ret;
+}
+
+void remat::run(ir::function *fn, ir::builder &builder) {
+  typedef std::pair<unsigned, unsigned> interval_t;
+  // number instructions
+  std::vector<ir::basic_block*> rpo = ir::cfg::reverse_post_order(fn);
+  std::map<ir::instruction*, unsigned> indices;
+  std::map<ir::basic_block*, interval_t> ranges;
+  unsigned index = 0;
+  for(ir::basic_block *block: rpo){
+    unsigned start = index + 1;
+    for(ir::instruction *i: block->get_inst_list())
+      indices[i] = ++index;
+    ranges[block] = {start, index};
+  }
+  // loops are identified by their back-edges
+  std::vector<interval_t> loops;
+  for(ir::basic_block *block: rpo)
+  for(ir::basic_block *pred: block->get_predecessors())
+    if(ranges.at(pred).second >= ranges.at(block).first)
+      loops.push_back({ranges.at(block).first, ranges.at(pred).second});
+  if(loops.empty())
+    return;
+  // live intervals of block values
+  std::map<ir::instruction*, interval_t> intervals;
+  for(ir::basic_block *block: rpo)
+  for(ir::instruction *i: block->get_inst_list()){
+    if(!i->get_type()->is_block_ty())
+      continue;
+    unsigned start = indices.at(i);
+    unsigned end = start;
+    for(ir::user *u: i->get_users()){
+      auto *phi = dynamic_cast<ir::phi_node*>(u);
+      if(phi){
+        for(unsigned n = 0; n < phi->get_num_incoming(); n++)
+          if(phi->get_incoming_value(n) == i)
+            end = std::max(end, ranges.at(phi->get_incoming_block(n)).second);
+      }
+      else if(indices.find((ir::instruction*)u) != indices.end())
+        end = std::max(end, indices.at((ir::instruction*)u));
+    }
+    // values live into a loop are live throughout the loop
+    for(const interval_t& loop: loops)
+      if(start < loop.first && end >= loop.first)
+        end = std::max(end, loop.second);
+    intervals[i] = {start, end};
+  }
+  // register pressure
+  std::vector<unsigned> pressure(index + 2, 0);
+  for(const auto& x: intervals){
+    unsigned num_regs = get_num_regs(x.first);
+    for(unsigned k = x.second.first; k <= x.second.second; k++)
+      pressure[k] += num_regs;
+  }
+  // rematerialize values live across high-pressure loops
+  unsigned budget = get_budget();
+  for(const interval_t& loop: loops){
+    unsigned max_pressure = *std::max_element(pressure.begin() + loop.first,
+                                              pressure.begin() + loop.second + 1);
+    if(max_pressure <= budget)
+      continue;
+    std::vector<ir::instruction*> candidates;
+    for(const auto& x: intervals){
+      ir::instruction *i = x.first;
+      if(x.second.first >= loop.first || x.second.second <= loop.second)
+        continue;
+      bool is_used_in_loop = false;
+      for(ir::user *u: i->get_users()){
+        auto it = indices.find((ir::instruction*)u);
+        bool in_loop = it != indices.end() && it->second >= loop.first
+                                           && it->second <= loop.second;
+        is_used_in_loop = is_used_in_loop || in_loop || dynamic_cast<ir::phi_node*>(u);
+      }
+      if(!is_used_in_loop && is_cheap(i, 0))
+        candidates.push_back(i);
+    }
+    std::stable_sort(candidates.begin(), candidates.end(), [&](ir::instruction *x, ir::instruction *y){
+      return get_num_regs(x) > get_num_regs(y);
+    });
+    for(ir::instruction *i: candidates){
+      if(max_pressure <= budget)
+        break;
+      // users after the loop, grouped by basic block
+      std::map<ir::basic_block*, std::vector<ir::instruction*>> users;
+      for(ir::user *u: i->get_users()){
+        auto it = indices.find((ir::instruction*)u);
+        if(it != indices.end() && it->second > loop.second)
+          users[it->first->get_parent()].push_back(it->first);
+      }
+      // re-compute the value right before its first use in each block
+      for(auto& x: users){
+        std::sort(x.second.begin(), x.second.end(), [&](ir::instruction *a, ir::instruction *b){
+          return indices.at(a) < indices.at(b);
+        });
+        builder.set_insert_point(x.second.front());
+        std::map<ir::value*, ir::value*> cloned;
+        ir::value *new_i = clone(i, builder, cloned);
+        for(ir::instruction *u: x.second)
+          u->replace_uses_of_with(i, new_i);
+      }
+      max_pressure -= std::min(max_pressure, get_num_regs(i));
+    }
+  }
+}
+
+void remat::run(ir::module &mod) {
+  ir::builder &builder = mod.get_builder();
+  for(ir::function *fn: mod.get_function_list())
+    run(fn, builder);
+}
+
+}
+}
+}
@@ -211,6 +211,11 @@ static std::map<int, int> vptx = {
   {11010, 71},
   {11020, 72},
   {11030, 73},
+  {11040, 74},
+  {11050, 75},
+  {11060, 76},
+  {11070, 77},
+  {11080, 78},
 };
 
 std::string cu_module::compile_llvm_module(llvm::Module* module, driver::device* device) {
@@ -278,6 +283,11 @@ std::string cu_module::compile_llvm_module(llvm::Module* module, driver::device*
   find_and_replace(result, ".target", "\n", ".target " + sm + "\n");
   while(find_and_replace(result, "\t// begin inline asm", "\n", ""));
   while(find_and_replace(result, "\t// end inline asm", "\n", ""));
+  // L1 eviction priority hints require PTX 7.4 and sm_70; drop them otherwise
+  if(ptx < 74 || cc < 70)
+    for(const std::string& hint: {".L1::evict_first", ".L1::evict_last"})
+      for(size_t pos = result.find(hint); pos != std::string::npos; pos = result.find(hint, pos))
+        result.erase(pos, hint.size());
   return result;
 }
 
@@ -273,20 +273,22 @@ DEFINE_FCMP_INSTR(UNE, cmp_pred_t::FCMP_UNE)
 //                               load/store instructions
 //===----------------------------------------------------------------------===//
 
-value *builder::create_load(value *ptr){
-  return insert(unmasked_load_inst::create(ptr));
+value *builder::create_load(value *ptr, load_inst::CACHE_MODIFIER cache, load_inst::EVICTION_POLICY eviction){
+  return insert(unmasked_load_inst::create(ptr, cache, eviction));
 }
 
-value *builder::create_store(value *ptr, value *val){
-  return insert(unmasked_store_inst::create(ptr, val));
+value *builder::create_store(value *ptr, value *val, store_inst::CACHE_MODIFIER cache, store_inst::EVICTION_POLICY eviction){
+  return insert(unmasked_store_inst::create(ptr, val, cache, eviction));
 }
 
-value *builder::create_masked_load(value *ptr, value *mask, value *false_value){
-  return insert(masked_load_inst::create(ptr, mask, false_value));
+value *builder::create_masked_load(value *ptr, value *mask, value *false_value,
+                                   load_inst::CACHE_MODIFIER cache, load_inst::EVICTION_POLICY eviction){
+  return insert(masked_load_inst::create(ptr, mask, false_value, cache, eviction));
 }
 
-value *builder::create_masked_store(value *ptr, value *val, value *mask){
-  return insert(masked_store_inst::create(ptr, val, mask));
+value *builder::create_masked_store(value *ptr, value *val, value *mask,
+                                    store_inst::CACHE_MODIFIER cache, store_inst::EVICTION_POLICY eviction){
+  return insert(masked_store_inst::create(ptr, val, mask, cache, eviction));
 }
 
 //===----------------------------------------------------------------------===//
@@ -341,6 +343,34 @@ value *builder::create_log(value *arg){
   return insert(log_inst::create(arg));
 }
 
+value *builder::create_sin(value *arg){
+  return insert(sin_inst::create(arg));
+}
+
+value *builder::create_cos(value *arg){
+  return insert(cos_inst::create(arg));
+}
+
+value *builder::create_tanh(value *arg){
+  return insert(tanh_inst::create(arg));
+}
+
+value *builder::create_erf(value *arg){
+  return insert(erf_inst::create(arg));
+}
+
+value *builder::create_rsqrt(value *arg){
+  return insert(rsqrt_inst::create(arg));
+}
+
+value *builder::create_pow(value *x, value *y){
+  return insert(pow_inst::create(x, y));
+}
+
+value *builder::create_umulhi(value *x, value *y){
+  return insert(umulhi_inst::create(x, y));
+}
+
 value *builder::create_dot(value *A, value *B, value *C) {
   return insert(dot_inst::create_nn(A, B, C));
 }
@@ -357,6 +387,14 @@ value *builder::create_reduce(value *A, reduce_inst::op_t op, unsigned axis) {
   return insert(reduce_inst::create(A, op, axis));
 }
 
+value *builder::create_scan(value *A, scan_inst::op_t op, unsigned axis, bool exclusive) {
+  return insert(scan_inst::create(A, op, axis, exclusive));
+}
+
+value *builder::create_scan(value *A, basic_block *combine, value *lhs, value *rhs, value *res, unsigned axis) {
+  return insert(scan_inst::create(A, combine, lhs, rhs, res, axis));
+}
+
 value *builder::create_select(value *pred, value *if_value, value *else_value){
   return insert(select_inst::create(pred, if_value, else_value));
 }
@@ -488,9 +488,42 @@ ir::value *dispatch::cast(ir::value *input, ir::type *dst_ty, ir::builder *build
 //                               Memory Operators
 //===----------------------------------------------------------------------===//
 
-ir::value *dispatch::load(ir::value* ptr, ir::value* mask, ir::value* other, ir::builder* builder) {
+ir::io_inst::CACHE_MODIFIER get_cache_modifier(const std::string &modifier, bool is_store) {
+  if(modifier.empty())
+    return ir::io_inst::NONE;
+  if(!is_store && modifier == ".ca")
+    return ir::io_inst::CA;
+  if(modifier == ".cg")
+    return ir::io_inst::CG;
+  if(modifier == ".cs")
+    return ir::io_inst::CS;
+  if(is_store && modifier == ".wb")
+    return ir::io_inst::WB;
+  if(is_store && modifier == ".wt")
+    return ir::io_inst::WT;
+  throw semantic_error("Cache modifier " + modifier + " is not supported for " + (is_store ? "stores" : "loads"));
+}
+
+ir::io_inst::EVICTION_POLICY get_eviction_policy(const std::string &policy, const std::string &modifier) {
+  if(policy.empty())
+    return ir::io_inst::NORMAL;
+  // PTX does not allow cache operators and eviction priorities on the same instruction
+  if(!modifier.empty())
+    throw semantic_error("Eviction policy cannot be combined with cache modifier " + modifier);
+  if(policy == "evict_first")
+    return ir::io_inst::EVICT_FIRST;
+  if(policy == "evict_last")
+    return ir::io_inst::EVICT_LAST;
+  throw semantic_error("Eviction policy " + policy + " is not supported");
+}
+
+ir::value *dispatch::load(ir::value* ptr, ir::value* mask, ir::value* other,
+                          const std::string &cache_modifier, const std::string &eviction_policy,
+                          ir::builder* builder) {
   if(!ptr->get_type()->get_scalar_ty()->is_pointer_ty())
     throw semantic_error("Pointer argument of load instruction is " + ptr->get_type()->repr());
+  auto cache = get_cache_modifier(cache_modifier, false);
+  auto eviction = get_eviction_policy(eviction_policy, cache_modifier);
   if(ptr->get_type()->is_block_ty()){
     if(mask){
       mask = dispatch::broadcast(mask, ptr->get_type()->get_block_shapes(), builder);
@@ -501,7 +534,7 @@ ir::value *dispatch::load(ir::value* ptr, ir::value* mask, ir::value* other, ir:
     }
   }
   if (!mask && !other)
-    return builder->create_load(ptr);
+    return builder->create_load(ptr, cache, eviction);
   if (!mask)
     throw std::runtime_error("`other` cannot be provided without `mask`");
   ir::type *elt_ty = ptr->get_type()->get_scalar_ty()->get_pointer_element_ty();
@@ -511,12 +544,16 @@ ir::value *dispatch::load(ir::value* ptr, ir::value* mask, ir::value* other, ir:
     if(ptr->get_type()->is_block_ty())
       other = builder->create_splat(other, ptr->get_type()->get_block_shapes());
   }
-  return builder->create_masked_load(ptr, mask, other);
+  return builder->create_masked_load(ptr, mask, other, cache, eviction);
 }
 
-ir::value *dispatch::store(ir::value* ptr, ir::value *val, ir::value* mask, ir::builder *builder) {
+ir::value *dispatch::store(ir::value* ptr, ir::value *val, ir::value* mask,
+                           const std::string &cache_modifier, const std::string &eviction_policy,
+                           ir::builder *builder) {
   if(!ptr->get_type()->get_scalar_ty()->is_pointer_ty())
     throw semantic_error("Pointer argument of store instruction is " + ptr->get_type()->repr());
+  auto cache = get_cache_modifier(cache_modifier, true);
+  auto eviction = get_eviction_policy(eviction_policy, cache_modifier);
   if(ptr->get_type()->is_block_ty())
     val = dispatch::broadcast(val, ptr->get_type()->get_block_shapes(), builder);
   if(mask)
@@ -524,10 +561,10 @@ ir::value *dispatch::store(ir::value* ptr, ir::value *val, ir::value* mask, ir::
   ir::type *ptr_ty = ptr->get_type();
   val = dispatch::cast(val, ptr_ty->get_scalar_ty()->get_pointer_element_ty(), builder);
   if (!mask)
-    return builder->create_store(ptr, val);
+    return builder->create_store(ptr, val, cache, eviction);
   if(!mask->get_type()->get_scalar_ty()->is_bool_ty())
     throw semantic_error("Mask must have boolean scalar type");
-  return builder->create_masked_store(ptr, val, mask);
+  return builder->create_masked_store(ptr, val, mask, cache, eviction);
 }
 
 ir::value *dispatch::atomic_cas(ir::value* ptr, ir::value *cmp, ir::value *val, ir::builder *builder){
@@ -596,6 +633,8 @@ ir::value *dispatch::atomic_min(ir::value* ptr, ir::value *val, ir::value *mask,
 ir::value *dispatch::atomic_add(ir::value* ptr, ir::value *val, ir::value *mask, ir::builder *builder){
   atom_red_typechecking(ptr, val, mask, builder);
   ir::type* sca_ty = val->get_type()->get_scalar_ty();
+  if(sca_ty->is_fp8_ty())
+    throw semantic_error("atomic_add is not supported for operands of type " + sca_ty->repr());
   auto op = sca_ty->is_floating_point_ty() ? ir::atomic_rmw_op_t::FAdd : ir::atomic_rmw_op_t::Add;
   return builder->create_atomic_rmw(op, ptr, val, mask);
 }
@@ -620,7 +659,12 @@ ir::value *dispatch::atomic_xor(ir::value* ptr, ir::value *val, ir::value *mask,
 //===----------------------------------------------------------------------===//
 
 ir::value *dispatch::dot(ir::value *lhs, ir::value *rhs, ir::builder *builder) {
-  ir::value *_0 = builder->get_float32(0);
+  bool lhs_int8 = lhs->get_type()->get_scalar_ty()->is_integer_ty(8);
+  bool rhs_int8 = rhs->get_type()->get_scalar_ty()->is_integer_ty(8);
+  if(lhs_int8 != rhs_int8)
+    throw semantic_error("int8 dot requires both operands to be int8");
+  // int8 x int8 is accumulated in int32; everything else in fp32
+  ir::value *_0 = lhs_int8 ? builder->get_int32(0) : builder->get_float32(0);
   unsigned M = lhs->get_type()->get_block_shapes()[0];
   unsigned N = rhs->get_type()->get_block_shapes()[1];
   _0 = builder->create_splat(_0, {M, N});
@@ -675,6 +719,62 @@ ir::value *dispatch::sum(ir::value *input, unsigned int axis, ir::builder *build
   return reduce_impl(input, axis, builder, "sum", ir::reduce_inst::FADD, ir::reduce_inst::ADD);
 }
 
+ir::value *dispatch::argmin(ir::value *input, unsigned int axis, ir::builder *builder) {
+  return reduce_impl(input, axis, builder, "argmin", ir::reduce_inst::ARGFMIN, ir::reduce_inst::ARGMIN);
+}
+
+ir::value *dispatch::argmax(ir::value *input, unsigned int axis, ir::builder *builder) {
+  return reduce_impl(input, axis, builder, "argmax", ir::reduce_inst::ARGFMAX, ir::reduce_inst::ARGMAX);
+}
+
+
+//===----------------------------------------------------------------------===//
+//                               Scans
+//===----------------------------------------------------------------------===//
+
+void check_scan_axis(ir::value *input, unsigned int axis) {
+  if(!input->get_type()->is_block_ty())
+    throw semantic_error("scan input must be a block");
+  if(axis >= input->get_type()->get_tile_rank())
+    throw semantic_error("invalid scan axis " + std::to_string(axis));
+}
+
+ir::value *scan_impl(ir::value *input, unsigned int axis, bool exclusive, ir::builder *builder, const std::string &name,
+                     ir::scan_inst::op_t FLOAT_OP, ir::scan_inst::op_t INT_OP) {
+  check_scan_axis(input, axis);
+  ir::type *scalar_ty = input->get_type()->get_scalar_ty();
+  // input is extended to 32-bits if necessary, as for reductions
+  if(scalar_ty->is_integer_ty() && scalar_ty->get_integer_bitwidth() <= 32)
+    input = dispatch::cast(input, type::get_int32_ty(scalar_ty->get_context()), builder);
+  if (scalar_ty->is_floating_point_ty())
+    return builder->create_scan(input, FLOAT_OP, axis, exclusive);
+  else if (scalar_ty->is_integer_ty())
+    return builder->create_scan(input, INT_OP, axis, exclusive);
+  return throw_unreachable(name);
+}
+
+ir::value *dispatch::cumsum(ir::value *input, unsigned int axis, bool exclusive, ir::builder *builder) {
+  return scan_impl(input, axis, exclusive, builder, "cumsum", ir::scan_inst::FADD, ir::scan_inst::ADD);
+}
+
+ir::value *dispatch::cummax(ir::value *input, unsigned int axis, bool exclusive, ir::builder *builder) {
+  return scan_impl(input, axis, exclusive, builder, "cummax", ir::scan_inst::FMAX, ir::scan_inst::MAX);
+}
+
+ir::value *dispatch::cummin(ir::value *input, unsigned int axis, bool exclusive, ir::builder *builder) {
+  return scan_impl(input, axis, exclusive, builder, "cummin", ir::scan_inst::FMIN, ir::scan_inst::MIN);
+}
+
+ir::value *dispatch::associative_scan(ir::value *input, unsigned int axis, ir::basic_block *combine,
+                                      ir::value *lhs, ir::value *rhs, ir::value *res, ir::builder *builder) {
+  check_scan_axis(input, axis);
+  ir::type *scalar_ty = input->get_type()->get_scalar_ty();
+  if(res->get_type() != scalar_ty)
+    throw semantic_error("combine function must return a scalar of type " + scalar_ty->repr() +
+                         ", got " + res->get_type()->repr());
+  return builder->create_scan(input, combine, lhs, rhs, res, axis);
+}
+
 
 //===----------------------------------------------------------------------===//
 //                               Math
@@ -692,6 +792,63 @@ ir::value *dispatch::sqrt(ir::value *x, ir::builder *builder) {
   return builder->create_sqrt(x);
 }
 
+// transcendental functions are computed in fp32
+ir::value *math_arg(ir::value *x, ir::builder *builder, const std::string &name) {
+  ir::type *scalar_ty = x->get_type()->get_scalar_ty();
+  if(scalar_ty->is_pointer_ty() || scalar_ty->is_fp64_ty())
+    throw semantic_error(name + " is not supported for operands of type " + scalar_ty->repr());
+  return dispatch::cast(x, type::get_fp32_ty(scalar_ty->get_context()), builder);
+}
+
+// half-precision results are returned in the type of their operand
+ir::value *math_ret(ir::value *ret, ir::type *arg_ty, ir::builder *builder) {
+  ir::type *scalar_ty = arg_ty->get_scalar_ty();
+  if(scalar_ty->is_fp16_ty() || scalar_ty->is_bf16_ty())
+    return dispatch::cast(ret, scalar_ty, builder);
+  return ret;
+}
+
+ir::value *math_impl(ir::value *x, ir::builder *builder, const std::string &name,
+                     ir::value* (ir::builder::*create)(ir::value*)) {
+  ir::value *ret = (builder->*create)(math_arg(x, builder, name));
+  return math_ret(ret, x->get_type(), builder);
+}
+
+ir::value *dispatch::sin(ir::value *x, ir::builder *builder) {
+  return math_impl(x, builder, "sin", &ir::builder::create_sin);
+}
+
+ir::value *dispatch::cos(ir::value *x, ir::builder *builder) {
+  return math_impl(x, builder, "cos", &ir::builder::create_cos);
+}
+
+ir::value *dispatch::tanh(ir::value *x, ir::builder *builder) {
+  return math_impl(x, builder, "tanh", &ir::builder::create_tanh);
+}
+
+ir::value *dispatch::erf(ir::value *x, ir::builder *builder) {
+  return math_impl(x, builder, "erf", &ir::builder::create_erf);
+}
+
+ir::value *dispatch::rsqrt(ir::value *x, ir::builder *builder) {
+  return math_impl(x, builder, "rsqrt", &ir::builder::create_rsqrt);
+}
+
+ir::value *dispatch::pow(ir::value *x, ir::value *y, ir::builder *builder) {
+  std::tie(x, y) = dispatch::broadcast(x, y, builder);
+  ir::value *ret = builder->create_pow(math_arg(x, builder, "pow"), math_arg(y, builder, "pow"));
+  return math_ret(ret, x->get_type(), builder);
+}
+
+ir::value *dispatch::umulhi(ir::value *x, ir::value *y, ir::builder *builder) {
+  std::tie(x, y) = dispatch::broadcast(x, y, builder);
+  ir::type *x_ty = x->get_type()->get_scalar_ty();
+  ir::type *y_ty = y->get_type()->get_scalar_ty();
+  if(!x_ty->is_integer_ty(32) || !y_ty->is_integer_ty(32))
+    throw semantic_error("umulhi is only supported for 32-bit integer operands");
+  return builder->create_umulhi(x, y);
+}
+
 
 //
 
@@ -428,13 +428,15 @@ getelementptr_inst *getelementptr_inst::create(value *ptr, const std::vector<val
 //===----------------------------------------------------------------------===//
 
 // io_inst
-io_inst::io_inst(type *ty, value_id_t id, unsigned num_ops, const std::string &name, instruction *next)
-  : instruction(ty, id, num_ops, name, next)
+io_inst::io_inst(type *ty, value_id_t id, unsigned num_ops, CACHE_MODIFIER cache, EVICTION_POLICY eviction,
+                 const std::string &name, instruction *next)
+  : instruction(ty, id, num_ops, name, next), cache_(cache), eviction_(eviction)
 { }
 
 // load_inst
-load_inst::load_inst(value *ptr, value_id_t id, unsigned num_ops, const std::string &name, instruction *next)
-  : io_inst(get_pointee_type(ptr->get_type()), id, num_ops, name, next)
+load_inst::load_inst(value *ptr, value_id_t id, unsigned num_ops, CACHE_MODIFIER cache, EVICTION_POLICY eviction,
+                     const std::string &name, instruction *next)
+  : io_inst(get_pointee_type(ptr->get_type()), id, num_ops, cache, eviction, name, next)
 { }
 
 // load
@@ -447,33 +449,37 @@ type *load_inst::get_pointee_type(type *ty) {
 }
 
 // unmasked_load
-unmasked_load_inst::unmasked_load_inst(value *ptr, const std::string &name, instruction *next)
-  : load_inst(ptr, INST_UNMASKED_LOAD, 1, name, next) {
+unmasked_load_inst::unmasked_load_inst(value *ptr, CACHE_MODIFIER cache, EVICTION_POLICY eviction,
+                                       const std::string &name, instruction *next)
+  : load_inst(ptr, INST_UNMASKED_LOAD, 1, cache, eviction, name, next) {
   set_operand(0, ptr);
 }
 
-unmasked_load_inst* unmasked_load_inst::create(value *ptr, const std::string &name, instruction *next) {
-  return new unmasked_load_inst(ptr, name, next);
+unmasked_load_inst* unmasked_load_inst::create(value *ptr, CACHE_MODIFIER cache, EVICTION_POLICY eviction,
+                                               const std::string &name, instruction *next) {
+  return new unmasked_load_inst(ptr, cache, eviction, name, next);
 }
 
 // masked load
 masked_load_inst::masked_load_inst(value *ptr, value *mask, value *false_value,
+                                   CACHE_MODIFIER cache, EVICTION_POLICY eviction,
                                    const std::string &name, instruction *next)
-  : load_inst(ptr, INST_MASKED_LOAD, 3, name, next) {
+  : load_inst(ptr, INST_MASKED_LOAD, 3, cache, eviction, name, next) {
   set_operand(0, ptr);
   set_operand(1, mask);
   set_operand(2, false_value);
 }
 
 masked_load_inst* masked_load_inst::create(value *ptr, value *mask, value *false_value,
+                                           CACHE_MODIFIER cache, EVICTION_POLICY eviction,
                                            const std::string &name, instruction *next) {
-  return new masked_load_inst(ptr, mask, false_value, name, next);
+  return new masked_load_inst(ptr, mask, false_value, cache, eviction, name, next);
 }
 
 // masked load async
 masked_load_async_inst::masked_load_async_inst(value *ptr, value *mask, value *false_value,
                                    const std::string &name, instruction *next)
-  : load_inst(ptr, INST_MASKED_LOAD_ASYNC, 3, name, next) {
+  : load_inst(ptr, INST_MASKED_LOAD_ASYNC, 3, NONE, NORMAL, name, next) {
   set_operand(0, ptr);
   set_operand(1, mask);
   set_operand(2, false_value);
@@ -486,34 +492,38 @@ masked_load_async_inst* masked_load_async_inst::create(value *ptr, value *mask,
 
 // store
 
-store_inst::store_inst(value *ptr, value_id_t id, unsigned num_ops, const std::string &name, instruction *next)
-  : io_inst(type::get_void_ty(ptr->get_type()->get_context()), id, num_ops, name, next)
+store_inst::store_inst(value *ptr, value_id_t id, unsigned num_ops, CACHE_MODIFIER cache, EVICTION_POLICY eviction,
+                       const std::string &name, instruction *next)
+  : io_inst(type::get_void_ty(ptr->get_type()->get_context()), id, num_ops, cache, eviction, name, next)
 { }
 
 // unmasked_store
-unmasked_store_inst::unmasked_store_inst(value *ptr, value *val,
+unmasked_store_inst::unmasked_store_inst(value *ptr, value *val, CACHE_MODIFIER cache, EVICTION_POLICY eviction,
                                          const std::string &name, instruction *next)
-    : store_inst(ptr, INST_UNMASKED_STORE, 2, name, next)  {
+    : store_inst(ptr, INST_UNMASKED_STORE, 2, cache, eviction, name, next)  {
   set_operand(0, ptr);
   set_operand(1, val);
 }
 
-unmasked_store_inst* unmasked_store_inst::create(value *ptr, value *val,
+unmasked_store_inst* unmasked_store_inst::create(value *ptr, value *val, CACHE_MODIFIER cache, EVICTION_POLICY eviction,
                                                  const std::string &name, instruction *next) {
-  return new unmasked_store_inst(ptr, val, name, next);
+  return new unmasked_store_inst(ptr, val, cache, eviction, name, next);
 }
 
 // masked store
 masked_store_inst::masked_store_inst(value *ptr, value *val, value *mask,
+                                     CACHE_MODIFIER cache, EVICTION_POLICY eviction,
                                      const std::string &name, instruction *next)
-  : store_inst(ptr, INST_MASKED_STORE, 3, name, next) {
+  : store_inst(ptr, INST_MASKED_STORE, 3, cache, eviction, name, next) {
   set_operand(0, ptr);
   set_operand(1, val);
   set_operand(2, mask);
 }
 
-masked_store_inst* masked_store_inst::create(value *ptr, value *val, value *mask, const std::string &name, instruction *next)  {
-  return new masked_store_inst(ptr, val, mask, name, next);
+masked_store_inst* masked_store_inst::create(value *ptr, value *val, value *mask,
+                                             CACHE_MODIFIER cache, EVICTION_POLICY eviction,
+                                             const std::string &name, instruction *next)  {
+  return new masked_store_inst(ptr, val, mask, cache, eviction, name, next);
 }
 //===----------------------------------------------------------------------===//
 //                               retile_inst classes
@@ -663,16 +673,22 @@ std::string reduce_inst::to_str(op_t op) {
     case FSUB: return "-";
     case FMAX: return "fmax";
     case FMIN: return "fmin";
+    case ARGMAX: return "argimax";
+    case ARGMIN: return "argimin";
+    case ARGFMAX: return "argfmax";
+    case ARGFMIN: return "argfmin";
     default: break;
   }
   assert(false);
   return "";
 }
 
-type* reduce_inst::get_res_type(value *arg, unsigned axis) {
+type* reduce_inst::get_res_type(value *arg, op_t op, unsigned axis) {
   ir::block_type::block_shapes_t shapes = arg->get_type()->get_block_shapes();
   shapes.erase(shapes.begin() + axis);
   type *scalar_ty = arg->get_type()->get_scalar_ty();
+  if(with_index(op))
+    scalar_ty = type::get_int32_ty(scalar_ty->get_context());
   if(shapes.empty())
 //    shapes.push_back(1);
     return scalar_ty;
@@ -680,7 +696,7 @@ type* reduce_inst::get_res_type(value *arg, unsigned axis) {
 }
 
 reduce_inst::reduce_inst(value *arg, op_t op, unsigned axis, const std::string &name, instruction *next)
-  : builtin_inst(get_res_type(arg, axis), INST_REDUCE, 1, name, next),
+  : builtin_inst(get_res_type(arg, op, axis), INST_REDUCE, 1, name, next),
     op_(op),
     axis_(axis){
   set_operand(0, arg);
@@ -690,6 +706,48 @@ instruction* reduce_inst::create(value *arg, op_t op, unsigned axis, const std::
   return new reduce_inst(arg, op, axis, name, next);
 }
 
+//===----------------------------------------------------------------------===//
+//                               scan instructions
+//===----------------------------------------------------------------------===//
+
+std::string scan_inst::to_str(op_t op) {
+  switch (op) {
+    case ADD: return "+";
+    case MAX: return "imax";
+    case MIN: return "imin";
+    case FADD: return "+";
+    case FMAX: return "fmax";
+    case FMIN: return "fmin";
+    case CUSTOM: return "custom";
+    default: break;
+  }
+  assert(false);
+  return "";
+}
+
+scan_inst::scan_inst(value *arg, op_t op, unsigned axis, bool exclusive, const std::string &name, instruction *next)
+  : builtin_inst(arg->get_type(), INST_SCAN, 1, name, next),
+    axis_(axis),
+    op_(op),
+    exclusive_(exclusive),
+    combine_(nullptr), lhs_(nullptr), rhs_(nullptr), res_(nullptr) {
+  set_operand(0, arg);
+}
+
+instruction* scan_inst::create(value *arg, op_t op, unsigned axis, bool exclusive, const std::string &name, instruction *next) {
+  return new scan_inst(arg, op, axis, exclusive, name, next);
+}
+
+instruction* scan_inst::create(value *arg, basic_block *combine, value *lhs, value *rhs, value *res, unsigned axis,
+                               const std::string &name, instruction *next) {
+  scan_inst *ret = new scan_inst(arg, CUSTOM, axis, false, name, next);
+  ret->combine_ = combine;
+  ret->lhs_ = lhs;
+  ret->rhs_ = rhs;
+  ret->res_ = res;
+  return ret;
+}
+
 
 //===----------------------------------------------------------------------===//
 //                               select instructions
@@ -792,6 +850,85 @@ instruction* log_inst::create(value *val, const std::string& name, instruction *
   return new log_inst(val, name, next);
 }
 
+// sin
+
+sin_inst::sin_inst(value *val, const std::string &name, instruction *next)
+  : builtin_inst(val->get_type(), INST_SIN, 1, name, next) {
+  set_operand(0, val);
+}
+
+instruction* sin_inst::create(value *val, const std::string& name, instruction *next) {
+  return new sin_inst(val, name, next);
+}
+
+// cos
+
+cos_inst::cos_inst(value *val, const std::string &name, instruction *next)
+  : builtin_inst(val->get_type(), INST_COS, 1, name, next) {
+  set_operand(0, val);
+}
+
+instruction* cos_inst::create(value *val, const std::string& name, instruction *next) {
+  return new cos_inst(val, name, next);
+}
+
+// tanh
+
+tanh_inst::tanh_inst(value *val, const std::string &name, instruction *next)
+  : builtin_inst(val->get_type(), INST_TANH, 1, name, next) {
+  set_operand(0, val);
+}
+
+instruction* tanh_inst::create(value *val, const std::string& name, instruction *next) {
+  return new tanh_inst(val, name, next);
+}
+
+// erf
+
+erf_inst::erf_inst(value *val, const std::string &name, instruction *next)
+  : builtin_inst(val->get_type(), INST_ERF, 1, name, next) {
+  set_operand(0, val);
+}
+
+instruction* erf_inst::create(value *val, const std::string& name, instruction *next) {
+  return new erf_inst(val, name, next);
+}
+
+// rsqrt
+
+rsqrt_inst::rsqrt_inst(value *val, const std::string &name, instruction *next)
+  : builtin_inst(val->get_type(), INST_RSQRT, 1, name, next) {
+  set_operand(0, val);
+}
+
+instruction* rsqrt_inst::create(value *val, const std::string& name, instruction *next) {
+  return new rsqrt_inst(val, name, next);
+}
+
+// pow
+
+pow_inst::pow_inst(value *x, value *y, const std::string &name, instruction *next)
+  : builtin_inst(x->get_type(), INST_POW, 2, name, next) {
+  set_operand(0, x);
+  set_operand(1, y);
+}
+
+instruction* pow_inst::create(value *x, value *y, const std::string& name, instruction *next) {
+  return new pow_inst(x, y, name, next);
+}
+
+// umulhi
+
+umulhi_inst::umulhi_inst(value *x, value *y, const std::string &name, instruction *next)
+  : builtin_inst(x->get_type(), INST_UMULHI, 2, name, next) {
+  set_operand(0, x);
+  set_operand(1, y);
+}
+
+instruction* umulhi_inst::create(value *x, value *y, const std::string& name, instruction *next) {
+  return new umulhi_inst(x, y, name, next);
+}
+
 
 //===----------------------------------------------------------------------===//
 //                               intrinsic instructions
@@ -4,6 +4,7 @@
 #include "triton/ir/basic_block.h"
 #include "triton/ir/function.h"
 #include "triton/ir/module.h"
+#include "triton/ir/instructions.h"
 
 namespace triton{
 namespace ir{
@@ -64,5 +65,20 @@ void for_each_value(module &mod, const std::function<void (value *)> &do_work) {
   }
 }
 
+value* get_base_ptr(value* ptr) {
+  std::set<ir::value*> seen;
+  while(seen.insert(ptr).second){
+    if(auto* gep = dynamic_cast<ir::getelementptr_inst*>(ptr))
+      ptr = gep->get_pointer_operand();
+    else if(auto* retile = dynamic_cast<ir::retile_inst*>(ptr))
+      ptr = retile->get_operand(0);
+    else if(auto* phi = dynamic_cast<ir::phi_node*>(ptr))
+      ptr = phi->get_incoming_value(0);
+    else
+      break;
+  }
+  return ptr;
+}
+
 }
 }
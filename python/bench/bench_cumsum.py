@@ -0,0 +1,50 @@
+import torch
+import triton
+import triton.language as tl
+
+
+@triton.jit
+def _cumsum(X, Y, stride, N, **meta):
+    row = tl.program_id(0)
+    cols = tl.arange(0, meta['BLOCK'])
+    x = tl.load(X + row * stride + cols, mask=cols < N, other=0.)
+    y = tl.cumsum(x.to(tl.float32), 0)
+    tl.store(Y + row * stride + cols, y, mask=cols < N)
+
+
+def cumsum(x):
+    M, N = x.shape
+    y = torch.empty(x.shape, dtype=torch.float32, device=x.device)
+    BLOCK = 1 << (N - 1).bit_length()
+    num_warps = 4 if BLOCK <= 2048 else 8
+    _cumsum[(M, )](x, y, x.stride(0), N, BLOCK=BLOCK, num_warps=num_warps)
+    return y
+
+
+confs = [
+    triton.testing.Benchmark(
+              x_names = ['N'],
+              x_vals  = [128, 256, 512, 1024, 2048, 4096, 8192],
+              line_arg  = 'provider',
+              line_vals  = ['triton', 'torch'],
+              line_names = ['Triton', 'Torch'],
+              ylabel  = 'GBPS',
+              plot_name = f'cumsum-{M}',
+              args = {'M': M, 'dtype': torch.float32}
+    )\
+    for M in [1, 4096]
+]
+
+
+@triton.testing.perf_report(confs)
+def bench_op(M, N, dtype, provider):
+    x = torch.randn(M, N, dtype=dtype, device='cuda')
+    num_gb = (2 * x.numel() * x.element_size() * 1e-9)
+    gbps = lambda ms: num_gb / ms * 1e3
+    op = {'torch': lambda: torch.cumsum(x, 1), 'triton': lambda: cumsum(x)}[provider]
+    mean_ms, min_ms, max_ms = triton.testing.do_bench(op)
+    return gbps(mean_ms), gbps(min_ms), gbps(max_ms)
+
+
+if __name__ == '__main__':
+    bench_op.run(print_data=True)
@@ -0,0 +1,48 @@
+import torch
+import triton
+import triton.language as tl
+
+
+@triton.jit
+def _gelu(X, Y, N, **meta):
+    off = tl.program_id(0) * meta['BLOCK'] + tl.arange(0, meta['BLOCK'])
+    x = tl.load(X + off, mask=off < N, other=0.)
+    y = tl.gelu(x.to(tl.float32))
+    tl.store(Y + off, y, mask=off < N)
+
+
+def gelu(x):
+    y = torch.empty_like(x)
+    N = x.numel()
+    BLOCK = 1024
+    _gelu[(triton.cdiv(N, BLOCK), )](x, y, N, BLOCK=BLOCK)
+    return y
+
+
+confs = [
+    triton.testing.Benchmark(
+              x_names = ['N'],
+              x_vals  = [2**i for i in range(16, 27, 2)],
+              line_arg  = 'provider',
+              line_vals  = ['triton', 'torch'],
+              line_names = ['Triton', 'Torch'],
+              ylabel  = 'GBPS',
+              plot_name = f'gelu-{dtype}',
+              args = {'dtype': dtype}
+    )\
+    for dtype in [torch.float16, torch.float32]
+]
+
+
+@triton.testing.perf_report(confs)
+def bench_op(N, dtype, provider):
+    x = torch.randn(N, dtype=dtype, device='cuda')
+    num_gb = (2 * x.numel() * x.element_size() * 1e-9)
+    gbps = lambda ms: num_gb / ms * 1e3
+    op = {'torch': lambda: torch.nn.functional.gelu(x), 'triton': lambda: gelu(x)}[provider]
+    mean_ms, min_ms, max_ms = triton.testing.do_bench(op)
+    return gbps(mean_ms), gbps(min_ms), gbps(max_ms)
+
+
+if __name__ == '__main__':
+    bench_op.run(print_data=True)
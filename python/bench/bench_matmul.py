@@ -41,8 +41,37 @@ transformer_confs = [
       for M in [2048]
 ]
 
+# Decode-style benchmarks: a few rows (e.g., tokens) against a large weight matrix
+decode_confs = [
+    triton.testing.Benchmark(
+        x_names=["M"],
+        x_vals=[1, 2, 4, 8, 16, 32, 64],
+        line_arg="provider",
+        line_vals=["cublas", "triton"],
+        line_names=["cuBLAS", "Triton"],
+        ylabel="TFLOPS",
+        plot_name=f"matmul-decode-N{N}-K{K}",
+        args={"N": N, "K": K, "AT": False, "BT": False, "dtype": torch.float16},
+    ) for N, K in [(4096, 4096), (12288, 4096), (4096, 12288)]
+]
+
+
+# Split-k benchmarks: long reductions with few output tiles, e.g., weight gradients
+splitk_confs = [
+    triton.testing.Benchmark(
+        x_names=["K"],
+        x_vals=[2048 * i for i in range(1, 17)],
+        line_arg="provider",
+        line_vals=["cublas", "triton"],
+        line_names=["cuBLAS", "Triton"],
+        ylabel="TFLOPS",
+        plot_name=f"matmul-split-k-M{M}-N{N}",
+        args={"M": M, "N": N, "AT": False, "BT": False, "dtype": torch.float16},
+    ) for M, N in [(64, 64), (128, 128), (256, 256)]
+]
 
-@triton.testing.perf_report(square_confs)
+
+@triton.testing.perf_report(square_confs + decode_confs + splitk_confs)
 def bench_op(M, N, K, AT, BT, dtype, provider, warmup=25, rep=75):
     a = torch.rand((K, M) if AT else (M, K), device="cuda", dtype=dtype)
     b = torch.rand((N, K) if BT else (K, N), device="cuda", dtype=dtype)
@@ -64,3 +93,35 @@ def bench_op(M, N, K, AT, BT, dtype, provider, warmup=25, rep=75):
         except:
             return None
     return None
+
+
+# Grouped benchmarks: tokens routed to experts of a mixture-of-experts layer
+grouped_confs = [
+    triton.testing.Benchmark(
+        x_names=["G"],
+        x_vals=[4, 8, 16, 32, 64],
+        line_arg="provider",
+        line_vals=["cublas", "triton", "triton-grouped"],
+        line_names=["cuBLAS (loop)", "Triton (loop)", "Triton (grouped)"],
+        ylabel="TFLOPS",
+        plot_name=f"matmul-grouped-T{T}-N{N}-K{K}",
+        args={"T": T, "N": N, "K": K, "dtype": torch.float16},
+    ) for T, N, K in [(4096, 4096, 1024), (4096, 1024, 4096)]
+]
+
+
+@triton.testing.perf_report(grouped_confs)
+def bench_grouped(G, T, N, K, dtype, provider, warmup=25, rep=75):
+    # unevenly distributes T tokens over G experts
+    torch.manual_seed(0)
+    counts = torch.multinomial(torch.ones(G), T, replacement=True).bincount(minlength=G).tolist()
+    list_a = [torch.rand((M, K), device="cuda", dtype=dtype) for M in counts]
+    list_b = [torch.rand((K, N), device="cuda", dtype=dtype) for _ in counts]
+    tflops = lambda ms: 2. * T * N * K / ms * 1e-9
+    fn = {
+        "cublas": lambda: [torch.matmul(a, b) for a, b in zip(list_a, list_b)],
+        "triton": lambda: [triton.ops.matmul(a, b) for a, b in zip(list_a, list_b)],
+        "triton-grouped": lambda: triton.ops.grouped_matmul(list_a, list_b),
+    }[provider]
+    ms, min_ms, max_ms = triton.testing.do_bench(fn, warmup=warmup, rep=rep)
+    return tflops(ms), tflops(max_ms), tflops(min_ms)
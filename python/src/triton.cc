@@ -82,10 +82,13 @@ void init_triton_codegen(py::module &&m) {
         drv::module *mod;
         drv::kernel *ker;
         size_t shared_mem;
-        triton::codegen::add_passes_to_emit_bin(ir, dev, num_warps, num_stages, mod, ker, shared_mem);
+        size_t num_barriers;
+        double shared_fragmentation;
+        triton::codegen::add_passes_to_emit_bin(ir, dev, num_warps, num_stages, mod, ker, shared_mem, num_barriers,
+                                                shared_fragmentation);
         std::stringstream ss;
         ir::print(ir, ss);
-        return std::make_tuple(mod, ker, shared_mem, ss.str());
+        return std::make_tuple(mod, ker, shared_mem, ss.str(), num_barriers, shared_fragmentation);
       },
       py::return_value_policy::take_ownership);
 }
@@ -153,10 +156,24 @@ void init_triton_frontend(py::module &&m) {
   m.def("min", &ir::dispatch::min, ret::reference);
   m.def("max", &ir::dispatch::max, ret::reference);
   m.def("sum", &ir::dispatch::sum, ret::reference);
+  m.def("argmin", &ir::dispatch::argmin, ret::reference);
+  m.def("argmax", &ir::dispatch::argmax, ret::reference);
+  // scan
+  m.def("cumsum", &ir::dispatch::cumsum, ret::reference);
+  m.def("cummax", &ir::dispatch::cummax, ret::reference);
+  m.def("cummin", &ir::dispatch::cummin, ret::reference);
+  m.def("associative_scan", &ir::dispatch::associative_scan, ret::reference);
   // math
   m.def("exp", &ir::dispatch::exp, ret::reference);
   m.def("log", &ir::dispatch::log, ret::reference);
   m.def("sqrt", &ir::dispatch::sqrt, ret::reference);
+  m.def("sin", &ir::dispatch::sin, ret::reference);
+  m.def("cos", &ir::dispatch::cos, ret::reference);
+  m.def("tanh", &ir::dispatch::tanh, ret::reference);
+  m.def("erf", &ir::dispatch::erf, ret::reference);
+  m.def("rsqrt", &ir::dispatch::rsqrt, ret::reference);
+  m.def("pow", &ir::dispatch::pow, ret::reference);
+  m.def("umulhi", &ir::dispatch::umulhi, ret::reference);
   // internal (debugging only)
   m.def("multiple_of", &ir::dispatch::multiple_of, ret::reference);
   m.def("debug_barrier", &ir::dispatch::debug_barrier, ret::reference);
@@ -186,7 +203,8 @@ void init_triton_ir(py::module &&m) {
 
   py::class_<ir::constant_int, ir::constant>(m, "constant_int")
       .def_property_readonly("value", &ir::constant_int::get_value)
-      .def("__int__", [](ir::constant_int *self) { return self->get_value(); });
+      .def("__int__", [](ir::constant_int *self) { return self->get_value(); })
+      .def("__bool__", [](ir::constant_int *self) { return self->get_value() != 0; });
 
   py::class_<ir::constant_fp, ir::constant>(m, "constant_float")
       .def_property_readonly("value", &ir::constant_fp::get_value);
@@ -199,6 +217,7 @@ void init_triton_ir(py::module &&m) {
       .def("is_int", static_cast<bool (ir::type::*)() const>(&ir::type::is_integer_ty))
       .def("is_floating", &ir::type::is_floating_point_ty)
       .def("is_block", &ir::type::is_block_ty)
+      .def("__str__", &ir::type::repr)
       .def("make_ptr", &ir::pointer_type::get, ret::reference)
       .def("make_function", &ir::function_type::get, ret::reference)
       .def("make_block", &ir::block_type::get, ret::reference)
@@ -268,7 +287,8 @@ void init_triton_ir(py::module &&m) {
       .def_property_readonly("attrs", &ir::function::attrs)
       .def("add_attr", &ir::function::add_attr);
 
-  py::class_<ir::argument, ir::value>(m, "argument");
+  py::class_<ir::argument, ir::value>(m, "argument")
+      .def_static("create", &ir::argument::create, ret::reference);
 
   py::class_<ir::basic_block, ir::value>(m, "basic_block")
       .def("create", &ir::basic_block::create, ret::reference)
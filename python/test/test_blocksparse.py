@@ -40,6 +40,24 @@ def test_matmul(MODE, TRANS_A, TRANS_B, BLOCK, DTYPE, Z=3, H=2, M=512, N=384, K=
     assert triton.testing.allclose(rc, tc)
 
 
+@pytest.mark.parametrize("MODE", ["sdd", "dsd", "dds"])
+def test_matmul_out(MODE, BLOCK=32, H=2, M=256, N=128, K=64, DTYPE=torch.float16):
+    torch.random.manual_seed(0)
+    shape = {"sdd": (M, N), "dsd": (M, K), "dds": (K, N)}[MODE]
+    layout = torch.randint(2, (H, shape[0] // BLOCK, shape[1] // BLOCK))
+    op = triton.ops.blocksparse.matmul(layout, BLOCK, MODE)
+    a = torch.randn((H, M, K), dtype=DTYPE, device="cuda")
+    b = torch.randn((H, K, N), dtype=DTYPE, device="cuda")
+    a = triton.testing.sparsify_tensor(a[None], layout, BLOCK)[0] if MODE == "dsd" else a
+    b = triton.testing.sparsify_tensor(b[None], layout, BLOCK)[0] if MODE == "dds" else b
+    rc = op(a, b)
+    # pre-allocated outputs are fully overwritten, even when filled with garbage
+    out = torch.full_like(rc, float("nan"))
+    tc = op(a, b, out=out)
+    assert tc.data_ptr() == out.data_ptr()
+    assert triton.testing.allclose(rc, out)
+
+
 @pytest.mark.parametrize(
     "BLOCK, WIDTH",
     [(block, width) for block in [32] for width in [256, 576, 1024, 1792]],
@@ -5,6 +5,7 @@ import copy
 import pytest
 import ast
 import itertools
+import re
 
 torch.manual_seed(0)
 
@@ -136,6 +137,66 @@ def test_unary_op(dtype_x, expr, device='cuda'):
     _test_unary(dtype_x, expr, device=device)
 
 
+# ---------------
+# test math ops
+# ---------------
+@pytest.mark.parametrize("dtype_x, op", [
+    (dtype_x, op) \
+                  for dtype_x in ['float16', 'float32']\
+                  for op in ['exp', 'log', 'sin', 'cos', 'tanh', 'erf', 'rsqrt', 'gelu']
+])
+def test_math_op(dtype_x, op, device='cuda'):
+    SIZE = 1024
+
+    # triton kernel
+    @triton.jit
+    def kernel(Z, X, **meta):
+        off = tl.arange(0, meta['SIZE'])
+        x = tl.load(X + off)
+        z = GENERATE_TEST_HERE
+        tl.store(Z + off, z)
+
+    kernel = patch_kernel(kernel, {'GENERATE_TEST_HERE': f'tl.{op}(x)'})
+    x = triton.testing.random(SIZE, dtype=cvt[dtype_x], device=device)
+    if op in ['log', 'rsqrt']:
+        x = x.abs() + 1e-2
+    if op == 'exp':
+        x = x / 10
+    # torch result, computed in float32
+    torch_op = {'rsqrt': torch.rsqrt, 'gelu': torch.nn.functional.gelu}.get(op, getattr(torch, op, None))
+    z_ref = torch_op(x.to(torch.float32)).to(x.dtype)
+    # triton result
+    z_tri = torch.empty_like(x)
+    kernel[(1, )](z_tri, x, SIZE=SIZE)
+    tol = {'float16': 1e-3, 'float32': 1e-5}[dtype_x]
+    assert torch.allclose(z_tri, z_ref, rtol=tol * 10, atol=tol)
+
+
+@pytest.mark.parametrize("negative_base", [False, True])
+def test_pow(negative_base, device='cuda'):
+    SIZE = 1024
+
+    # triton kernel
+    @triton.jit
+    def kernel(Z, X, Y, **meta):
+        off = tl.arange(0, meta['SIZE'])
+        x = tl.load(X + off)
+        y = tl.load(Y + off)
+        tl.store(Z + off, tl.pow(x, y))
+
+    if negative_base:
+        # negative bases are only defined for integer exponents
+        x = torch.randn(SIZE, dtype=torch.float32, device=device)
+        y = torch.randint(-3, 4, (SIZE, ), device=device).to(torch.float32)
+    else:
+        x = torch.rand(SIZE, dtype=torch.float32, device=device) * 10 + 0.1
+        y = torch.randn(SIZE, dtype=torch.float32, device=device) * 2
+    z_ref = torch.pow(x, y)
+    z_tri = torch.empty_like(x)
+    kernel[(1, )](z_tri, x, y, SIZE=SIZE)
+    assert torch.allclose(z_tri, z_ref, rtol=1e-4, atol=1e-5)
+
+
 # ----------------
 # test indexing
 # ----------------
@@ -289,6 +350,34 @@ def test_atomic_rmw(op, dtype_x, mode, device='cuda'):
         triton.testing.assert_allclose(z_ref, z_tri)
 
 
+@pytest.mark.parametrize("dtype_x, use_result", [(dtype_x, use_result)
+                                                 for dtype_x in ['float16', 'bfloat16', 'float32']
+                                                 for use_result in [False, True]])
+def test_atomic_add_block(dtype_x, use_result, device='cuda'):
+    SIZE, n_programs = 256, 16
+
+    # triton kernel
+    @triton.jit
+    def kernel(X, Z, OLD, **meta):
+        pid = tl.program_id(0)
+        off = tl.arange(0, meta['SIZE'])
+        x = tl.load(X + pid * meta['SIZE'] + off)
+        old = tl.atomic_add(Z + off, x)
+        if meta['USE_RESULT']:
+            tl.store(OLD + pid * meta['SIZE'] + off, old)
+
+    x = torch.randn((n_programs, SIZE), dtype=cvt[dtype_x], device=device)
+    z = torch.zeros((SIZE, ), dtype=cvt[dtype_x], device=device)
+    old = torch.empty_like(x)
+    kernel[(n_programs, )](x, z, old, SIZE=SIZE, USE_RESULT=use_result)
+    # compare
+    tol = {'float16': 1e-2, 'bfloat16': 1e-1, 'float32': 1e-4}[dtype_x]
+    assert torch.allclose(z.float(), x.float().sum(0), rtol=tol, atol=tol)
+    if use_result:
+        # the first program to update each element sees its initial value
+        assert ((old == 0).sum(0) >= 1).all()
+
+
 # ---------------
 # test cast
 # ---------------
@@ -324,21 +413,594 @@ def test_cast(dtype_x, dtype_z, bitcast, device='cuda'):
     assert z_tri == z_ref
 
 
+# ---------------
+# test reduce
+# ---------------
+@pytest.mark.parametrize("op, dtype_x, shape, axis", [
+    (op, dtype_x, shape, axis) \
+                        for op in ['argmin', 'argmax']\
+                        for dtype_x in ['int32', 'float16', 'float32']\
+                        for shape, axis in [((1024, ), 0), ((32, 64), 0), ((32, 64), 1)]
+])
+def test_arg_reduce(op, dtype_x, shape, axis, device='cuda'):
+    # triton kernel
+    @triton.jit
+    def kernel(X, Z, **meta):
+        off_m = tl.arange(0, meta['M'])
+        off_n = tl.arange(0, meta['N'])
+        x = tl.load(X + off_m[:, None] * meta['N'] + off_n[None, :])
+        z = GENERATE_TEST_HERE
+        if meta['AXIS'] == 0:
+            tl.store(Z + off_n, z)
+        else:
+            tl.store(Z + off_m, z)
+
+    @triton.jit
+    def kernel_1d(X, Z, **meta):
+        x = tl.load(X + tl.arange(0, meta['N']))
+        tl.store(Z, GENERATE_TEST_HERE)
+
+    kernel = kernel if len(shape) == 2 else kernel_1d
+    kernel = patch_kernel(kernel, {'GENERATE_TEST_HERE': f'tl.{op}(x, axis=meta["AXIS"])'})
+    # few distinct values so that ties have to be broken
+    x = torch.randint(-8, 8, shape, device=device).to(cvt[dtype_x])
+    z_tri = torch.empty((x.numel() // shape[axis], ), dtype=torch.int32, device=device)
+    meta = dict(M=shape[0], N=shape[1]) if len(shape) == 2 else dict(N=shape[0])
+    kernel[(1, )](x, z_tri, AXIS=axis, **meta)
+    # torch result: first occurrence of the extremum
+    x_ref = x.to(torch.float32)
+    ext = x_ref.amin(axis, keepdim=True) if op == 'argmin' else x_ref.amax(axis, keepdim=True)
+    pos = torch.arange(shape[axis], device=device).view([-1 if d == axis else 1 for d in range(len(shape))])
+    z_ref = torch.where(x_ref == ext, pos, shape[axis]).amin(axis).to(torch.int32).reshape(-1)
+    assert torch.equal(z_tri, z_ref)
+
+
+@pytest.mark.parametrize("op, shape, axis", [
+    (op, shape, axis) \
+                        for op in ['sum', 'max', 'min']\
+                        for shape in [(32, 64), (4, 256)]\
+                        for axis in [0, 1, -1, (0, 1)]
+])
+def test_reduce_keep_dims(op, shape, axis, device='cuda'):
+    # normalize-then-scale pattern: the reduction is broadcast back against its input
+    @triton.jit
+    def kernel(X, Z, **meta):
+        off_m = tl.arange(0, meta['M'])
+        off_n = tl.arange(0, meta['N'])
+        offs = off_m[:, None] * meta['N'] + off_n[None, :]
+        x = tl.load(X + offs)
+        tl.store(Z + offs, (x - GENERATE_TEST_HERE) * 2)
+
+    kernel = patch_kernel(kernel, {'GENERATE_TEST_HERE': f'tl.{op}(x, axis=meta["AXIS"], keep_dims=True)'})
+    # integer values so that sums are exact
+    x = torch.randint(-8, 8, shape, device=device).to(torch.float32)
+    z_tri = torch.empty_like(x)
+    kernel[(1, )](x, z_tri, M=shape[0], N=shape[1], AXIS=axis)
+    torch_op = {'sum': torch.sum, 'max': torch.amax, 'min': torch.amin}[op]
+    z_ref = (x - torch_op(x, dim=axis, keepdim=True)) * 2
+    triton.testing.assert_almost_equal(z_tri, z_ref)
+
+
+# ---------------
+# test scan
+# ---------------
+@triton.jit
+def _combine_max(a, b):
+    return triton.language.maximum(a, b)
+
+
+@pytest.mark.parametrize("op, dtype_x, shape, axis, exclusive", [
+    (op, dtype_x, shape, axis, exclusive) \
+                        for op in ['cumsum', 'cummax', 'custom']\
+                        for dtype_x in ['int32', 'float32']\
+                        for shape, axis in [((1024, ), 0), ((32, 64), 0), ((32, 64), 1)]\
+                        for exclusive in ([False, True] if op != 'custom' else [False])
+])
+def test_scan(op, dtype_x, shape, axis, exclusive, device='cuda'):
+    # triton kernel
+    @triton.jit
+    def kernel(X, Z, **meta):
+        off_m = tl.arange(0, meta['M'])
+        off_n = tl.arange(0, meta['N'])
+        off = off_m[:, None] * meta['N'] + off_n[None, :]
+        x = tl.load(X + off)
+        z = GENERATE_TEST_HERE
+        tl.store(Z + off, z)
+
+    @triton.jit
+    def kernel_1d(X, Z, **meta):
+        off = tl.arange(0, meta['N'])
+        x = tl.load(X + off)
+        z = GENERATE_TEST_HERE
+        tl.store(Z + off, z)
+
+    expr = {'cumsum': f'tl.cumsum(x, meta["AXIS"], exclusive={exclusive})',
+            'cummax': f'tl.cummax(x, meta["AXIS"], exclusive={exclusive})',
+            'custom': 'tl.associative_scan(x, meta["AXIS"], _combine_max)'}[op]
+    kernel = kernel if len(shape) == 2 else kernel_1d
+    kernel = patch_kernel(kernel, {'GENERATE_TEST_HERE': expr})
+    # small integers keep float sums exact
+    x = torch.randint(-8, 8, shape, device=device).to(cvt[dtype_x])
+    z_tri = torch.empty_like(x)
+    meta = dict(M=shape[0], N=shape[1]) if len(shape) == 2 else dict(N=shape[0])
+    kernel[(1, )](x, z_tri, AXIS=axis, **meta)
+    # torch result
+    if op == 'cumsum':
+        z_ref = torch.cumsum(x, axis).to(x.dtype)
+        if exclusive:
+            z_ref = z_ref - x
+    else:
+        z_ref = torch.cummax(x, axis).values
+        if exclusive:
+            neutral = torch.iinfo(x.dtype).min if dtype_x == 'int32' else float('-inf')
+            pad = torch.full_like(x.narrow(axis, 0, 1), neutral)
+            z_ref = torch.cat([pad, z_ref.narrow(axis, 0, shape[axis] - 1)], axis)
+    assert torch.equal(z_tri, z_ref)
+
+
+# ---------------
+# test random
+# ---------------
+def _philox_ref(seed, offsets):
+    import numpy as np
+    M = 0xFFFFFFFF
+    A, B = 0xD2511F53, 0xCD9E8D57
+    c0 = offsets.astype(np.uint64)
+    c1 = c2 = c3 = np.zeros_like(c0)
+    k0, k1 = seed & M, 0
+    for _ in range(10):
+        p0, p1 = A * c0, B * c2
+        c0, c1, c2, c3 = ((p1 >> 32) ^ c1 ^ k0) & M, p1 & M, ((p0 >> 32) ^ c3 ^ k1) & M, p0 & M
+        k0, k1 = (k0 + 0x9E3779B9) & M, (k1 + 0xBB67AE85) & M
+    return c0.astype(np.uint32).view(np.int32)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 42, 2**31 - 1])
+def test_randint(seed, device='cuda'):
+    SIZE = 1024
+
+    @triton.jit
+    def kernel(X, seed, **meta):
+        off = tl.arange(0, meta['SIZE'])
+        tl.store(X + off, tl.randint(seed, off))
+
+    x = torch.empty(SIZE, dtype=torch.int32, device=device)
+    kernel[(1, )](x, seed, SIZE=SIZE)
+    x_ref = _philox_ref(seed, torch.arange(SIZE).numpy())
+    assert (x.cpu().numpy() == x_ref).all()
+
+
+@pytest.mark.parametrize("dist", ['rand', 'randn'])
+def test_rand(dist, device='cuda'):
+    SIZE = 65536
+    BLOCK = 1024
+
+    @triton.jit
+    def kernel(X, seed, **meta):
+        off = tl.program_id(0) * meta['BLOCK'] + tl.arange(0, meta['BLOCK'])
+        x = GENERATE_TEST_HERE
+        tl.store(X + off, x)
+
+    kernel = patch_kernel(kernel, {'GENERATE_TEST_HERE': f'tl.{dist}(seed, off)'})
+    x = torch.empty(SIZE, dtype=torch.float32, device=device)
+    kernel[(SIZE // BLOCK, )](x, 17, BLOCK=BLOCK)
+    if dist == 'rand':
+        assert x.min() >= 0 and x.max() < 1
+        assert abs(x.mean().item() - 0.5) < 0.01
+    else:
+        assert abs(x.mean().item()) < 0.02
+        assert abs(x.std().item() - 1) < 0.02
+    # random numbers are regenerated identically from the same seed and offsets
+    y = torch.empty_like(x)
+    kernel[(SIZE // BLOCK, )](y, 17, BLOCK=BLOCK)
+    assert torch.equal(x, y)
+
+
+# ---------------
+# test dot
+# ---------------
+@pytest.mark.parametrize("dtype, K", [(dtype, K) for dtype in ['int8', 'float8'] for K in [16, 64]])
+def test_dot_8bit(dtype, K, device='cuda'):
+    M, N = 32, 32
+
+    @triton.jit
+    def kernel(X, Y, Z, **meta):
+        off_m = tl.arange(0, meta['M'])
+        off_n = tl.arange(0, meta['N'])
+        off_k = tl.arange(0, meta['K'])
+        x = tl.load(X + off_m[:, None] * meta['K'] + off_k[None, :])
+        y = tl.load(Y + off_k[:, None] * meta['N'] + off_n[None, :])
+        z = tl.dot(x, y)
+        tl.store(Z + off_m[:, None] * meta['N'] + off_n[None, :], z)
+
+    @triton.jit
+    def f8_to_f16(X, Y, **meta):
+        off = tl.arange(0, meta['BLOCK'])
+        tl.store(Y + off, tl.load(X + off).to(tl.float16))
+
+    if dtype == 'int8':
+        x = torch.randint(-128, 128, (M, K), dtype=torch.int8, device=device)
+        y = torch.randint(-128, 128, (K, N), dtype=torch.int8, device=device)
+        z_tri = torch.empty((M, N), dtype=torch.int32, device=device)
+        kernel[(1, )](x, y, z_tri, M=M, N=N, K=K)
+        z_ref = x.cpu().long() @ y.cpu().long()
+        assert torch.equal(z_tri.cpu().long(), z_ref)
+    else:
+        # every fp8 bit pattern is a finite value
+        x = torch.randint(0, 256, (M, K), dtype=torch.uint8, device=device)
+        y = torch.randint(0, 256, (K, N), dtype=torch.uint8, device=device)
+        x_f8, y_f8 = triton.reinterpret(x, tl.float8), triton.reinterpret(y, tl.float8)
+        z_tri = torch.empty((M, N), dtype=torch.float32, device=device)
+        kernel[(1, )](x_f8, y_f8, z_tri, M=M, N=N, K=K)
+        x_ref = torch.empty((M, K), dtype=torch.float16, device=device)
+        y_ref = torch.empty((K, N), dtype=torch.float16, device=device)
+        f8_to_f16[(1, )](x_f8, x_ref, BLOCK=M * K)
+        f8_to_f16[(1, )](y_f8, y_ref, BLOCK=K * N)
+        triton.testing.assert_almost_equal(z_tri, torch.matmul(x_ref.float(), y_ref.float()))
+
+
+def test_dot_shared_memory(device='cuda'):
+    M, N, K = 64, 64, 64
+
+    @triton.jit
+    def kernel(X, Y, Z, **meta):
+        off_m = tl.arange(0, meta['M'])
+        off_n = tl.arange(0, meta['N'])
+        off_k = tl.arange(0, meta['K'])
+        x = tl.load(X + off_m[:, None] * meta['K'] + off_k[None, :])
+        y = tl.load(Y + off_k[:, None] * meta['N'] + off_n[None, :])
+        z = tl.dot(x, y)
+        tl.store(Z + off_m[:, None] * meta['N'] + off_n[None, :], z)
+
+    x = triton.testing.random((M, K), dtype=torch.float16, device=device)
+    y = triton.testing.random((K, N), dtype=torch.float16, device=device)
+    z_tri = torch.empty((M, N), dtype=torch.float32, device=device)
+    binary = kernel[(1, )](x, y, z_tri, M=M, N=N, K=K)
+    # both operands are live in shared memory at the same time; anything
+    # staged for the epilogue must reuse their space once they are dead
+    assert binary.shared_mem == (M * K + K * N) * 2
+    assert binary.shared_fragmentation == 0.
+    triton.testing.assert_almost_equal(z_tri, torch.matmul(x.float(), y.float()))
+
+
 # ---------------
 # test load
 # ---------------
+@pytest.mark.parametrize("cache", ["", ".ca", ".cg", ".cs"])
+def test_load_cache_modifier(cache, device='cuda'):
+    src = torch.randn(128, device=device)
+    dst = torch.empty_like(src)
+
+    @triton.jit
+    def kernel(X, Y, **meta):
+        off = tl.arange(0, 128)
+        x = tl.load(X + off, cache_modifier=meta['CACHE'])
+        tl.store(Y + off, x)
+
+    pgm = kernel[(1, )](src, dst, CACHE=cache)
+    assert torch.equal(src, dst)
+    ptx = pgm.asm('ptx')
+    assert f'ld.global{cache or ".cg"}' in ptx
+
+
+@pytest.mark.parametrize("cache, eviction", [(cache, "") for cache in ["", ".wb", ".cg", ".cs", ".wt"]] +
+                                            [("", eviction) for eviction in ["evict_first", "evict_last"]])
+def test_store_cache_modifier(cache, eviction, device='cuda'):
+    src = torch.randn(128, device=device)
+    dst = torch.empty_like(src)
+
+    @triton.jit
+    def kernel(X, Y, **meta):
+        off = tl.arange(0, 128)
+        x = tl.load(X + off)
+        tl.store(Y + off, x, mask=off < 100, cache_modifier=meta['CACHE'], eviction_policy=meta['EVICT'])
+
+    pgm = kernel[(1, )](src, dst, CACHE=cache, EVICT=eviction)
+    assert torch.equal(src[:100], dst[:100])
+    if cache:
+        assert f'st.global{cache}' in pgm.asm('ptx')
+
+
+# ---------------
+# test block pointers
+# ---------------
+@pytest.mark.parametrize("M, N", [(64, 64), (100, 70), (33, 129)])
+def test_block_ptr(M, N, device='cuda'):
+    BLOCK_M, BLOCK_N = 32, 32
+
+    @triton.jit
+    def kernel(X, Y, M, N, stride_xm, stride_ym, **meta):
+        BLOCK_M = meta['BLOCK_M']
+        BLOCK_N = meta['BLOCK_N']
+        pid = tl.program_id(0)
+        x_ptr = tl.make_block_ptr(X, (M, N), (stride_xm, 1), (pid * BLOCK_M, 0), (BLOCK_M, BLOCK_N), (1, 0))
+        y_ptr = tl.make_block_ptr(Y, (M, N), (stride_ym, 1), (pid * BLOCK_M, 0), (BLOCK_M, BLOCK_N), (1, 0))
+        for n in range(0, N, BLOCK_N):
+            x = tl.load(x_ptr, boundary_check=(0, 1))
+            tl.store(y_ptr, x, boundary_check=(0, 1))
+            x_ptr = tl.advance(x_ptr, (0, BLOCK_N))
+            y_ptr = tl.advance(y_ptr, (0, BLOCK_N))
+
+    x = triton.testing.random((M, N), dtype=torch.float16, device=device)
+    y = torch.zeros((M, N + 3), dtype=torch.float16, device=device)
+    binary = kernel[(triton.cdiv(M, BLOCK_M), )](x, y, M, N, x.stride(0), y.stride(0), BLOCK_M=BLOCK_M, BLOCK_N=BLOCK_N)
+    assert torch.equal(y[:, :N], x)
+    assert torch.all(y[:, N:] == 0)
+    # offsets derived from program ids and advanced by positive steps are non-negative,
+    # so only the upper bounds are checked
+    ttir = binary.asm('ttir')
+    assert 'icmp_sge' not in ttir
+    assert 'icmp_slt' in ttir
+
+
+@pytest.mark.parametrize("padding", ["zero", "nan"])
+def test_block_ptr_padding(padding, device='cuda'):
+    M, N, BLOCK = 20, 10, 32
+
+    @triton.jit
+    def kernel(X, Z, M, N, **meta):
+        BLOCK = meta['BLOCK']
+        x_ptr = tl.make_block_ptr(X, (M, N), (N, 1), (0, 0), (BLOCK, BLOCK), (1, 0))
+        x = tl.load(x_ptr, boundary_check=(0, 1), padding_option=meta['PADDING'])
+        off = tl.arange(0, BLOCK)
+        tl.store(Z + off[:, None] * BLOCK + off[None, :], x)
+
+    x = triton.testing.random((M, N), dtype=torch.float32, device=device)
+    z = torch.empty((BLOCK, BLOCK), dtype=torch.float32, device=device)
+    kernel[(1, )](x, z, M, N, BLOCK=BLOCK, PADDING=padding)
+    z_ref = torch.full((BLOCK, BLOCK), 0. if padding == "zero" else float('nan'), device=device)
+    z_ref[:M, :N] = x
+    assert torch.equal(z[:M, :N], x)
+    assert torch.allclose(z, z_ref, equal_nan=True)
+
 
 # ---------------
 # test store
 # ---------------
+def test_store_load_barrier(device='cuda'):
+    SIZE = 1024
+
+    # triton kernel
+    @triton.jit
+    def kernel(X, Y, Z, **meta):
+        off = tl.arange(0, meta['SIZE'])
+        x = tl.load(X + off)
+        tl.store(Y + off, x * 2.)
+        # read element written by another thread
+        y = tl.load(Y + meta['SIZE'] - 1)
+        tl.store(Z, y)
+
+    x = triton.testing.random((SIZE, ), dtype=torch.float32, device=device)
+    y = torch.empty_like(x)
+    z_tri = torch.empty((1, ), dtype=torch.float32, device=device)
+    binary = kernel[(1, )](x, y, z_tri, SIZE=SIZE, num_warps=8)
+    assert binary.num_barriers >= 1
+    assert z_tri.item() == 2. * x[-1].item()
+
+
+def test_atomic_load_barrier(device='cuda'):
+    SIZE = 1024
+
+    # triton kernel
+    @triton.jit
+    def kernel(X, Y, Z, **meta):
+        off = tl.arange(0, meta['SIZE'])
+        x = tl.load(X + off)
+        tl.atomic_add(Y + off, x * 2.)
+        # read element updated by another thread
+        y = tl.load(Y + meta['SIZE'] - 1)
+        tl.store(Z, y)
+
+    x = triton.testing.random((SIZE, ), dtype=torch.float32, device=device)
+    y = torch.zeros_like(x)
+    z_tri = torch.empty((1, ), dtype=torch.float32, device=device)
+    binary = kernel[(1, )](x, y, z_tri, SIZE=SIZE, num_warps=8)
+    assert binary.num_barriers >= 1
+    assert z_tri.item() == 2. * x[-1].item()
+
+
+def test_copy_no_barrier(device='cuda'):
+    SIZE = 1024
+
+    # triton kernel
+    @triton.jit
+    def kernel(Z, X, **meta):
+        off = tl.arange(0, meta['SIZE'])
+        tl.store(Z + off, tl.load(X + off))
+
+    x = triton.testing.random((SIZE, ), dtype=torch.float32, device=device)
+    z_tri = torch.empty_like(x)
+    binary = kernel[(1, )](z_tri, x, SIZE=SIZE, num_warps=8)
+    # loads and stores through distinct arguments need no synchronization
+    assert binary.num_barriers == 0
+    assert torch.equal(z_tri, x)
+
 
 # ---------------
 # test if
 # ---------------
+@triton.jit
+def _constexpr_scale(x, SQUARE: tl.constexpr):
+    if SQUARE:
+        y = x * x
+    else:
+        y = x + 1
+    return y
+
+
+@pytest.mark.parametrize("square", [False, True])
+def test_constexpr_if(square, device='cuda'):
+    @triton.jit
+    def kernel(X, Z, **meta):
+        off = tl.arange(0, meta['BLOCK'])
+        # `square` is an IR constant here; the constexpr argument folds it back
+        square = meta['SQUARE']
+        tl.store(Z + off, _constexpr_scale(tl.load(X + off), square))
+
+    x = triton.testing.random((128, ), dtype=torch.float32, device=device)
+    z_tri = torch.empty_like(x)
+    kernel[(1, )](x, z_tri, BLOCK=128, SQUARE=square)
+    z_ref = x * x if square else x + 1
+    triton.testing.assert_almost_equal(z_tri, z_ref)
+
+
+def test_static_assert(device='cuda'):
+    @triton.jit
+    def kernel(X, **meta):
+        tl.static_assert(meta['BLOCK'] % 64 == 0, "BLOCK must be a multiple of 64")
+        tl.store(X + tl.arange(0, meta['BLOCK']), 0.)
+
+    x = torch.empty((128, ), dtype=torch.float32, device=device)
+    kernel[(1, )](x, BLOCK=128)
+    with pytest.raises(triton.code_gen.CompilationError):
+        kernel[(1, )](x, BLOCK=32)
+
 
 # ---------------
 # test for
 # ---------------
+@pytest.mark.parametrize("num_stages, N", [(num_stages, N) for num_stages in [1, 2, 3, 4] for N in [128, 1000]])
+def test_for_pipelined_load(num_stages, N, device='cuda'):
+    BLOCK = 128
+
+    # triton kernel
+    @triton.jit
+    def kernel(Z, X, N, **meta):
+        off = tl.arange(0, meta['BLOCK'])
+        X = X + off
+        acc = tl.zeros((meta['BLOCK'], ), dtype=tl.float32)
+        for n in range(0, N, meta['BLOCK']):
+            acc += tl.load(X, mask=off < N - n, other=0.)
+            X += meta['BLOCK']
+        tl.store(Z + off, acc)
+
+    # triton result
+    x = triton.testing.random((N, ), dtype=torch.float32, device=device)
+    z_tri = torch.empty((BLOCK, ), dtype=torch.float32, device=device)
+    kernel[(1, )](z_tri, x, N, BLOCK=BLOCK, num_stages=num_stages)
+    # torch result
+    x_pad = torch.zeros((triton.cdiv(N, BLOCK) * BLOCK, ), dtype=torch.float32, device=device)
+    x_pad[:N] = x
+    z_ref = x_pad.view(-1, BLOCK).sum(0)
+    # compare
+    triton.testing.assert_allclose(z_ref, z_tri)
+
+
+@pytest.mark.parametrize("num_stages", [2, 3])
+def test_for_atomic_no_pipeline(num_stages, device='cuda'):
+    BLOCK, N = 128, 1024
+
+    # triton kernel
+    @triton.jit
+    def kernel(Z, X, Y, N, **meta):
+        off = tl.arange(0, meta['BLOCK'])
+        X = X + off
+        Y = Y + off
+        acc = tl.zeros((meta['BLOCK'], ), dtype=tl.float32)
+        for n in range(0, N, meta['BLOCK']):
+            acc += tl.load(X)
+            # updates the block loaded by the next iteration
+            tl.atomic_add(Y, 1.)
+            X += meta['BLOCK']
+            Y += meta['BLOCK']
+        tl.store(Z + off, acc)
+
+    # X and Y are distinct arguments that alias
+    x = triton.testing.random((N + BLOCK, ), dtype=torch.float32, device=device)
+    z_ref = x[:N].view(-1, BLOCK).sum(0) + (N // BLOCK - 1)
+    z_tri = torch.empty((BLOCK, ), dtype=torch.float32, device=device)
+    kernel[(1, )](z_tri, x, x[BLOCK:], N, BLOCK=BLOCK, num_stages=num_stages)
+    triton.testing.assert_allclose(z_ref, z_tri)
+
+
+@pytest.mark.parametrize("num_stages", [2, 3])
+def test_for_store_no_pipeline(num_stages, device='cuda'):
+    BLOCK, N = 128, 1024
+
+    # triton kernel
+    @triton.jit
+    def kernel(X, Y, N, **meta):
+        off = tl.arange(0, meta['BLOCK'])
+        X = X + off
+        Y = Y + off
+        acc = tl.zeros((meta['BLOCK'], ), dtype=tl.float32)
+        for n in range(0, N, meta['BLOCK']):
+            acc += tl.load(X)
+            # overwrites the block loaded by the next iteration
+            tl.store(Y, acc)
+            X += meta['BLOCK']
+            Y += meta['BLOCK']
+
+    # X and Y are distinct arguments that alias
+    x = triton.testing.random((N + BLOCK, ), dtype=torch.float32, device=device)
+    x_ref = x.clone().view(-1, BLOCK)
+    acc = torch.zeros((BLOCK, ), dtype=torch.float32, device=device)
+    for n in range(N // BLOCK):
+        acc += x_ref[n]
+        x_ref[n + 1] = acc
+    kernel[(1, )](x, x[BLOCK:], N, BLOCK=BLOCK, num_stages=num_stages)
+    triton.testing.assert_allclose(x_ref.view(-1), x)
+
+
+@pytest.mark.parametrize("num_stages", [1, 2])
+def test_for_ptr_induction(num_stages, device='cuda'):
+    M, N, K = 32, 16, 128
+
+    # triton kernel
+    @triton.jit
+    def kernel(Z, X, K, stride_xm, **meta):
+        rm = tl.arange(0, meta['M'])
+        rn = tl.arange(0, meta['N'])
+        X = X + rm[:, None] * stride_xm + rn[None, :]
+        acc = tl.zeros((meta['M'], meta['N']), dtype=tl.float32)
+        for k in range(0, K, meta['N']):
+            acc += tl.load(X)
+            X += meta['N']
+        tl.store(Z + rm[:, None] * meta['N'] + rn[None, :], acc)
+
+    x = triton.testing.random((M, K), dtype=torch.float32, device=device)
+    z_tri = torch.empty((M, N), dtype=torch.float32, device=device)
+    binary = kernel[(1, )](z_tri, x, K, x.stride(0), M=M, N=N, num_stages=num_stages)
+    # only the scalar base pointer is carried across iterations
+    ttir = binary.asm('ttir')
+    assert 'phi f32*<' not in ttir
+    assert 'phi f32* ' in ttir
+    z_ref = x.view(M, K // N, N).sum(1)
+    triton.testing.assert_allclose(z_ref, z_tri)
+
+
+@pytest.mark.parametrize("BLOCK, remat", [(32, False), (128, True)])
+def test_for_remat(BLOCK, remat, device='cuda'):
+    M, N, K = BLOCK, BLOCK, 64
+
+    # triton kernel
+    @triton.jit
+    def kernel(Z, X, Y, K, **meta):
+        BLOCK_M, BLOCK_N, BLOCK_K = meta['BLOCK_M'], meta['BLOCK_N'], meta['BLOCK_K']
+        # row and column indices are only needed before and after the loop
+        rm = tl.program_id(0) * BLOCK_M + tl.arange(0, BLOCK_M)
+        rn = tl.arange(0, BLOCK_N)
+        rk = tl.arange(0, BLOCK_K)
+        X = X + rm[:, None] * K + rk[None, :]
+        Y = Y + rk[:, None] * BLOCK_N + rn[None, :]
+        acc = tl.zeros((BLOCK_M, BLOCK_N), dtype=tl.float32)
+        for k in range(0, K, BLOCK_K):
+            acc += tl.dot(tl.load(X), tl.load(Y))
+            X += BLOCK_K
+            Y += BLOCK_K * BLOCK_N
+        tl.store(Z + rm[:, None] * BLOCK_N + rn[None, :], acc)
+
+    x = triton.testing.random((M, K), dtype=torch.float16, device=device)
+    y = triton.testing.random((K, N), dtype=torch.float16, device=device)
+    z_tri = torch.empty((M, N), dtype=torch.float32, device=device)
+    binary = kernel[(1, )](z_tri, x, y, K, BLOCK_M=M, BLOCK_N=N, BLOCK_K=32, num_warps=4)
+    # with 128x128 tiles the loop exceeds the 255 registers available per
+    # thread, and the indices are re-computed in the block that stores `acc`
+    ttir = binary.asm('ttir')
+    exit_block = next(block for block in re.split(r'\n(?=\S+:)', ttir) if 'store' in block)
+    assert ('make_range' in exit_block) == remat
+    triton.testing.assert_almost_equal(z_tri, torch.matmul(x.float(), y.float()))
+
 
 # ---------------
 # test while
@@ -66,7 +66,7 @@ import torch
 def test_op(BLOCK_M, BLOCK_N, BLOCK_K, SPLIT_K, NWARP, NSTAGE, M, N, K, AT, BT, DTYPE):
     torch.manual_seed(0)
     # nuke kernel decorators -- will set meta-parameters manually
-    META = {'BLOCK_M': BLOCK_M, 'BLOCK_N': BLOCK_N, 'BLOCK_K': BLOCK_K, 'SPLIT_K': SPLIT_K, 'GROUP_M': 8}
+    META = {'BLOCK_M': BLOCK_M, 'BLOCK_N': BLOCK_N, 'BLOCK_K': BLOCK_K, 'SPLIT_K': SPLIT_K, 'GROUP_M': 8, 'STREAM_K': 0}
     configs = [triton.Config(meta=META, num_warps=NWARP, num_stages=NSTAGE)]
     kernel = triton.ops._matmul.kernel
     decorators = kernel.kernel_decorators
@@ -87,3 +87,266 @@ def test_op(BLOCK_M, BLOCK_N, BLOCK_K, SPLIT_K, NWARP, NSTAGE, M, N, K, AT, BT,
     th_c = torch.matmul(a, b)
     tt_c = triton.testing.catch_oor(lambda : triton.ops.matmul(a, b), pytest)
     assert triton.testing.allclose(th_c, tt_c)
+
+
+@pytest.mark.parametrize("extra_tiles, K", [(1, 1024), (7, 1000), (-3, 512)])
+def test_stream_k(extra_tiles, K):
+    torch.manual_seed(0)
+    # a single persistent configuration, with a last wave of `extra_tiles` tiles
+    META = {'BLOCK_M': 64, 'BLOCK_N': 64, 'BLOCK_K': 32, 'SPLIT_K': 1, 'GROUP_M': 8, 'STREAM_K': 1}
+    configs = [triton.Config(meta=META, num_warps=4, num_stages=2)]
+    kernel = triton.ops._matmul.kernel
+    decorators = kernel.kernel_decorators
+    kernel.kernel_decorators = []
+    triton.autotune(configs, [])(kernel)
+    kernel.kernel_decorators += decorators[1:]
+    num_sms = torch.cuda.get_device_properties(0).multi_processor_count
+    M, N = 64 * (num_sms + extra_tiles), 64
+    a = torch.randn((M, K), device="cuda", dtype=torch.float16)
+    b = torch.randn((K, N), device="cuda", dtype=torch.float16)
+    th_c = torch.matmul(a, b)
+    # runs twice to check that the workspace is left clean
+    for _ in range(2):
+        tt_c = triton.ops.matmul(a, b)
+        assert triton.testing.allclose(th_c, tt_c)
+
+
+@pytest.mark.parametrize("SPLIT_K, STREAM_K", [(1, 0), (2, 0), (1, 1)])
+def test_no_workspace(SPLIT_K, STREAM_K):
+    # once the workspace pool is large enough, calls allocate nothing but the output
+    META = {'BLOCK_M': 64, 'BLOCK_N': 64, 'BLOCK_K': 32, 'SPLIT_K': SPLIT_K, 'GROUP_M': 8, 'STREAM_K': STREAM_K}
+    configs = [triton.Config(meta=META, num_warps=4, num_stages=2)]
+    kernel = triton.ops._matmul.kernel
+    decorators = kernel.kernel_decorators
+    kernel.kernel_decorators = []
+    triton.autotune(configs, [])(kernel)
+    kernel.kernel_decorators += decorators[1:]
+    a = torch.randn((512, 512), device="cuda", dtype=torch.float16)
+    b = torch.randn((512, 512), device="cuda", dtype=torch.float16)
+    triton.ops.matmul(a, b)
+    torch.cuda.synchronize()
+    torch.cuda.reset_peak_memory_stats()
+    allocated = torch.cuda.memory_allocated()
+    c = triton.ops.matmul(a, b)
+    assert torch.cuda.max_memory_allocated() == allocated + c.numel() * c.element_size()
+    assert triton.testing.allclose(torch.matmul(a, b), c)
+
+
+@pytest.mark.parametrize("NSTAGE", [2, 3])
+def test_ptr_induction(NSTAGE):
+    # the pointers to A and B are advanced as scalar base pointers
+    META = {'BLOCK_M': 64, 'BLOCK_N': 64, 'BLOCK_K': 32, 'SPLIT_K': 1, 'GROUP_M': 8, 'STREAM_K': 0}
+    configs = [triton.Config(meta=META, num_warps=4, num_stages=NSTAGE)]
+    kernel = triton.ops._matmul.kernel
+    decorators = kernel.kernel_decorators
+    kernel.kernel_decorators = []
+    triton.autotune(configs, [])(kernel)
+    kernel.kernel_decorators += decorators[1:]
+    kernel.cache.clear()
+    a = torch.randn((256, 128), device="cuda", dtype=torch.float16)
+    b = torch.randn((128, 256), device="cuda", dtype=torch.float16)
+    tt_c = triton.testing.catch_oor(lambda: triton.ops.matmul(a, b), pytest)
+    assert triton.testing.allclose(torch.matmul(a, b), tt_c)
+    ttir, = [binary.asm('ttir') for binary in kernel.cache.values()]
+    assert 'phi f16*<' not in ttir
+    assert 'phi f16* ' in ttir
+
+
+@pytest.mark.parametrize("M, N, K", [(1, 4096, 4096), (16, 4096, 4096), (64, 768, 3072), (107, 233, 311), (4096, 4096, 4096)])
+def test_prune_configs(M, N, K):
+    from triton.ops.matmul import prune_configs, get_configs_compute_bound, get_configs_io_bound, get_configs_stream_k
+    a = torch.empty((M, K), device="cuda", dtype=torch.float16)
+    configs = get_configs_compute_bound() + get_configs_io_bound() + get_configs_stream_k()
+    pruned = prune_configs(configs, {"A": a, "M": M, "N": N, "K": K, "Z0": 1, "Z1": 1}, top_k=10)
+    assert 0 < len(pruned) <= 10
+    for config in pruned:
+        # split-k slices must cover K exactly
+        assert K % config.meta["SPLIT_K"] == 0
+        # decode-style problems must not be padded to large tiles
+        if M <= 16:
+            assert config.meta["BLOCK_M"] == 16
+
+
+@pytest.mark.parametrize("activation", [None, "relu", "gelu"])
+@pytest.mark.parametrize("epilogue", ["none", "bias", "c", "residual", "all"])
+def test_epilogue(activation, epilogue):
+    torch.manual_seed(0)
+    M, N, K = 128, 256, 64
+    alpha, beta = 0.5, 2.
+    make = lambda shape: torch.randn(shape, device="cuda", dtype=torch.float16, requires_grad=True)
+    a, b = make((M, K)), make((K, N))
+    bias = make((N, )) if epilogue in ["bias", "all"] else None
+    c = make((M, N)) if epilogue in ["c", "all"] else None
+    residual = make((M, N)) if epilogue in ["residual", "all"] else None
+    inputs = [x for x in [a, b, bias, c, residual] if x is not None]
+    # triton result
+    tt_y = triton.ops.matmul(a, b, bias=bias, activation=activation, alpha=alpha, beta=beta, c=c, residual=residual)
+    dy = torch.randn_like(tt_y)
+    tt_y.backward(dy)
+    tt_grads = [x.grad.clone() for x in inputs]
+    for x in inputs:
+        x.grad = None
+    # torch result
+    th_y = alpha * torch.matmul(a.float(), b.float())
+    if c is not None:
+        th_y = th_y + beta * c.float()
+    if bias is not None:
+        th_y = th_y + bias.float()
+    th_y = {None: lambda x: x, "relu": torch.relu, "gelu": torch.nn.functional.gelu}[activation](th_y)
+    if residual is not None:
+        th_y = th_y + residual.float()
+    th_y.backward(dy.float())
+    th_grads = [x.grad.clone() for x in inputs]
+    # compare
+    assert triton.testing.allclose(th_y.half(), tt_y)
+    for th_dx, tt_dx in zip(th_grads, tt_grads):
+        assert triton.testing.allclose(th_dx, tt_dx)
+
+
+@pytest.mark.parametrize("shape_a, shape_b, permute_a", [
+    ((4, 64, 32), (4, 32, 128), False),
+    ((2, 3, 64, 32), (2, 3, 32, 64), False),
+    ((2, 3, 64, 32), (2, 3, 32, 64), True),
+    ((4, 64, 32), (32, 128), False),
+    ((64, 32), (2, 3, 32, 64), False),
+    ((2, 1, 64, 32), (1, 3, 32, 64), False),
+])
+def test_batched(shape_a, shape_b, permute_a):
+    torch.manual_seed(0)
+    if permute_a:
+        # (batch, M, head, K) -> (batch, head, M, K) view, as in attention
+        a = torch.randn((shape_a[0], shape_a[2], shape_a[1], shape_a[3]), device="cuda", dtype=torch.float16)
+        a = a.permute(0, 2, 1, 3)
+    else:
+        a = torch.randn(shape_a, device="cuda", dtype=torch.float16)
+    b = torch.randn(shape_b, device="cuda", dtype=torch.float16)
+    th_c = torch.matmul(a, b)
+    tt_c = triton.ops.matmul(a, b)
+    assert th_c.shape == tt_c.shape
+    assert triton.testing.allclose(th_c, tt_c)
+
+
+@pytest.mark.parametrize("shape_a, shape_b, trans_b", [
+    ((64, 32), (32, 128), False),
+    ((64, 32), (32, 128), True),
+    ((4, 64, 32), (32, 128), True),
+    ((4, 64, 32), (4, 32, 128), False),
+    ((64, 32), (4, 32, 128), False),
+])
+@pytest.mark.parametrize("activation", [None, "relu", "gelu"])
+def test_backward(shape_a, shape_b, trans_b, activation):
+    torch.manual_seed(0)
+    a = torch.randn(shape_a, device="cuda", dtype=torch.float16, requires_grad=True)
+    # (N, K) weights are multiplied transposed, as in a linear layer
+    if trans_b:
+        w = torch.randn(shape_b[:-2] + shape_b[::-1][:2], device="cuda", dtype=torch.float16, requires_grad=True)
+        b = w.transpose(-1, -2)
+    else:
+        w = b = torch.randn(shape_b, device="cuda", dtype=torch.float16, requires_grad=True)
+    # gradients of activations are computed in the prologue of the gradient kernels
+    tt_y = triton.ops.matmul(a, b, activation=activation)
+    dy = torch.randn_like(tt_y)
+    tt_y.backward(dy)
+    tt_da, tt_dw = a.grad.clone(), w.grad.clone()
+    a.grad = w.grad = None
+    th_y = {None: lambda x: x, "relu": torch.relu, "gelu": torch.nn.functional.gelu}[activation](torch.matmul(a, b))
+    th_y.backward(dy)
+    assert triton.testing.allclose(a.grad, tt_da)
+    assert triton.testing.allclose(w.grad, tt_dw)
+
+
+def test_relu_no_pre():
+    # relu is differentiated from its output: the forward pass allocates nothing but the output
+    a = torch.randn((512, 256), device="cuda", dtype=torch.float16, requires_grad=True)
+    b = torch.randn((256, 512), device="cuda", dtype=torch.float16, requires_grad=True)
+    triton.ops.matmul(a, b, activation="relu")
+    torch.cuda.synchronize()
+    torch.cuda.reset_peak_memory_stats()
+    allocated = torch.cuda.memory_allocated()
+    c = triton.ops.matmul(a, b, activation="relu")
+    assert torch.cuda.max_memory_allocated() == allocated + c.numel() * c.element_size()
+
+
+@pytest.mark.parametrize("view_a, view_b", [
+    ("row", "col"), ("col", "row"), ("general", "row"), ("row", "general"), ("general", "general"),
+])
+def test_strided(view_a, view_b):
+    torch.manual_seed(0)
+    M, N, K = 128, 96, 80
+
+    def make(rows, cols, view):
+        # row-major, column-major or generally strided view of a larger buffer
+        if view == "row":
+            return torch.randn((rows, cols + 8), device="cuda", dtype=torch.float16)[:, :cols]
+        if view == "col":
+            return torch.randn((cols, rows + 8), device="cuda", dtype=torch.float16)[:, :rows].t()
+        return torch.randn((2 * rows, 3 * cols), device="cuda", dtype=torch.float16)[::2, ::3]
+
+    a, b = make(M, K, view_a), make(K, N, view_b)
+    th_c = torch.matmul(a, b)
+    tt_c = triton.ops.matmul(a, b)
+    assert triton.testing.allclose(th_c, tt_c)
+
+
+@pytest.mark.parametrize("dtype, out_dtype", [
+    ("bfloat16", None), ("float32", None), ("float16", "float32"),
+])
+def test_dtypes(dtype, out_dtype):
+    torch.manual_seed(0)
+    M, N, K = 256, 192, 384
+    dtype = getattr(torch, dtype)
+    out_dtype = None if out_dtype is None else getattr(torch, out_dtype)
+    a = torch.randn((M, K), device="cuda", dtype=dtype)
+    b = torch.randn((K, N), device="cuda", dtype=dtype)
+    th_c = torch.matmul(a.float(), b.float())
+    tt_c = triton.ops.matmul(a, b, out_dtype=out_dtype)
+    assert tt_c.dtype == (out_dtype or dtype)
+    assert triton.testing.allclose(th_c.to(tt_c.dtype), tt_c)
+
+
+def test_out():
+    torch.manual_seed(0)
+    M, N, K = 256, 192, 128
+    a = torch.randn((M, K), device="cuda", dtype=torch.float16, requires_grad=True)
+    b = torch.randn((K, N), device="cuda", dtype=torch.float16)
+    bias = torch.randn((N, ), device="cuda", dtype=torch.float16)
+    th_c = torch.relu(torch.matmul(a, b) + bias)
+    # column-major output buffer, filled with garbage
+    out = torch.full((N, M), float("nan"), device="cuda", dtype=torch.float16).t()
+    tt_c = triton.ops.matmul(a, b, bias=bias, activation="relu", out=out)
+    assert tt_c.data_ptr() == out.data_ptr()
+    assert triton.testing.allclose(th_c, out)
+    # gradients flow through the pre-allocated output
+    dc = torch.randn_like(th_c)
+    th_da, = torch.autograd.grad(th_c, a, dc)
+    tt_da, = torch.autograd.grad(tt_c, a, dc)
+    assert triton.testing.allclose(th_da, tt_da)
+
+
+@pytest.mark.parametrize("out", ["shape", "dtype", "device", "strides"])
+def test_out_invalid(out):
+    M, N, K = 64, 32, 16
+    a = torch.randn((M, K), device="cuda", dtype=torch.float16)
+    b = torch.randn((K, N), device="cuda", dtype=torch.float16)
+    out = {
+        "shape": lambda: torch.empty((M, N + 1), device="cuda", dtype=torch.float16),
+        "dtype": lambda: torch.empty((M, N), device="cuda", dtype=torch.float32),
+        "device": lambda: torch.empty((M, N), device="cpu", dtype=torch.float16),
+        "strides": lambda: torch.empty((M, 2 * N), device="cuda", dtype=torch.float16)[:, ::2],
+    }[out]()
+    with pytest.raises(ValueError):
+        triton.ops.matmul(a, b, out=out)
+
+
+@pytest.mark.parametrize("shapes", [
+    [(128, 256, 64)],
+    [(37, 512, 256), (0, 512, 256), (128, 512, 256), (5, 512, 256)],
+    [(64, 32, 16), (300, 96, 200), (17, 1000, 33)],
+])
+def test_grouped(shapes):
+    torch.manual_seed(0)
+    list_a = [torch.randn((M, K), device="cuda", dtype=torch.float16) for M, N, K in shapes]
+    list_b = [torch.randn((K, N), device="cuda", dtype=torch.float16) for M, N, K in shapes]
+    tt_c = triton.ops.grouped_matmul(list_a, list_b)
+    for a, b, c in zip(list_a, list_b, tt_c):
+        assert triton.testing.allclose(torch.matmul(a, b), c)
@@ -12,6 +12,7 @@ import triton
 import sys
 import textwrap
 import collections
+import functools
 
 
 class CodeGenerator(ast.NodeVisitor):
@@ -31,6 +32,9 @@ class CodeGenerator(ast.NodeVisitor):
         if isinstance(ret, triton.language.block):
             handle = self.module.get_value(name)
             return triton.language.block(handle)
+        # block pointers are tracked through the IR values they are made of
+        if isinstance(ret, triton.language.block_ptr):
+            return ret.replace_handles(lambda key: triton.language.block(self.module.get_value(f'{name}.{key}')))
         return ret
 
     def set_value(self, name, value):
@@ -39,11 +43,23 @@ class CodeGenerator(ast.NodeVisitor):
         if isinstance(value, triton.language.block):
             self.module.set_value(name, value.handle)
             self.module.set_type(name, value.handle.type)
+        if isinstance(value, triton.language.block_ptr):
+            for key, x in value.handles().items():
+                self.module.set_value(f'{name}.{key}', x.handle)
+                self.module.set_type(f'{name}.{key}', x.handle.type)
         self.lscope[name] = value
 
     def is_triton_object(self, value):
         return isinstance(value, triton.language.block)
 
+    def fold_constant(self, value):
+        # scalar IR constants are turned back into Python values
+        # so that control-flow depending on them is resolved statically
+        try:
+            return triton.language._constexpr_value(value)
+        except ValueError:
+            return value
+
     def visit_compound_statement(self, stmts):
         for stmt in stmts:
             self.last_ret = self.visit(stmt)
@@ -150,6 +166,17 @@ class CodeGenerator(ast.NodeVisitor):
                 value = triton.language._to_ir(value, self.builder)
             self.set_value(name, value)
 
+    def visit_AnnAssign(self, node):
+        annotation = self.visit(node.annotation)
+        if annotation is not triton.language.constexpr:
+            return self.visit(ast.Assign(targets=[node.target], value=node.value))
+        # compile-time constants are kept as Python values
+        name = self.visit(node.target)
+        try:
+            self.lscope[name] = triton.language._constexpr_value(self.visit(node.value))
+        except ValueError:
+            raise ValueError(f'{name} is annotated as constexpr but its value is not a compile-time constant')
+
     def visit_AugAssign(self, node):
         name = node.target.id
         lhs = ast.Name(id=name, ctx=ast.Load())
@@ -203,7 +230,7 @@ class CodeGenerator(ast.NodeVisitor):
         return ret
 
     def visit_If(self, node):
-        cond = self.visit(node.test)
+        cond = self.fold_constant(self.visit(node.test))
         if self.is_triton_object(cond):
             current_bb = self.builder.get_insert_block()
             then_bb = _triton.ir.basic_block.create(self.builder.context, "then", current_bb.parent)
@@ -235,7 +262,7 @@ class CodeGenerator(ast.NodeVisitor):
                 self.visit_compound_statement(node.orelse)
 
     def visit_IfExp(self, node):
-        cond = self.visit(node.test)
+        cond = self.fold_constant(self.visit(node.test))
         if cond:
             return self.visit(node.body)
         else:
@@ -381,6 +408,9 @@ class CodeGenerator(ast.NodeVisitor):
             return fn(*args, generator=self, **kws)
         if hasattr(fn, '__self__') and self.is_triton_object(fn.__self__) or \
             sys.modules[fn.__module__] is triton.language:
+            # JIT functions given to builtins (e.g., scan combine functions)
+            # are inlined by this generator when the builtin calls them
+            args = [functools.partial(arg, generator=self) if isinstance(arg, JITFunction) else arg for arg in args]
             return fn(*args, builder=self.builder, **kws)
         return fn(*args, **kws)
 
@@ -408,12 +438,16 @@ class CodeGenerator(ast.NodeVisitor):
 
 
 class Binary:
-    def __init__(self, module, kernel, num_warps, num_stages, shared_mem, ir_asm):
+    def __init__(self, module, kernel, num_warps, num_stages, shared_mem, ir_asm, num_barriers, shared_fragmentation):
         # cache ir asm
         self.ir_asm = ir_asm
         self.module = module
         self.kernel = kernel
         self.shared_mem = shared_mem
+        # fraction of the allocated shared memory that is wasted at peak usage
+        self.shared_fragmentation = shared_fragmentation
+        # number of barriers inserted in the kernel
+        self.num_barriers = num_barriers
         self.num_warps = num_warps
         self.num_stages = num_stages
         self.sass = None
@@ -546,10 +580,11 @@ class Kernel:
             raise CompilationError(self.fn.src, node, e)
         tt_device = _triton.driver.cu_device(device.index, False)
         # Compile to machine code
-        mod, ker, shared_mem, ir_asm = _triton.code_gen.add_passes_to_emit_bin(generator.module, tt_device, num_warps, num_stages)
+        mod, ker, shared_mem, ir_asm, num_barriers, shared_fragmentation = \
+            _triton.code_gen.add_passes_to_emit_bin(generator.module, tt_device, num_warps, num_stages)
         if shared_mem > tt_device.max_shared_memory():
             raise  OutOfResources(shared_mem, tt_device.max_shared_memory(), "shared memory")
-        return Binary(mod, ker, num_warps, num_stages, shared_mem, ir_asm)
+        return Binary(mod, ker, num_warps, num_stages, shared_mem, ir_asm, num_barriers, shared_fragmentation)
 
     def __call__(self, *wargs, grid, num_warps=4, num_stages=2, **meta):
         # device inference
@@ -561,8 +596,10 @@ class Kernel:
         # attributes
         args = [arg.data_ptr() if i in tensor_idxs else arg for i, arg in enumerate(wargs)]
         attributes = {i: Kernel.pow2_divisor(a) for i, a in enumerate(args) if isinstance(a, int)}
-        # transforms ints whose value is one into constants for just-in-time compilation
+        # transforms ints whose value is one, as well as constexpr arguments,
+        # into constants for just-in-time compilation
         constants = {i: arg for i, arg in enumerate(wargs) if isinstance(arg, int) and arg == 1}
+        constants.update({i: wargs[i] for i in self.fn.constexprs})
         # determine if we need to re-compile
         types_key = Kernel._types_key(*wargs, tensor_idxs=tensor_idxs)
         attr_key = frozenset(attributes.items())
@@ -597,12 +634,14 @@ class Launcher:
 
 
 class Autotuner:
-    def __init__(self, kernel, arg_names, configs, key):
+    def __init__(self, kernel, arg_names, configs, key, prune_configs_by=None):
         if not configs:
             self.configs = [Config(dict(), num_warps=4, num_stages=2)]
         else:
             self.configs = configs
+        self.arg_names = arg_names
         self.key_idx = [arg_names.index(k) for k in key]
+        self.prune_configs_by = prune_configs_by
         self.cache = dict()
         self.kernel = kernel
 
@@ -618,14 +657,21 @@ class Autotuner:
         # augment meta-parameters with tunable ones
         current = dict(meta, **config.meta)
         kernel_call = lambda: self.kernel(*args, num_warps=config.num_warps, num_stages=config.num_stages, **current)
-        return triton.testing.do_bench(kernel_call)
+        try:
+            return triton.testing.do_bench(kernel_call)
+        except OutOfResources:
+            return (float('inf'), float('inf'), float('inf'))
 
     def __call__(self, *args, **meta):
         if len(self.configs) > 1:
-            key = tuple([args[i] for i in self.key_idx])
+            # configurations tuned for one data-type are not reused for another
+            key = tuple([args[i] for i in self.key_idx]) + tuple(arg.dtype for arg in args if hasattr(arg, 'data_ptr'))
             if key not in self.cache:
+                configs = self.configs
+                if self.prune_configs_by:
+                    configs = self.prune_configs_by(configs, dict(zip(self.arg_names, args), **meta))
                 timings = {config: self._bench(*args, config=config, **meta) \
-                        for config in self.configs}
+                        for config in configs}
                 self.cache[key] = builtins.min(timings, key=timings.get)
             config = self.cache[key]
         else:
@@ -637,7 +683,11 @@ class JITFunction:
     def __init__(self, fn):
         self.fn = fn
         self.module = fn.__module__
-        self.arg_names = inspect.getfullargspec(fn).args
+        spec = inspect.getfullargspec(fn)
+        self.arg_names = spec.args
+        # arguments annotated with tl.constexpr must be known at compile-time
+        self.constexprs = [i for i, name in enumerate(self.arg_names) \
+                           if name in spec.annotations and spec.annotations[name] is triton.language.constexpr]
         self.cache = dict()
         self.kernel_decorators = []
         self.src = textwrap.dedent(inspect.getsource(fn))
@@ -656,6 +706,13 @@ class JITFunction:
 
     def __call__(self, *args, generator: CodeGenerator, **meta):
         try:
+            args = list(args)
+            for i in [i for i in self.constexprs if i < len(args)]:
+                try:
+                    args[i] = triton.language._constexpr_value(args[i])
+                except ValueError:
+                    raise ValueError(f'argument {self.arg_names[i]} of {self.fn.__name__} is annotated as constexpr '
+                                     'but its value is not a compile-time constant')
             lscope = generator.lscope.copy()
             values = generator.module.get_values().copy()
             ret = generator.visit_FunctionDef(self.parse().body[0], inline=True, arg_values=args)
@@ -691,10 +748,21 @@ class Config:
         self.num_stages = num_stages
 
 
-def autotune(configs, key):
+def autotune(configs, key, prune_configs_by=None):
+    """
+    Decorator for auto-tuning a :code:`triton.jit`'d function.
+
+    :param configs: the list of :code:`triton.Config` objects to benchmark
+    :type configs: list[triton.Config]
+    :param key: the names of the arguments whose change in value triggers a new tuning
+    :type key: list[str]
+    :param prune_configs_by: function called as :code:`prune_configs_by(configs, named_args)` before tuning,
+                             which returns the subset of :code:`configs` worth benchmarking for the given arguments
+    :type prune_configs_by: Callable, optional
+    """
     def decorator(fn):
         def wrapper(kernel):
-            return Autotuner(kernel, fn.arg_names, configs, key)
+            return Autotuner(kernel, fn.arg_names, configs, key, prune_configs_by)
 
         fn.kernel_decorators.append(wrapper)
         return fn
@@ -260,6 +260,79 @@ class block:
         return frontend.cast(self, dtype, builder)
 
 
+class block_ptr:
+    """
+    Pointer to a :code:`block_shape` tile of a strided N-D tensor, as returned by :code:`make_block_ptr`.
+    The shape, strides and offsets of the tile are kept separately so that pointers
+    and boundary masks are only materialized when the tile is loaded or stored.
+    """
+    fields = ['base', 'shape', 'strides', 'offsets']
+
+    def __init__(self, base, shape, strides, offsets, block_shape, order):
+        self.base = base
+        self.shape = list(shape)
+        self.strides = list(strides)
+        self.offsets = list(offsets)
+        self.block_shape = list(block_shape)
+        self.order = list(order)
+
+    def handles(self):
+        """
+        Returns the IR values of this block pointer, keyed by a name unique within the block pointer
+        """
+        ret = {'base': self.base}
+        for field in block_ptr.fields[1:]:
+            for i, x in enumerate(getattr(self, field)):
+                ret[f'{field}.{i}'] = x
+        return ret
+
+    def replace_handles(self, get_value):
+        """
+        Returns a copy of this block pointer whose IR values are given by :code:`get_value(key)`,
+        where :code:`key` is a key of :code:`self.handles()`
+        """
+        ret = block_ptr(get_value('base'), self.shape, self.strides, self.offsets, self.block_shape, self.order)
+        for field in block_ptr.fields[1:]:
+            setattr(ret, field, [get_value(f'{field}.{i}') for i in range(len(getattr(self, field)))])
+        return ret
+
+    def materialize(self, boundary_check, builder):
+        """
+        Returns the block of pointers to the tile, and the mask of its elements
+        that are in bounds along the dimensions in :code:`boundary_check`
+        """
+        rank = len(self.block_shape)
+        # the offsets of the tile are applied to the scalar base pointer, so that only
+        # loop-invariant ranges are scaled by the strides; dimensions are visited from the
+        # slowest to the fastest varying one, and unit strides are not multiplied by,
+        # so that the contiguity of the fastest varying range is visible to the compiler
+        ptr = self.base
+        for dim in reversed(self.order):
+            if not _is_constant(self.offsets[dim], 0):
+                ptr = frontend.add(ptr, _scale(self.offsets[dim], self.strides[dim], builder), builder)
+        ptrs, mask = ptr, None
+        for dim in reversed(self.order):
+            rng = frontend.arange(0, self.block_shape[dim], builder)
+            if rank > 1:
+                rng = frontend.reshape(rng, [self.block_shape[dim] if i == dim else 1 for i in range(rank)], builder)
+            ptrs = frontend.add(ptrs, _scale(rng, self.strides[dim], builder), builder)
+            if dim in boundary_check:
+                # `offs >= 0` is folded away by the compiler when the offset is provably non-negative
+                offs = rng if _is_constant(self.offsets[dim], 0) else frontend.add(rng, self.offsets[dim], builder)
+                in_bounds = frontend.and_(frontend.greater_equal(offs, 0, builder),
+                                          frontend.less_than(offs, self.shape[dim], builder), builder)
+                mask = in_bounds if mask is None else frontend.and_(mask, in_bounds, builder)
+        return ptrs, mask
+
+
+def _is_constant(x, value):
+    return isinstance(x.handle, ir.constant_int) and x.handle.value == value
+
+
+def _scale(x, stride, builder):
+    return x if _is_constant(stride, 1) else frontend.mul(x, stride, builder)
+
+
 # -----------------------
 # SPMD Programming Model
 # -----------------------
@@ -375,11 +448,12 @@ def dot(input, other, builder=None):
     Returns the matrix product of two blocks.
 
     The two blocks must be two dimensionals and have compatible inner dimensions.
+    The result is accumulated in :code:`int32` for :code:`int8` inputs and in :code:`float32` otherwise.
 
     :param input: The first block to be multiplied.
-    :type input: 2D block of scalar-type in {:code:`float16`, :code:`float32`}
+    :type input: 2D block of scalar-type in {:code:`int8`, :code:`float8`, :code:`float16`, :code:`float32`}
     :param other: The second block to be multiplied.
-    :type other: 2D block of scalar-type in {:code:`float16`, :code:`float32`}
+    :type other: 2D block of scalar-type in {:code:`int8`, :code:`float8`, :code:`float16`, :code:`float32`}
     """
     return frontend.dot(input, other, builder)
 
@@ -389,8 +463,72 @@ def dot(input, other, builder=None):
 # -----------------------
 
 
+def _to_block(x, builder):
+    return x if isinstance(x, block) else block(_to_ir(x, builder))
+
+
 @builtin
-def load(pointer, mask=None, other=None, builder=None):
+def make_block_ptr(base, shape, strides, offsets, block_shape, order, builder=None):
+    """
+    Returns a pointer to a :code:`block_shape` tile of the N-D tensor of given :code:`shape`
+    and :code:`strides` starting at :code:`base`. The tile starts at element :code:`offsets`
+    of the tensor and can be moved with :code:`advance`.
+
+    :param base: The pointer to the first element of the tensor
+    :type base: Block of dtype=triton.PointerDType
+    :param shape: The shape of the tensor, used for boundary checks
+    :type shape: list of int32
+    :param strides: The strides of the tensor, in elements
+    :type strides: list of int32
+    :param offsets: The offsets of the tile in the tensor
+    :type offsets: list of int32
+    :param block_shape: The shape of the tile. Its dimensions must be powers of two.
+    :type block_shape: list of int
+    :param order: The dimensions of the tensor, from fastest to slowest varying in memory
+    :type order: list of int
+    """
+    rank = len(block_shape)
+    if not (len(shape) == len(strides) == len(offsets) == len(order) == rank):
+        raise ValueError("Expected shape, strides, offsets, block_shape and order of the same length")
+    if sorted(order) != list(range(rank)):
+        raise ValueError(f"Expected order to be a permutation of {list(range(rank))}, got {list(order)}")
+    block_shape = [int(x.handle) if isinstance(x, block) else x for x in block_shape]
+    # sizes, strides and offsets are IR values so that block pointers can be carried across loop iterations
+    shape = [_to_block(x, builder) for x in shape]
+    strides = [_to_block(x, builder) for x in strides]
+    offsets = [_to_block(x, builder) for x in offsets]
+    return block_ptr(base, shape, strides, offsets, block_shape, order)
+
+
+@builtin
+def advance(base, offsets, builder=None):
+    """
+    Returns a copy of the block pointer :code:`base` whose tile is moved by :code:`offsets` elements.
+
+    :param base: The block pointer to advance
+    :type base: block_ptr
+    :param offsets: The number of elements to move the tile by, along each dimension
+    :type offsets: list of int32
+    """
+    if len(offsets) != len(base.offsets):
+        raise ValueError(f"Expected {len(base.offsets)} offsets, got {len(offsets)}")
+    offsets = [frontend.add(x, y, builder) for x, y in zip(base.offsets, offsets)]
+    return block_ptr(base.base, base.shape, base.strides, offsets, base.block_shape, base.order)
+
+
+def _block_ptr_args(pointer, mask, other, boundary_check, padding_option, builder):
+    if mask is not None or other is not None:
+        raise ValueError("`mask` and `other` cannot be used with block pointers; use `boundary_check` instead")
+    ptrs, mask = pointer.materialize(boundary_check, builder)
+    if padding_option not in ["", "zero", "nan"]:
+        raise ValueError(f"Padding option {padding_option} is not supported")
+    if padding_option and mask is not None:
+        other = {'zero': 0., 'nan': float('nan')}[padding_option]
+    return ptrs, mask, other
+
+
+@builtin
+def load(pointer, mask=None, other=None, boundary_check=(), padding_option="", cache_modifier="", eviction_policy="", builder=None):
     """
     Return a block of data whose values are, elementwise, loaded from memory at location defined by :code:`pointer`.
 
@@ -398,31 +536,58 @@ def load(pointer, mask=None, other=None, builder=None):
 
     :code:`other` is implicitly typecast to :code:`pointer.dtype.element_ty`.
 
+    :code:`pointer` can also be a block pointer created by :code:`make_block_ptr`, in which case
+    out-of-bounds accesses are masked along the dimensions in :code:`boundary_check`.
+
     :param pointer: Pointers to the data to be loaded.
-    :type pointer: Block of dtype=triton.PointerDType
+    :type pointer: Block of dtype=triton.PointerDType, or block_ptr
     :param mask: if mask[idx] is false, do not load the data at address :code:`pointer[idx]`.
     :type mask: Block of triton.int1, optional
     :param other: if mask[idx] is false, return other[idx]
     :type other: Block, optional
+    :param boundary_check: the dimensions of a block pointer along which bounds are checked
+    :type boundary_check: tuple of ints, optional
+    :param padding_option: the value of out-of-bounds elements of a block pointer ("zero" or "nan").
+                           They are undefined by default.
+    :type padding_option: str, optional
+    :param cache_modifier: changes the cache operator of the underlying PTX instruction (".ca", ".cg" or ".cs")
+    :type cache_modifier: str, optional
+    :param eviction_policy: changes the L1 eviction priority of the loaded data ("evict_first" or "evict_last").
+                            It cannot be combined with :code:`cache_modifier`.
+    :type eviction_policy: str, optional
     """
-    return frontend.load(pointer, mask, other, builder)
+    if isinstance(pointer, block_ptr):
+        pointer, mask, other = _block_ptr_args(pointer, mask, other, boundary_check, padding_option, builder)
+    return frontend.load(pointer, mask, other, cache_modifier, eviction_policy, builder)
 
 
 @builtin
-def store(pointer, value, mask=None, builder=None):
+def store(pointer, value, mask=None, boundary_check=(), cache_modifier="", eviction_policy="", builder=None):
     """
     Stores :code:`value` block of elements in memory, element-wise, at the memory locations specified by :code:`pointer`. 
 
     :code:`value` is implicitly broadcast to :code:`pointer.shape` and typecast to :code:`pointer.dtype.element_ty`.
 
+    :code:`pointer` can also be a block pointer created by :code:`make_block_ptr`, in which case
+    out-of-bounds elements are not stored along the dimensions in :code:`boundary_check`.
+
     :param pointer: The memory locations where the elements of :code:`value` are stored.
-    :type pointer: Block of dtype=triton.PointerDType
+    :type pointer: Block of dtype=triton.PointerDType, or block_ptr
     :param value: The block of elements to be stored.
     :type value: Block
     :param mask: If mask[idx] is false, do not store :code:`value[idx]` at :code:`pointer[idx]`.
     :type mask: Block of triton.int1, optional
+    :param boundary_check: the dimensions of a block pointer along which bounds are checked
+    :type boundary_check: tuple of ints, optional
+    :param cache_modifier: changes the cache operator of the underlying PTX instruction (".wb", ".cg", ".cs" or ".wt")
+    :type cache_modifier: str, optional
+    :param eviction_policy: changes the L1 eviction priority of the stored data ("evict_first" or "evict_last").
+                            It cannot be combined with :code:`cache_modifier`.
+    :type eviction_policy: str, optional
     """
-    return frontend.store(pointer, value, mask, builder)
+    if isinstance(pointer, block_ptr):
+        pointer, mask, _ = _block_ptr_args(pointer, mask, None, boundary_check, "", builder)
+    return frontend.store(pointer, value, mask, cache_modifier, eviction_policy, builder)
 
 
 @builtin
@@ -558,43 +723,324 @@ def sqrt(x, builder=None):
     return frontend.sqrt(x, builder)
 
 
+@builtin
+def sin(x, builder=None):
+    """
+    Computes the element-wise sine of :code:`x`
+
+    :param x: the input values
+    :type x: Block
+    """
+    return frontend.sin(x, builder)
+
+
+@builtin
+def cos(x, builder=None):
+    """
+    Computes the element-wise cosine of :code:`x`
+
+    :param x: the input values
+    :type x: Block
+    """
+    return frontend.cos(x, builder)
+
+
+@builtin
+def tanh(x, builder=None):
+    """
+    Computes the element-wise hyperbolic tangent of :code:`x`
+
+    :param x: the input values
+    :type x: Block
+    """
+    return frontend.tanh(x, builder)
+
+
+@builtin
+def erf(x, builder=None):
+    """
+    Computes the element-wise error function of :code:`x`
+
+    :param x: the input values
+    :type x: Block
+    """
+    return frontend.erf(x, builder)
+
+
+@builtin
+def rsqrt(x, builder=None):
+    """
+    Computes the element-wise inverse square root of :code:`x`
+
+    :param x: the input values
+    :type x: Block
+    """
+    return frontend.rsqrt(x, builder)
+
+
+@builtin
+def pow(x, y, builder=None):
+    """
+    Computes the element-wise power of :code:`x` raised to :code:`y`.
+    Negative bases are only supported for integer-valued exponents.
+
+    :param x: the base values
+    :type x: Block
+    :param y: the exponent values
+    :type y: Block
+    """
+    return frontend.pow(x, y, builder)
+
+
+@builtin
+def umulhi(x, y, builder=None):
+    """
+    Returns the most significant 32 bits of the product of :code:`x` and :code:`y`,
+    both interpreted as unsigned 32-bit integers.
+
+    :param x: the first input block
+    :type x: Block of int32
+    :param y: the second input block
+    :type y: Block of int32
+    """
+    return frontend.umulhi(x, y, builder)
+
+
 # -----------------------
 # Reductions
 # -----------------------
 
 
+def _reduce_axes(input, axis):
+    # normalizes `axis` into distinct non-negative axes, in decreasing order
+    # so that reducing them one after the other keeps the remaining ones valid
+    rank = len(input.shape)
+    axes = [int(_constexpr_value(a)) for a in (axis if isinstance(axis, (tuple, list)) else [axis])]
+    axes = [a + rank if a < 0 else a for a in axes]
+    if len(axes) == 0 or len(set(axes)) != len(axes) or any(a < 0 or a >= rank for a in axes):
+        raise ValueError(f"invalid reduction axes {axis} for a block of rank {rank}")
+    return sorted(axes, reverse=True)
+
+
+def _reduce(fn, input, axis, keep_dims, builder):
+    axes = _reduce_axes(input, axis)
+    ret = input
+    for a in axes:
+        ret = fn(ret, a, builder)
+    if not keep_dims:
+        return ret
+    # reduced axes are kept with size one, so that the result broadcasts against `input`
+    shape = [1 if d in axes else s for d, s in enumerate(input.shape)]
+    if not ret.handle.type.is_block():
+        return frontend.broadcast(ret, shape, builder)
+    return frontend.reshape(ret, shape, builder)
+
+
+def _arg_reduce(fn, input, axis, keep_dims, builder):
+    if isinstance(axis, (tuple, list)):
+        raise ValueError("index-carrying reductions only support a single axis")
+    return _reduce(fn, input, axis, keep_dims, builder)
+
+
 @builtin
-def max(input, axis, builder=None):
+def max(input, axis, keep_dims=False, builder=None):
     """
     Returns the maximum value of all elements in the :code:`input` block along the provided :code:`axis`
 
     :param input: the input values
-    :param axis: the dimension along which the reduction should be done
+    :param axis: the dimension (or tuple of dimensions) along which the reduction should be done
+    :param keep_dims: if true, keep the reduced dimensions with size one
     """
-    return frontend.max(input, axis, builder)
+    return _reduce(frontend.max, input, axis, keep_dims, builder)
 
 
 @builtin
-def min(input, axis, builder=None):
+def min(input, axis, keep_dims=False, builder=None):
     """
     Returns the minimum value of all elements in the :code:`input` block along the provided :code:`axis`
 
     :param input: the input values
-    :param axis: the dimension along which the reduction should be done
+    :param axis: the dimension (or tuple of dimensions) along which the reduction should be done
+    :param keep_dims: if true, keep the reduced dimensions with size one
     """
-    return frontend.min(input, axis, builder)
+    return _reduce(frontend.min, input, axis, keep_dims, builder)
 
 
 @builtin
-def sum(input, axis, builder=None):
+def sum(input, axis, keep_dims=False, builder=None):
     """
     Returns the sum of all elements in the :code:`input` block along the provided :code:`axis`
 
+    :param input: the input values
+    :param axis: the dimension (or tuple of dimensions) along which the reduction should be done
+    :param keep_dims: if true, keep the reduced dimensions with size one
+    """
+    return _reduce(frontend.sum, input, axis, keep_dims, builder)
+
+
+@builtin
+def argmin(input, axis, keep_dims=False, builder=None):
+    """
+    Returns the index of the minimum value of all elements in the :code:`input` block along the provided :code:`axis`.
+    Ties are broken in favor of the smallest index.
+
     :param input: the input values
     :param axis: the dimension along which the reduction should be done
+    :param keep_dims: if true, keep the reduced dimension with size one
     """
+    return _arg_reduce(frontend.argmin, input, axis, keep_dims, builder)
 
-    return frontend.sum(input, axis, builder)
+
+@builtin
+def argmax(input, axis, keep_dims=False, builder=None):
+    """
+    Returns the index of the maximum value of all elements in the :code:`input` block along the provided :code:`axis`.
+    Ties are broken in favor of the smallest index.
+
+    :param input: the input values
+    :param axis: the dimension along which the reduction should be done
+    :param keep_dims: if true, keep the reduced dimension with size one
+    """
+    return _arg_reduce(frontend.argmax, input, axis, keep_dims, builder)
+
+
+# -----------------------
+# Scans
+# -----------------------
+
+
+@builtin
+def cumsum(input, axis, exclusive=False, builder=None):
+    """
+    Returns the cumulative sum of the elements in the :code:`input` block along the provided :code:`axis`
+
+    :param input: the input values
+    :param axis: the dimension along which the scan should be done
+    :param exclusive: if true, the i-th output element does not include the i-th input element
+    """
+    return frontend.cumsum(input, axis, exclusive, builder)
+
+
+@builtin
+def cummax(input, axis, exclusive=False, builder=None):
+    """
+    Returns the cumulative maximum of the elements in the :code:`input` block along the provided :code:`axis`
+
+    :param input: the input values
+    :param axis: the dimension along which the scan should be done
+    :param exclusive: if true, the i-th output element does not include the i-th input element
+    """
+    return frontend.cummax(input, axis, exclusive, builder)
+
+
+@builtin
+def cummin(input, axis, exclusive=False, builder=None):
+    """
+    Returns the cumulative minimum of the elements in the :code:`input` block along the provided :code:`axis`
+
+    :param input: the input values
+    :param axis: the dimension along which the scan should be done
+    :param exclusive: if true, the i-th output element does not include the i-th input element
+    """
+    return frontend.cummin(input, axis, exclusive, builder)
+
+
+@builtin
+def associative_scan(input, axis, combine_fn, builder=None):
+    """
+    Returns the inclusive scan of the elements in the :code:`input` block along the provided :code:`axis`,
+    using :code:`combine_fn` to combine elements.
+
+    :param input: the input values
+    :param axis: the dimension along which the scan should be done
+    :param combine_fn: an associative function of two scalars without control flow, typically a :code:`@triton.jit` function
+    """
+    # trace `combine_fn` on scalar placeholders into a block that does not
+    # belong to the kernel; it is inlined wherever the scan combines elements
+    scalar_ty = input.handle.type.scalar
+    current = builder.get_insert_block()
+    combine = ir.basic_block.create(builder.context, "combine", None)
+    builder.set_insert_block(combine)
+    lhs = ir.argument.create(scalar_ty, "lhs", None, 0)
+    rhs = ir.argument.create(scalar_ty, "rhs", None, 1)
+    res = combine_fn(block(lhs), block(rhs))
+    builder.set_insert_block(current)
+    return frontend.associative_scan(input, axis, combine, lhs, rhs, res, builder)
+
+
+# -----------------------
+# Compile-Time Evaluation
+# -----------------------
+
+
+class constexpr:
+    """
+    Annotation for arguments of :code:`triton.jit`'d functions (and for local assignments) whose value
+    must be known at compile-time. The value stays a Python object, so that branches and block
+    shapes that depend on it are folded away by the front-end:
+
+    .. highlight:: python
+    .. code-block:: python
+
+        @triton.jit
+        def _scale(x, SQUARE: tl.constexpr):
+            if SQUARE:
+                return x * x
+            return x
+    """
+    pass
+
+
+def _constexpr_value(x):
+    """
+    Returns the Python value of :code:`x`, or raises a :code:`ValueError` if :code:`x` is not known
+    at compile-time. Scalar IR constants (e.g., Python values previously assigned to a variable)
+    are folded back into Python values.
+    """
+    if isinstance(x, block_ptr):
+        raise ValueError("block pointers are not compile-time constants")
+    if not isinstance(x, block):
+        return x
+    handle = x.handle
+    if not handle.type.is_block():
+        if isinstance(handle, ir.constant_int):
+            if handle.type.is_int1():
+                return bool(handle.value)
+            bits = {int8: 8, int16: 16, int32: 32, int64: 64}[x.dtype]
+            value = handle.value & ((1 << bits) - 1)
+            return value - (1 << bits) if value >> (bits - 1) else value
+        if isinstance(handle, ir.constant_float):
+            return handle.value
+    raise ValueError("value is not a compile-time constant")
+
+
+@builtin
+def static_assert(cond, msg="", builder=None):
+    """
+    Asserts that :code:`cond` holds when the kernel is compiled. Unlike :code:`assert`, this
+    raises a :code:`CompilationError` for the offending variant instead of generating any code.
+
+    :param cond: the condition to check; it must be known at compile-time.
+    :param msg: the message to report if :code:`cond` does not hold.
+    :type msg: str
+    """
+    if not _constexpr_value(cond):
+        raise AssertionError(f"static assertion failed: {msg}" if msg else "static assertion failed")
+
+
+@builtin
+def static_print(*values, builder=None):
+    """
+    Prints :code:`values` when the kernel is compiled. Compile-time constants are printed
+    as their Python value, other blocks as their IR type.
+    """
+    def _str(x):
+        try:
+            return str(_constexpr_value(x))
+        except ValueError:
+            return str(x.handle.type) if isinstance(x, block) else str(x)
+
+    print(*[_str(x) for x in values])
 
 
 # -----------------------
@@ -657,6 +1103,18 @@ def sigmoid(x):
     return 1 / (1 + triton.language.exp(-x))
 
 
+@triton.jit
+def gelu(x):
+    """
+    Computes the element-wise GELU of :code:`x`, i.e., :code:`x * Phi(x)` where :code:`Phi`
+    is the cumulative distribution function of the standard normal distribution.
+
+    :param x: the input block
+    :type x: Block
+    """
+    return 0.5 * x * (1 + triton.language.erf(x * 0.7071067811865476))
+
+
 @triton.jit
 def softmax(x):
     """
@@ -680,3 +1138,141 @@ def ravel(x):
     :type x: Block
     """
     return triton.language.reshape(x, [x.type.numel])
+
+
+# -----------------------
+# Random Number Generation
+# -----------------------
+
+# Philox4x32 constants, written as signed 32-bit integers:
+# multipliers 0xD2511F53, 0xCD9E8D57 and Weyl increments 0x9E3779B9, 0xBB67AE85
+
+
+@triton.jit
+def _philox_round(c0, c1, c2, c3, k0, k1):
+    _c0 = c0
+    _c2 = c2
+    c0 = triton.language.umulhi(-845247145, _c2) ^ c1 ^ k0
+    c2 = triton.language.umulhi(-766435501, _c0) ^ c3 ^ k1
+    c1 = -845247145 * _c2
+    c3 = -766435501 * _c0
+    return c0, c1, c2, c3
+
+
+@triton.jit
+def philox(seed, c0, c1, c2, c3):
+    """
+    Runs 10 rounds of the Philox4x32 counter-based generator on the counter
+    :code:`(c0, c1, c2, c3)` keyed by :code:`seed`. The output only depends on its
+    inputs, so the same random numbers can be regenerated at any time (e.g., in a
+    backward pass) instead of being stored.
+
+    :param seed: the key of the generator
+    :type seed: int32
+    :param c0, c1, c2, c3: the counter
+    :type c0, c1, c2, c3: Block of int32
+    """
+    # keys are materialized as int32 blocks so that their increments wrap around
+    # (seeds equal to 1 are specialized into Python integers by the JIT)
+    z = c0 * 0
+    k0 = seed + z
+    k1 = z
+    c0, c1, c2, c3 = triton.language._philox_round(c0, c1, c2, c3, k0, k1)
+    k0 = k0 + -1640531527
+    k1 = k1 + -1150833019
+    c0, c1, c2, c3 = triton.language._philox_round(c0, c1, c2, c3, k0, k1)
+    k0 = k0 + -1640531527
+    k1 = k1 + -1150833019
+    c0, c1, c2, c3 = triton.language._philox_round(c0, c1, c2, c3, k0, k1)
+    k0 = k0 + -1640531527
+    k1 = k1 + -1150833019
+    c0, c1, c2, c3 = triton.language._philox_round(c0, c1, c2, c3, k0, k1)
+    k0 = k0 + -1640531527
+    k1 = k1 + -1150833019
+    c0, c1, c2, c3 = triton.language._philox_round(c0, c1, c2, c3, k0, k1)
+    k0 = k0 + -1640531527
+    k1 = k1 + -1150833019
+    c0, c1, c2, c3 = triton.language._philox_round(c0, c1, c2, c3, k0, k1)
+    k0 = k0 + -1640531527
+    k1 = k1 + -1150833019
+    c0, c1, c2, c3 = triton.language._philox_round(c0, c1, c2, c3, k0, k1)
+    k0 = k0 + -1640531527
+    k1 = k1 + -1150833019
+    c0, c1, c2, c3 = triton.language._philox_round(c0, c1, c2, c3, k0, k1)
+    k0 = k0 + -1640531527
+    k1 = k1 + -1150833019
+    c0, c1, c2, c3 = triton.language._philox_round(c0, c1, c2, c3, k0, k1)
+    k0 = k0 + -1640531527
+    k1 = k1 + -1150833019
+    c0, c1, c2, c3 = triton.language._philox_round(c0, c1, c2, c3, k0, k1)
+    return c0, c1, c2, c3
+
+
+@triton.jit
+def randint4x(seed, offset):
+    """
+    Given a :code:`seed` scalar and an :code:`offset` block, returns four
+    blocks of random :code:`int32`.
+
+    :param seed: the seed for generating random numbers
+    :param offset: the offsets to generate random numbers for
+    """
+    z = offset * 0
+    return triton.language.philox(seed, offset, z, z, z)
+
+
+@triton.jit
+def randint(seed, offset):
+    """
+    Given a :code:`seed` scalar and an :code:`offset` block, returns a single
+    block of random :code:`int32`.
+
+    :param seed: the seed for generating random numbers
+    :param offset: the offsets to generate random numbers for
+    """
+    r0, r1, r2, r3 = triton.language.randint4x(seed, offset)
+    return r0
+
+
+@triton.jit
+def uint32_to_uniform_float(x):
+    """
+    Maps the bits of a block of :code:`int32` to uniformly distributed :code:`float32` in [0, 1).
+
+    :param x: the input block
+    :type x: Block of int32
+    """
+    # keep the 24 most significant bits, which are exactly representable in float32
+    return (x >> 8).to(triton.language.float32) * 5.960464477539063e-08
+
+
+@triton.jit
+def rand(seed, offset):
+    """
+    Given a :code:`seed` scalar and an :code:`offset` block,
+    returns a block of random :code:`float32` in :math:`U(0, 1)`
+
+    :param seed: the seed for generating random numbers
+    :param offset: the offsets to generate random numbers for
+    """
+    source = triton.language.randint(seed, offset)
+    return triton.language.uint32_to_uniform_float(source)
+
+
+@triton.jit
+def randn(seed, offset):
+    """
+    Given a :code:`seed` scalar and an :code:`offset` block,
+    returns a block of random :code:`float32` in :math:`\\mathcal{N}(0, 1)`
+
+    :param seed: the seed for generating random numbers
+    :param offset: the offsets to generate random numbers for
+    """
+    r0, r1, r2, r3 = triton.language.randint4x(seed, offset)
+    u1 = triton.language.uint32_to_uniform_float(r0)
+    u2 = triton.language.uint32_to_uniform_float(r1)
+    # Box-Muller transform; u1 is kept away from zero so that log(u1) is finite
+    u1 = triton.language.maximum(u1, 1.0e-7)
+    th = 6.283185307179586 * u2
+    r = triton.language.sqrt(-2.0 * triton.language.log(u1))
+    return r * triton.language.cos(th)
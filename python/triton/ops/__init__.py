@@ -1,4 +1,4 @@
 #from .conv import _conv, conv
-from .matmul import _matmul, matmul
+from .matmul import _matmul, matmul, grouped_matmul
 from .cross_entropy import _cross_entropy, cross_entropy
 from . import blocksparse
\ No newline at end of file
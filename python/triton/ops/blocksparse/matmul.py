@@ -251,6 +251,19 @@ class _matmul(torch.autograd.Function):
             _matmul.locks[dev] = torch.zeros(size, dtype=torch.int32, device=dev)
         return _matmul.locks[dev]
 
+    @staticmethod
+    def get_output(shape, dtype, device, out):
+        # returns `out` when provided by the caller, so that buffers can be reused
+        # across calls (e.g., under CUDA graphs), or a new uninitialized tensor
+        if out is None:
+            return torch.empty(shape, dtype=dtype, device=device)
+        if out.shape != shape or out.dtype != dtype or out.device != device:
+            raise ValueError(f"Expected output of shape {tuple(shape)}, type {dtype} on device {device}; "
+                             f"got shape {tuple(out.shape)}, type {out.dtype} on device {out.device}")
+        if not out.is_contiguous():
+            raise ValueError("Expected a contiguous output")
+        return out
+
     ##########################
     # SPARSE = DENSE x DENSE #
     ##########################
@@ -272,7 +285,7 @@ class _matmul(torch.autograd.Function):
         return luts, None, widths, packs
 
     @staticmethod
-    def _sdd_matmul(a, b, trans_a, trans_b, trans_c, spdims, block, luts, num_locks, widths, packs):
+    def _sdd_matmul(a, b, trans_a, trans_b, trans_c, spdims, block, luts, num_locks, widths, packs, out=None):
         # (A * B)^T = (B^T * A^T)
         if trans_c:
             a, b = b, a
@@ -295,7 +308,10 @@ class _matmul(torch.autograd.Function):
 
         # create kernel
         total_width = sum([width * pack * pack for width, pack in zip(widths, packs)])
-        c = torch.zeros((batch_size, total_width, block, block), dtype=dtype, device=device)
+        # every non-zero block is written exactly once, so that `c` needs not be zero-initialized
+        c = _matmul.get_output((batch_size, total_width, block, block), dtype, device, out)
+        if not c.is_contiguous():
+            raise ValueError("Output of SDD must be contiguous")
         for lut, width, pack in zip(luts, widths, packs):
             num_lock = 1
             meta = {'TM': block * pack, 'TN': block * pack, 'BLOCK': block, 'TK': 32, 'TZ': 1,
@@ -433,7 +449,7 @@ class _matmul(torch.autograd.Function):
         return lut, num_locks, width, None
 
     @staticmethod
-    def _dds_matmul(a, b, trans_a, trans_b, trans_c, spdims, block, lut, num_locks, width, packs):
+    def _dds_matmul(a, b, trans_a, trans_b, trans_c, spdims, block, lut, num_locks, width, packs, out=None):
         # shapes / dtypes
         AS0 = a.size(0)
         AS1 = a.size(1)
@@ -449,7 +465,7 @@ class _matmul(torch.autograd.Function):
         CS2 = BS2 if trans_c else AS2
         CS3 = AS2 if trans_c else BS2
         locks = _matmul.get_locks(2 * AS0 * AS2 // 32 * num_locks, a.device)
-        c = torch.empty((CS0, CS1, CS2, CS3), dtype=dtype, device=a.device)
+        c = _matmul.get_output((CS0, CS1, CS2, CS3), dtype, a.device, out)
         grid = lambda meta: [width, triton.cdiv(AS2, meta['TM']), AS0]
         _kernel[grid](
             a,
@@ -480,7 +496,7 @@ class _matmul(torch.autograd.Function):
         return c
 
     @staticmethod
-    def _dsd_matmul(a, b, trans_a, trans_b, trans_c, spdims, block, lut, num_locks, width, packs):
+    def _dsd_matmul(a, b, trans_a, trans_b, trans_c, spdims, block, lut, num_locks, width, packs, out=None):
         # shapes / dtypes
         AS1 = block * spdims[2 if trans_a else 1]
         BS0 = b.size(0)
@@ -496,7 +512,7 @@ class _matmul(torch.autograd.Function):
         CS2 = BS3 if trans_c else AS1
         CS3 = AS1 if trans_c else BS3
         locks = _matmul.get_locks(2 * BS0 * BS3 // 32 * num_locks, a.device)
-        c = torch.empty((CS0, CS1, CS2, CS3), dtype=dtype, device=a.device)
+        c = _matmul.get_output((CS0, CS1, CS2, CS3), dtype, a.device, out)
         grid = lambda meta: [width, triton.cdiv(BS3, meta['TN']), BS0]
         _kernel[grid](
             a,
@@ -531,9 +547,11 @@ class _matmul(torch.autograd.Function):
     @staticmethod
     def forward(
         ctx, a, b, trans_a, trans_b, trans_c, mode, spdims, block, c_lut, c_num_locks, c_width, c_packs, da_lut, da_num_locks,
-        da_width, da_packs, db_lut, db_num_locks, db_width, db_packs
+        da_width, da_packs, db_lut, db_num_locks, db_width, db_packs, out=None
     ):
-        c = _matmul.fn[mode](a, b, trans_a, trans_b, trans_c, spdims, block, c_lut, c_num_locks, c_width, c_packs)
+        c = _matmul.fn[mode](a, b, trans_a, trans_b, trans_c, spdims, block, c_lut, c_num_locks, c_width, c_packs, out)
+        if out is not None:
+            ctx.mark_dirty(out)
         # save for backward
         ctx.save_for_backward(a, b)
         ctx.da_num_locks = da_num_locks
@@ -645,7 +663,7 @@ class matmul:
         self.layout = layout
         self.spdims = layout.shape
 
-    def __call__(self, a, b):
+    def __call__(self, a, b, out=None):
         c_lut, c_num_locks, c_width, c_packs,\
         da_lut, da_num_locks, da_width, da_packs,\
         db_lut, db_num_locks, db_width, db_packs = self.make_lut(a.dtype, a.device)
@@ -654,11 +672,14 @@ class matmul:
         # and potential illegal memory accesses
         original_dims = max(a.ndim, b.ndim)
         a, b = self._validate_inputs(a, b)
+        # the output, if provided, is padded with the same leading singleton dimensions as the inputs
+        if out is not None:
+            out = out[(None, ) * (4 - out.ndim)]
 
         # execute
         c = _matmul.apply(
             a, b, self.trans_a, self.trans_b, False, self.mode, self.spdims, self.block, c_lut, c_num_locks, c_width,
-            c_packs, da_lut, da_num_locks, da_width, da_packs, db_lut, db_num_locks, db_width, db_packs
+            c_packs, da_lut, da_num_locks, da_width, da_packs, db_lut, db_num_locks, db_width, db_packs, out
         )
         # This removes any leading singleton dimensions we may have added to the tensor that weren't in the input
         dims_to_trim = c.ndim - original_dims
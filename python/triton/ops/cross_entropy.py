@@ -36,14 +36,12 @@ def _forward(LOGITS, PROBS, IDX, LOSS, N, **meta):
     WRIT_PROBS = PROBS + row * N + cols
     READ_PROBS = PROBS + row * N + idx
     # write-back negative log-probs
-    logits = tl.load(LOGITS, mask=cols < N, other=-float('inf'))
+    # logits are only read once: stream them to avoid evicting other data from L2
+    logits = tl.load(LOGITS, mask=cols < N, other=-float('inf'), cache_modifier='.cs')
     logits = logits.to(tl.float32)
     logits = logits - tl.max(logits, 0)
     probs = tl.log(tl.sum(tl.exp(logits), 0)) - logits
     tl.store(WRIT_PROBS, probs, mask=cols < N)
-    # There is a bug in the compiler, which fails to insert a barrier here.
-    # We add it explicitly for now. Will be fixed soon.
-    tl.debug_barrier()
     # write-back loss
     probs = tl.load(READ_PROBS)
     tl.store(LOSS + row, probs)
@@ -72,14 +70,23 @@ def _backward(PROBS, IDX, DPROBS, N, **meta):
 
 class _cross_entropy(torch.autograd.Function):
     @classmethod
-    def forward(cls, ctx, logits, indices):
+    def forward(cls, ctx, logits, indices, out=None):
         # make sure we can use triton
         assert (indices.dtype == torch.int64), "Indices are expected to be of type long."
         # make kernel
         device, dtype = logits.device, logits.dtype
         n_cols = logits.shape[-1]
         # run the kernel
-        result = torch.empty_like(indices, dtype=dtype, device=device)
+        if out is None:
+            result = torch.empty_like(indices, dtype=dtype, device=device)
+        else:
+            if out.shape != indices.shape or out.dtype != dtype or out.device != device:
+                raise ValueError(f"Expected output of shape {tuple(indices.shape)}, type {dtype} on device {device}; "
+                                 f"got shape {tuple(out.shape)}, type {out.dtype} on device {out.device}")
+            if not out.is_contiguous():
+                raise ValueError("Expected a contiguous output")
+            result = out
+            ctx.mark_dirty(out)
         neg_logprobs = torch.empty_like(logits, dtype=dtype, device=device)
         grid = lambda opt: (logits.numel() // n_cols, )
         _forward[grid](logits, neg_logprobs, indices, result, n_cols)
@@ -103,7 +110,16 @@ class _cross_entropy(torch.autograd.Function):
         # neg_logprobs will be modified in place to become our gradient:
         grid = lambda opt: (neg_logprobs.numel() // n_cols, )
         _backward[grid](neg_logprobs, indices, dneg_logprobs, n_cols)
-        return neg_logprobs, None
+        return neg_logprobs, None, None
 
 
-cross_entropy = _cross_entropy.apply
\ No newline at end of file
+def cross_entropy(logits, indices, out=None):
+    """
+    Computes the negative log-likelihood of :code:`indices` under :code:`softmax(logits)`,
+    along the last dimension of :code:`logits`.
+
+    :param logits: the un-normalized log-probabilities, of shape (..., N)
+    :param indices: the int64 target classes, of shape (...)
+    :param out: an optional pre-allocated contiguous output of shape (...), written in-place
+    """
+    return _cross_entropy.apply(logits, indices, out)
\ No newline at end of file
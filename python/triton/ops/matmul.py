@@ -1,118 +1,740 @@
 import torch
 import triton.language as tl
 import triton
+import triton._C.libtriton as libtriton
+
+
+def next_power_of_2(n):
+    n -= 1
+    n |= n >> 1
+    n |= n >> 2
+    n |= n >> 4
+    n |= n >> 8
+    n |= n >> 16
+    n += 1
+    return n
+
+
+# BLOCK_K of the configuration space of each supported input data-type,
+# so that rows of BLOCK_K elements span 64 to 128 bytes
+_block_k = {torch.float16: [32, 64], torch.bfloat16: [32, 64], torch.float32: [16, 32]}
+
+
+def get_configs_compute_bound(block_k=32):
+    configs = []
+    for block_m, block_n, num_stages, num_warps in [
+        (128, 256, 3, 8), (256, 128, 3, 8), (256, 64, 4, 4), (64, 256, 4, 4),
+        (128, 128, 4, 4), (128, 128, 2, 4), (128, 64, 4, 4), (64, 128, 4, 4),
+        (128, 32, 4, 4), (64, 32, 5, 2), (64, 64, 4, 2),
+    ]:
+        meta = {'BLOCK_M': block_m, 'BLOCK_N': block_n, 'BLOCK_K': block_k, 'SPLIT_K': 1, 'GROUP_M': 8, 'STREAM_K': 0}
+        configs.append(triton.Config(meta, num_stages=num_stages, num_warps=num_warps))
+    return configs
+
+
+def get_configs_io_bound(block_ks=(32, 64)):
+    # small BLOCK_M for decode-style and skinny problems;
+    # split-k recovers parallelism when there are few output tiles
+    configs = []
+    for num_stages in [2, 3, 4]:
+        for block_m in [16, 32]:
+            for block_k in block_ks:
+                for block_n in [32, 64, 128, 256]:
+                    num_warps = 2 if block_n <= 64 else 4
+                    for split_k in [1, 2, 4, 8]:
+                        meta = {'BLOCK_M': block_m, 'BLOCK_N': block_n, 'BLOCK_K': block_k, 'SPLIT_K': split_k, 'GROUP_M': 8,
+                                'STREAM_K': 0}
+                        configs.append(triton.Config(meta, num_stages=num_stages, num_warps=num_warps))
+    return configs
+
+
+def get_configs_stream_k(block_k=32):
+    # persistent programs, STREAM_K per SM, for tile counts that fill the last wave poorly
+    configs = []
+    for block_m, block_n, num_stages, num_warps in [
+        (128, 256, 3, 8), (128, 128, 4, 4), (128, 64, 4, 4), (64, 128, 4, 4),
+    ]:
+        meta = {'BLOCK_M': block_m, 'BLOCK_N': block_n, 'BLOCK_K': block_k, 'SPLIT_K': 1, 'GROUP_M': 8, 'STREAM_K': 1}
+        configs.append(triton.Config(meta, num_stages=num_stages, num_warps=num_warps))
+    return configs
+
+
+def get_configs(dtype):
+    """
+    Returns the configuration space of inputs of type :code:`dtype`.
+    """
+    block_ks = _block_k[dtype]
+    return get_configs_compute_bound(block_ks[0]) + get_configs_io_bound(block_ks) + get_configs_stream_k(block_ks[0])
+
+
+def get_all_configs():
+    # union of the configuration spaces of all data-types, without duplicates
+    configs = dict()
+    for dtype in _block_k:
+        for c in get_configs(dtype):
+            configs.setdefault((tuple(sorted(c.meta.items())), c.num_warps, c.num_stages), c)
+    return list(configs.values())
+
+
+def prune_configs(configs, named_args, top_k=10):
+    """
+    Keeps at most :code:`top_k` configurations of :code:`configs` that are plausible for the problem
+    described by :code:`named_args`, so that the cost of auto-tuning stays bounded.
+    """
+    M, N, K = named_args['M'], named_args['N'], named_args['K']
+    Z = named_args['Z0'] * named_args['Z1']
+    device = named_args['A'].device
+    dtype = named_args['A'].dtype
+    dtsize = named_args['A'].element_size()
+    max_shared = libtriton.triton.driver.cu_device(device.index, False).max_shared_memory()
+    num_sms = torch.cuda.get_device_properties(device).multi_processor_count
+    # tiles larger than the problem (rounded up to a power of two) only compute padding
+    max_m, max_n = max(16, next_power_of_2(M)), max(32, next_power_of_2(N))
+    pruned = []
+    for config in configs:
+        BLOCK_M, BLOCK_N, BLOCK_K = [config.meta[x] for x in ['BLOCK_M', 'BLOCK_N', 'BLOCK_K']]
+        SPLIT_K, STREAM_K = config.meta['SPLIT_K'], config.meta['STREAM_K']
+        tiles = triton.cdiv(M, BLOCK_M) * triton.cdiv(N, BLOCK_N) * Z
+        # each data-type has its own configuration space
+        if BLOCK_K not in _block_k[dtype]:
+            continue
+        if BLOCK_M > max_m or BLOCK_N > max_n or BLOCK_K > max(32, next_power_of_2(K // SPLIT_K)):
+            continue
+        # the pipeline must fit in shared memory
+        if (BLOCK_M + BLOCK_N) * BLOCK_K * dtsize * config.num_stages > max_shared:
+            continue
+        # deep pipelines need enough iterations to be filled
+        if config.num_stages > 2 and config.num_stages > triton.cdiv(K // SPLIT_K, BLOCK_K):
+            continue
+        # split-k slices must cover K exactly, and only pay off
+        # when the output tiles alone cannot fill the GPU
+        if SPLIT_K > 1:
+            if K % SPLIT_K != 0 or K // SPLIT_K < BLOCK_K:
+                continue
+            if tiles >= num_sms:
+                continue
+        # stream-k only differs from the data-parallel schedule when the last wave is partial
+        if STREAM_K and tiles % (num_sms * STREAM_K) == 0:
+            continue
+        pruned.append(config)
+    # ranks the remaining candidates by SM utilization and arithmetic intensity
+    def score(config):
+        BLOCK_M, BLOCK_N, SPLIT_K, STREAM_K = [config.meta[x] for x in ['BLOCK_M', 'BLOCK_N', 'SPLIT_K', 'STREAM_K']]
+        grid_m, grid_n = triton.cdiv(M, BLOCK_M), triton.cdiv(N, BLOCK_N)
+        tiles = grid_m * grid_n * SPLIT_K * Z
+        waves = triton.cdiv(tiles, num_sms)
+        # stream-k balances the work of all programs
+        occupancy = 1. if STREAM_K else tiles / (waves * num_sms)
+        padding = (M / (grid_m * BLOCK_M)) * (N / (grid_n * BLOCK_N))
+        intensity = BLOCK_M * BLOCK_N / (BLOCK_M + BLOCK_N)
+        return occupancy * padding * intensity
+
+    if not pruned:
+        # always keep the smallest tile around
+        configs = [c for c in configs if c.meta['SPLIT_K'] == 1 and not c.meta['STREAM_K'] and c.meta['BLOCK_K'] in _block_k[dtype]]
+        return [min(configs, key=lambda c: (c.meta['BLOCK_M'] + c.meta['BLOCK_N']) * c.meta['BLOCK_K'] * c.num_stages)]
+    return sorted(pruned, key=score, reverse=True)[:top_k]
 
 
-@triton.heuristics({
-    'EVEN_K': lambda *args, **meta: args[5] % (meta['BLOCK_K'] * meta['SPLIT_K']) == 0,
-})
-@triton.autotune(
-    configs=[
-        triton.Config({'BLOCK_M': 128, 'BLOCK_N': 128, 'BLOCK_K': 32, 'SPLIT_K': 1, 'GROUP_M': 8}, num_warps=4),
-        # triton.Config({'BLOCK_M': 64 , 'BLOCK_N': 128, 'BLOCK_K': 32, 'SPLIT_K': 1, 'GROUP_M': 8}, num_warps=4),\
-        # triton.Config({'BLOCK_M': 128, 'BLOCK_N': 64 , 'BLOCK_K': 32, 'SPLIT_K': 1, 'GROUP_M': 8}, num_warps=4),\
-        # triton.Config({'BLOCK_M': 64 , 'BLOCK_N': 64 , 'BLOCK_K': 64, 'SPLIT_K': 1, 'GROUP_M': 8}, num_warps=4),\
-        # triton.Config({'BLOCK_M': 32 , 'BLOCK_N': 128, 'BLOCK_K': 64, 'SPLIT_K': 1, 'GROUP_M': 8}, num_warps=4),
-        # triton.Config({'BLOCK_M': 128, 'BLOCK_N': 32 , 'BLOCK_K': 64, 'SPLIT_K': 1, 'GROUP_M': 8}, num_warps=4),\
-        # triton.Config({'BLOCK_M': 64 , 'BLOCK_N': 32 , 'BLOCK_K': 64, 'SPLIT_K': 1, 'GROUP_M': 8}, num_warps=2),\
-        # triton.Config({'BLOCK_M': 32 , 'BLOCK_N': 64 , 'BLOCK_K': 64, 'SPLIT_K': 1, 'GROUP_M': 8}, num_warps=2),
-    ],
-    key=['M', 'N', 'K']
-)
 @triton.jit
-def _kernel(A, B, C, M, N, K, stride_am, stride_ak, stride_bk, stride_bn, stride_cm, stride_cn, LOCKS, **META):
-    # extract meta-parameters
+def _epilogue(acc, rm, rn, M, N, BIAS, D, stride_dm, stride_dn, R, stride_rm, stride_rn, PRE, stride_cm, stride_cn,
+              alpha, beta, **META):
+    # computes activation(alpha * acc + beta * D + BIAS) + R in registers
+    # when EPILOGUE is set, and returns the accumulator as is otherwise
+    if META['EPILOGUE']:
+        mask = (rm < M)[:, None] & (rn < N)[None, :]
+        acc = acc.to(tl.float32) * alpha
+        if META['HAS_C']:
+            d = tl.load(D + (rm[:, None] * stride_dm + rn[None, :] * stride_dn), mask=mask, other=0.)
+            acc += d.to(tl.float32) * beta
+        if META['HAS_BIAS']:
+            bias = tl.load(BIAS + rn, mask=rn < N, other=0.)
+            acc += bias.to(tl.float32)[None, :]
+        # the pre-activation output is needed to differentiate the activation
+        if META['SAVE_PRE']:
+            tl.store(PRE + (rm[:, None] * stride_cm + rn[None, :] * stride_cn), acc, mask=mask)
+        if META['ACTIVATION'] == 'relu':
+            acc = tl.where(acc > 0, acc, 0.)
+        if META['ACTIVATION'] == 'gelu':
+            acc = tl.gelu(acc)
+        if META['HAS_RESIDUAL']:
+            r = tl.load(R + (rm[:, None] * stride_rm + rn[None, :] * stride_rn), mask=mask, other=0.)
+            acc += r.to(tl.float32)
+    return acc
+
+
+@triton.jit
+def _prologue(g, X, mask, **META):
+    # scales the gradient `g` with respect to the output of an activation by its derivative,
+    # evaluated from the input or, for relu, the output of the activation `X`
+    if META['EVEN_K']:
+        x = tl.load(X)
+    else:
+        x = tl.load(X, mask=mask, other=0.)
+    if META['PROLOGUE'] == 'relu':
+        g = g * (x > 0).to(g.dtype)
+    if META['PROLOGUE'] == 'gelu':
+        x = x.to(tl.float32)
+        cdf = 0.5 * (1 + tl.erf(x * 0.7071067811865476))
+        pdf = tl.exp(-0.5 * x * x) * 0.3989422804014327
+        g = (g.to(tl.float32) * (cdf + x * pdf)).to(g.dtype)
+    return g
+
+
+@triton.jit
+def _stream_k_tile(A, B, C, M, N, K, stride_am, stride_ak, stride_bk, stride_bn, stride_cm, stride_cn, WORKSPACE, COUNTERS,
+                   BIAS, D, stride_dm, stride_dn, R, stride_rm, stride_rn, PRE, X, stride_x0, stride_x1, alpha, beta,
+                   Z1, stride_az0, stride_az1, stride_bz0, stride_bz1, stride_cz0, stride_cz1, stride_dz0, stride_dz1,
+                   stride_rz0, stride_rz1, stride_xz0, stride_xz1, tile, i0, i1, iters, **META):
+    # computes the K-iterations [i0, i1) of output tile `tile`, out of `iters`;
+    # incomplete tiles are reduced in the fp32 workspace as for split-k
     BLOCK_M = META['BLOCK_M']
     BLOCK_N = META['BLOCK_N']
     BLOCK_K = META['BLOCK_K']
     GROUP_M = META['GROUP_M']
-    SPLIT_K = META['SPLIT_K']
-    # matrix multiplication
-    pid = tl.program_id(0)
-    pid_z = tl.program_id(1)
     grid_m = (M + BLOCK_M - 1) // BLOCK_M
     grid_n = (N + BLOCK_N - 1) // BLOCK_N
-    # re-order program ID for better L2 performance
+    pid_batch = tile // (grid_m * grid_n)
+    pid = tile % (grid_m * grid_n)
+    z0 = pid_batch // Z1
+    z1 = pid_batch % Z1
+    # re-order tile index for better L2 performance
     width = GROUP_M * grid_n
     group_id = pid // width
     group_size = min(grid_m - group_id * GROUP_M, GROUP_M)
     pid_m = group_id * GROUP_M + (pid % group_size)
     pid_n = (pid % width) // (group_size)
-    # do matrix multiplication
     rm = pid_m * BLOCK_M + tl.arange(0, BLOCK_M)
     rn = pid_n * BLOCK_N + tl.arange(0, BLOCK_N)
     rk = tl.arange(0, BLOCK_K)
-    # pointers
-    K = K // SPLIT_K
-    A = A + (pid_z * K * stride_ak + rm[:, None] * stride_am + rk[None, :] * stride_ak)
-    B = B + (pid_z * K * stride_bk + rk[:, None] * stride_bk + rn[None, :] * stride_bn)
+    A = A + (z0 * stride_az0 + z1 * stride_az1 + i0 * BLOCK_K * stride_ak + rm[:, None] * stride_am + rk[None, :] * stride_ak)
+    B = B + (z0 * stride_bz0 + z1 * stride_bz1 + i0 * BLOCK_K * stride_bk + rk[:, None] * stride_bk + rn[None, :] * stride_bn)
+    if META['PROLOGUE']:
+        if META['PROLOGUE_B']:
+            X = X + (z0 * stride_xz0 + z1 * stride_xz1 + i0 * BLOCK_K * stride_x0 + rk[:, None] * stride_x0 + rn[None, :] * stride_x1)
+        else:
+            X = X + (z0 * stride_xz0 + z1 * stride_xz1 + i0 * BLOCK_K * stride_x1 + rm[:, None] * stride_x0 + rk[None, :] * stride_x1)
     acc = tl.zeros((BLOCK_M, BLOCK_N), dtype=tl.float32)
-    for k in range(K, 0, -BLOCK_K):
+    for k in range(K - i0 * BLOCK_K, K - i1 * BLOCK_K, -BLOCK_K):
         if META['EVEN_K']:
             a = tl.load(A)
             b = tl.load(B)
         else:
             a = tl.load(A, mask=rk[None, :] < k, other=0.)
             b = tl.load(B, mask=rk[:, None] < k, other=0.)
+        if META['PROLOGUE']:
+            if META['PROLOGUE_B']:
+                b = _prologue(b, X, rk[:, None] < k)
+                X += BLOCK_K * stride_x0
+            else:
+                a = _prologue(a, X, rk[None, :] < k)
+                X += BLOCK_K * stride_x1
         acc += tl.dot(a, b)
         A += BLOCK_K * stride_ak
         B += BLOCK_K * stride_bk
-    acc = acc.to(tl.float16)
-    # rematerialize rm and rn to save registers
-    rm = pid_m * BLOCK_M + tl.arange(0, BLOCK_M)
-    rn = pid_n * BLOCK_N + tl.arange(0, BLOCK_N)
-    C = C + (rm[:, None] * stride_cm + rn[None, :] * stride_cn)
+    # write-back
+    C = C + (z0 * stride_cz0 + z1 * stride_cz1 + rm[:, None] * stride_cm + rn[None, :] * stride_cn)
     mask = (rm < M)[:, None] & (rn < N)[None, :]
-    # handles write-back with reduction-splitting
-    if SPLIT_K == 1:
+    D = D + (z0 * stride_dz0 + z1 * stride_dz1)
+    R = R + (z0 * stride_rz0 + z1 * stride_rz1)
+    PRE = PRE + (z0 * stride_cz0 + z1 * stride_cz1)
+    if i1 - i0 == iters:
+        acc = _epilogue(acc, rm, rn, M, N, BIAS, D, stride_dm, stride_dn, R, stride_rm, stride_rn, PRE, stride_cm, stride_cn,
+                        alpha, beta)
         tl.store(C, acc, mask=mask)
     else:
-        LOCKS = LOCKS + tl.program_id(0)
-        COUNT = LOCKS + tl.num_programs(0)
-        while tl.atomic_cas(LOCKS, 0, 1) == 1:
-            pass
-        count = tl.load(COUNT)
-        if count == 0:
+        # the counter of a tile tracks how many of its K-iterations are done
+        W = WORKSPACE + (pid_batch * M * N + rm[:, None] * N + rn[None, :])
+        COUNTER = COUNTERS + tile
+        tl.atomic_add(W, acc, mask=mask)
+        count = tl.atomic_add(COUNTER, i1 - i0)
+        if count + (i1 - i0) == iters:
+            acc = tl.load(W, mask=mask, other=0.)
+            tl.store(W, tl.zeros((BLOCK_M, BLOCK_N), dtype=tl.float32), mask=mask)
+            tl.atomic_xchg(COUNTER, 0)
+            acc = _epilogue(acc, rm, rn, M, N, BIAS, D, stride_dm, stride_dn, R, stride_rm, stride_rn, PRE, stride_cm,
+                            stride_cn, alpha, beta)
+            tl.store(C, acc, mask=mask)
+
+
+def _split_k_workspace(fn):
+    # passes the zero-initialized fp32 workspace and per-tile counters through which
+    # split-k and stream-k programs reduce partial tiles, for these configurations only.
+    # kernels clear them once a tile is reduced, so they are taken from a per-device
+    # pool that only grows, and only needs to be zeroed when it does
+    idx = {name: i for i, name in enumerate(fn.arg_names)}
+    pool = dict()
+
+    def get(device, size, dtype):
+        buf = pool.get((device, dtype))
+        if buf is None or buf.numel() < size:
+            buf = torch.zeros(size, dtype=dtype, device=device)
+            pool[(device, dtype)] = buf
+        return buf
+
+    def wrapper(kernel):
+        def fun(*args, **meta):
+            if meta['SPLIT_K'] > 1 or meta['STREAM_K']:
+                M, N, Z0, Z1 = [args[idx[name]] for name in ['M', 'N', 'Z0', 'Z1']]
+                device = args[idx['A']].device
+                tiles = triton.cdiv(M, meta['BLOCK_M']) * triton.cdiv(N, meta['BLOCK_N']) * Z0 * Z1
+                args = list(args)
+                args[idx['WORKSPACE']] = get(device, Z0 * Z1 * M * N, torch.float32)
+                args[idx['COUNTERS']] = get(device, tiles, torch.int32)
+            return kernel(*args, **meta)
+
+        return fun
+
+    fn.kernel_decorators.append(wrapper)
+    return fn
+
+
+# decorators listed first are applied last: the workspace is allocated once
+# the auto-tuner has selected a configuration
+@_split_k_workspace
+@triton.heuristics({
+    'EVEN_K': lambda *args, **meta: args[5] % (meta['BLOCK_K'] * meta['SPLIT_K']) == 0,
+})
+@triton.autotune(
+    configs=get_all_configs(),
+    # gradients reuse the kernel on transposed views, whose best configuration differs
+    key=['M', 'N', 'K', 'stride_am', 'stride_ak', 'stride_bk', 'stride_bn'],
+    prune_configs_by=prune_configs,
+)
+@triton.jit
+def _kernel(A, B, C, M, N, K, stride_am, stride_ak, stride_bk, stride_bn, stride_cm, stride_cn, WORKSPACE, COUNTERS,
+            BIAS, D, stride_dm, stride_dn, R, stride_rm, stride_rn, PRE, X, stride_x0, stride_x1, alpha, beta,
+            Z0, Z1, stride_az0, stride_az1, stride_bz0, stride_bz1, stride_cz0, stride_cz1, stride_dz0, stride_dz1,
+            stride_rz0, stride_rz1, stride_xz0, stride_xz1, **META):
+    # extract meta-parameters
+    BLOCK_M = META['BLOCK_M']
+    BLOCK_N = META['BLOCK_N']
+    BLOCK_K = META['BLOCK_K']
+    GROUP_M = META['GROUP_M']
+    SPLIT_K = META['SPLIT_K']
+    if META['STREAM_K']:
+        # persistent programs process the full waves of tiles one at a time, and
+        # share the K-iterations of the remaining tiles evenly (stream-k), so that
+        # a last wave with few tiles does not leave most of the GPU idle
+        pid = tl.program_id(0)
+        num_pids = tl.num_programs(0)
+        tiles = ((M + BLOCK_M - 1) // BLOCK_M) * ((N + BLOCK_N - 1) // BLOCK_N) * Z0 * Z1
+        iters = (K + BLOCK_K - 1) // BLOCK_K
+        dp_tiles = tiles - tiles % num_pids
+        for tile in range(pid, dp_tiles, num_pids):
+            _stream_k_tile(A, B, C, M, N, K, stride_am, stride_ak, stride_bk, stride_bn, stride_cm, stride_cn, WORKSPACE,
+                           COUNTERS, BIAS, D, stride_dm, stride_dn, R, stride_rm, stride_rn, PRE, X, stride_x0, stride_x1, alpha, beta,
+                           Z1, stride_az0, stride_az1, stride_bz0, stride_bz1, stride_cz0, stride_cz1, stride_dz0, stride_dz1,
+                           stride_rz0, stride_rz1, stride_xz0, stride_xz1, tile, 0, iters, iters)
+        sk_iters = (tiles - dp_tiles) * iters
+        it = dp_tiles * iters + pid * sk_iters // num_pids
+        it_end = dp_tiles * iters + (pid + 1) * sk_iters // num_pids
+        while it < it_end:
+            tile = it // iters
+            i0 = it % iters
+            i1 = tl.minimum(iters, i0 + (it_end - it))
+            _stream_k_tile(A, B, C, M, N, K, stride_am, stride_ak, stride_bk, stride_bn, stride_cm, stride_cn, WORKSPACE,
+                           COUNTERS, BIAS, D, stride_dm, stride_dn, R, stride_rm, stride_rn, PRE, X, stride_x0, stride_x1, alpha, beta,
+                           Z1, stride_az0, stride_az1, stride_bz0, stride_bz1, stride_cz0, stride_cz1, stride_dz0, stride_dz1,
+                           stride_rz0, stride_rz1, stride_xz0, stride_xz1, tile, i0, i1, iters)
+            it += i1 - i0
+    else:
+        # matrix multiplication
+        pid = tl.program_id(0)
+        pid_z = tl.program_id(1)
+        # the batch index is decomposed along two batch dimensions,
+        # whose stride is zero for broadcast operands
+        pid_batch = tl.program_id(2)
+        z0 = pid_batch // Z1
+        z1 = pid_batch % Z1
+        grid_m = (M + BLOCK_M - 1) // BLOCK_M
+        grid_n = (N + BLOCK_N - 1) // BLOCK_N
+        # re-order program ID for better L2 performance
+        width = GROUP_M * grid_n
+        group_id = pid // width
+        group_size = min(grid_m - group_id * GROUP_M, GROUP_M)
+        pid_m = group_id * GROUP_M + (pid % group_size)
+        pid_n = (pid % width) // (group_size)
+        # do matrix multiplication
+        rm = pid_m * BLOCK_M + tl.arange(0, BLOCK_M)
+        rn = pid_n * BLOCK_N + tl.arange(0, BLOCK_N)
+        rk = tl.arange(0, BLOCK_K)
+        # pointers
+        K = K // SPLIT_K
+        A = A + (z0 * stride_az0 + z1 * stride_az1 + pid_z * K * stride_ak + rm[:, None] * stride_am + rk[None, :] * stride_ak)
+        B = B + (z0 * stride_bz0 + z1 * stride_bz1 + pid_z * K * stride_bk + rk[:, None] * stride_bk + rn[None, :] * stride_bn)
+        # gradients of activations are computed while loading the incoming gradient operand
+        if META['PROLOGUE']:
+            if META['PROLOGUE_B']:
+                X = X + (z0 * stride_xz0 + z1 * stride_xz1 + pid_z * K * stride_x0 + rk[:, None] * stride_x0 + rn[None, :] * stride_x1)
+            else:
+                X = X + (z0 * stride_xz0 + z1 * stride_xz1 + pid_z * K * stride_x1 + rm[:, None] * stride_x0 + rk[None, :] * stride_x1)
+        acc = tl.zeros((BLOCK_M, BLOCK_N), dtype=tl.float32)
+        for k in range(K, 0, -BLOCK_K):
+            if META['EVEN_K']:
+                a = tl.load(A)
+                b = tl.load(B)
+            else:
+                a = tl.load(A, mask=rk[None, :] < k, other=0.)
+                b = tl.load(B, mask=rk[:, None] < k, other=0.)
+            if META['PROLOGUE']:
+                if META['PROLOGUE_B']:
+                    b = _prologue(b, X, rk[:, None] < k)
+                    X += BLOCK_K * stride_x0
+                else:
+                    a = _prologue(a, X, rk[None, :] < k)
+                    X += BLOCK_K * stride_x1
+            acc += tl.dot(a, b)
+            A += BLOCK_K * stride_ak
+            B += BLOCK_K * stride_bk
+        C = C + (z0 * stride_cz0 + z1 * stride_cz1 + rm[:, None] * stride_cm + rn[None, :] * stride_cn)
+        mask = (rm < M)[:, None] & (rn < N)[None, :]
+        D = D + (z0 * stride_dz0 + z1 * stride_dz1)
+        R = R + (z0 * stride_rz0 + z1 * stride_rz1)
+        PRE = PRE + (z0 * stride_cz0 + z1 * stride_cz1)
+        # handles write-back with reduction-splitting;
+        # the epilogue is applied once the reduction is complete
+        if SPLIT_K == 1:
+            acc = _epilogue(acc, rm, rn, M, N, BIAS, D, stride_dm, stride_dn, R, stride_rm, stride_rn, PRE, stride_cm, stride_cn,
+                            alpha, beta)
             tl.store(C, acc, mask=mask)
         else:
-            curr = tl.load(C, mask=mask, other=0.)
-            tl.store(C, acc + curr, mask=mask)
-        tl.atomic_xchg(COUNT, (count + 1) % SPLIT_K)
-        tl.atomic_xchg(LOCKS, 0)
+            # partial sums are accumulated in an fp32 workspace without locks;
+            # the last program to arrive on a tile applies the epilogue and
+            # clears its part of the workspace for the next launch
+            W = WORKSPACE + (pid_batch * M * N + rm[:, None] * N + rn[None, :])
+            COUNTER = COUNTERS + (pid_batch * tl.num_programs(0) + pid)
+            tl.atomic_add(W, acc, mask=mask)
+            count = tl.atomic_add(COUNTER, 1)
+            if count == SPLIT_K - 1:
+                acc = tl.load(W, mask=mask, other=0.)
+                tl.store(W, tl.zeros((BLOCK_M, BLOCK_N), dtype=tl.float32), mask=mask)
+                tl.atomic_xchg(COUNTER, 0)
+                acc = _epilogue(acc, rm, rn, M, N, BIAS, D, stride_dm, stride_dn, R, stride_rm, stride_rn, PRE, stride_cm,
+                                stride_cn, alpha, beta)
+                tl.store(C, acc, mask=mask)
+
+
+def _broadcast_batch(*shapes):
+    ndim = max(len(shape) for shape in shapes)
+    shapes = [(1, ) * (ndim - len(shape)) + tuple(shape) for shape in shapes]
+    ret = []
+    for sizes in zip(*shapes):
+        size = max(sizes)
+        assert all(s in [1, size] for s in sizes), "incompatible batch dimensions"
+        ret.append(size)
+    return tuple(ret)
+
+
+def _reduce_to(x, shape):
+    # sums the gradient `x` of a broadcast operand back to the operand's `shape`
+    x = x.sum(tuple(range(x.dim() - len(shape)))) if x.dim() > len(shape) else x
+    dims = tuple(d for d, s in enumerate(shape) if s == 1 and x.shape[d] != 1)
+    return x.sum(dims, keepdim=True) if dims else x
+
+
+def _activation_grad(activation, dout, x):
+    # gradient with respect to the input of `activation`, given the gradient `dout`
+    # with respect to its output, and its input or, for relu, its output `x`
+    if activation == 'relu':
+        return dout * (x > 0).to(dout.dtype)
+    x = x.float()
+    cdf = 0.5 * (1 + torch.erf(x * 0.7071067811865476))
+    pdf = torch.exp(-0.5 * x * x) * 0.3989422804014327
+    return (dout.float() * (cdf + x * pdf)).to(dout.dtype)
 
 
 class _matmul(torch.autograd.Function):
     kernel = _kernel
 
-    _locks = dict()
-
     @staticmethod
-    def _call(a, b):
+    def _call(a, b, bias=None, activation=None, alpha=1., beta=0., c=None, residual=None, save_pre=False, out_dtype=None, out=None,
+              prologue=None, x=None, prologue_b=False):
+        # `prologue` is the activation whose derivative, evaluated from `x`, scales
+        # `a` (or `b` if `prologue_b` is set), which is the gradient of its output
         device = a.device
-        # handle non-contiguous inputs if necessary
-        if a.stride(0) > 1 and a.stride(1) > 1:
-            a = a.contiguous()
-        if b.stride(0) > 1 and b.stride(1) > 1:
-            b = b.contiguous()
+        # inputs are never copied: the kernel is specialized on its strides, i.e.,
+        # row-major (stride_ak == 1), column-major (stride_am == 1) and general strides
+        # are compiled separately, along with the power-of-two divisibility of each stride
         # checks constraints
-        assert a.shape[1] == b.shape[0], "incompatible dimensions"
-        M, K = a.shape
-        _, N = b.shape
-        # allocates output
-        c = torch.empty((M, N), device=device, dtype=a.dtype)
-        # allocate locks for split-k
-        if a.device not in _matmul._locks:
-            _matmul._locks[device] = torch.zeros(1024 * 1024, dtype=torch.int32, device=device)
-        locks = _matmul._locks[device]
+        assert 2 <= a.dim() <= 4 and 2 <= b.dim() <= 4, "only 2D, 3D and 4D inputs are supported"
+        assert a.shape[-1] == b.shape[-2], "incompatible dimensions"
+        assert a.dtype == b.dtype, "inputs must have the same data-type"
+        assert a.dtype in _block_k, f"unsupported data-type {a.dtype}"
+        if out_dtype is None and out is not None:
+            out_dtype = out.dtype
+        if out_dtype is None:
+            out_dtype = a.dtype
+        assert out_dtype.is_floating_point, f"unsupported output data-type {out_dtype}"
+        epilogue = alpha != 1 or c is not None or bias is not None or activation is not None \
+                   or residual is not None or save_pre
+        M, K = a.shape[-2:]
+        N = b.shape[-1]
+        assert activation in [None, 'relu', 'gelu'], f"unsupported activation {activation}"
+        assert prologue in [None, 'relu', 'gelu'], f"unsupported activation {prologue}"
+        assert prologue is None or x.shape == (b if prologue_b else a).shape, "incompatible activation shape"
+        assert bias is None or bias.shape == (N, ), "incompatible bias shape"
+        # batch dimensions are broadcast against each other
+        batch = _broadcast_batch(a.shape[:-2], b.shape[:-2])
+
+        def view(x, shape):
+            # expands `x` to the batch shape without copies, viewed as 4D
+            x = x.expand(batch + shape)
+            while x.dim() < 4:
+                x = x.unsqueeze(0)
+            return x
+
+        a, b = view(a, (M, K)), view(b, (K, N))
+        Z0, Z1 = a.shape[:2]
+        assert Z0 * Z1 <= 65535, "too many batch elements"
+        # allocates output, unless provided by the caller
+        if out is None:
+            out = torch.empty(batch + (M, N), device=device, dtype=out_dtype)
+        if out.shape != batch + (M, N) or out.dtype != out_dtype or out.device != device:
+            raise ValueError(f"Expected output of shape {batch + (M, N)}, type {out_dtype} on device {device}; "
+                             f"got shape {tuple(out.shape)}, type {out.dtype} on device {out.device}")
+        # the kernel writes through the strides of `out`, which may be row- or column-major
+        if not out.is_contiguous() and not out.transpose(-1, -2).is_contiguous():
+            raise ValueError("Expected a row- or column-major contiguous output")
+        pre = torch.empty(batch + (M, N), device=device, dtype=out_dtype) if save_pre else None
+        out_ = view(out, (M, N))
+        pre_ = out_ if pre is None else view(pre, (M, N))
+        # unused epilogue operands, as well as the split-k workspace and counters of
+        # configurations that do not reduce across programs, point to `out` and are never accessed
+        bias_ = out if bias is None else bias
+        c_ = out_ if c is None else view(c, (M, N))
+        residual_ = out_ if residual is None else view(residual, (M, N))
+        x_ = (b if prologue_b else a) if prologue is None else view(x, (K, N) if prologue_b else (M, K))
         # launch kernel
-        grid = lambda META: (triton.cdiv(M, META['BLOCK_M']) * triton.cdiv(N, META['BLOCK_N']), META['SPLIT_K'])
-        _kernel[grid](a, b, c, M, N, K, a.stride(0), a.stride(1), b.stride(0), b.stride(1), c.stride(0), c.stride(1), locks)
+        num_sms = torch.cuda.get_device_properties(device).multi_processor_count
+        grid = lambda META: (num_sms * META['STREAM_K'], 1, 1) if META['STREAM_K'] else \
+            (triton.cdiv(M, META['BLOCK_M']) * triton.cdiv(N, META['BLOCK_N']), META['SPLIT_K'], Z0 * Z1)
+        _kernel[grid](a, b, out_, M, N, K, a.stride(2), a.stride(3), b.stride(2), b.stride(3), out_.stride(2), out_.stride(3), out_, out_,
+                      bias_, c_, c_.stride(2), c_.stride(3), residual_, residual_.stride(2), residual_.stride(3), pre_,
+                      x_, x_.stride(2), x_.stride(3), float(alpha), float(beta), Z0, Z1, a.stride(0), a.stride(1), b.stride(0), b.stride(1),
+                      out_.stride(0), out_.stride(1), c_.stride(0), c_.stride(1), residual_.stride(0), residual_.stride(1),
+                      x_.stride(0), x_.stride(1), HAS_BIAS=bias is not None, HAS_C=c is not None, HAS_RESIDUAL=residual is not None,
+                      ACTIVATION=activation or '', SAVE_PRE=save_pre, EPILOGUE=epilogue,
+                      PROLOGUE=prologue or '', PROLOGUE_B=prologue_b)
         # done
-        return c
+        return out, pre
 
     @staticmethod
-    def forward(ctx, a, b):
-        return _matmul._call(a, b)
+    def forward(ctx, a, b, bias=None, activation=None, alpha=1., beta=0., c=None, residual=None, out_dtype=None, out=None):
+        # relu is differentiated from its output, so that no pre-activation output is saved,
+        # unless a residual is added to it; gelu is not invertible and is differentiated from its input
+        save_pre = (activation == 'gelu' or (activation == 'relu' and residual is not None)) and any(ctx.needs_input_grad)
+        if out is not None:
+            ctx.mark_dirty(out)
+        out, pre = _matmul._call(a, b, bias, activation, alpha, beta, c, residual, save_pre, out_dtype, out)
+        x = pre if save_pre else out if activation == 'relu' else None
+        # save for backward; da only needs b and db only needs a
+        ctx.save_for_backward(a if ctx.needs_input_grad[1] else None, b if ctx.needs_input_grad[0] else None, x)
+        ctx.a_shape, ctx.b_shape = a.shape, b.shape
+        ctx.activation = activation
+        ctx.dtype = a.dtype
+        ctx.alpha, ctx.beta = alpha, beta
+        ctx.bias_dtype = None if bias is None else bias.dtype
+        ctx.c_shape = None if c is None else c.shape
+        ctx.residual_shape = None if residual is None else residual.shape
+        return out
+
+    @staticmethod
+    def backward(ctx, dout):
+        a, b, x = ctx.saved_tensors
+        # gradients have the data-type of the inputs, whatever the output's
+        dtype = ctx.dtype
+        activation = ctx.activation
+        # the gradient with respect to the pre-activation output is computed in the prologue
+        # of the kernels computing da and db, unless it is needed on its own
+        dpre = dout
+        if activation is not None and (dout.dtype != dtype or ctx.needs_input_grad[2] or ctx.needs_input_grad[6]):
+            dpre = _activation_grad(activation, dout, x)
+            activation = None
+        dpre = dpre.to(dtype)
+        da = db = dbias = dc = dresidual = None
+        # transposes are strided views handled by the kernel, and are never materialized
+        if ctx.needs_input_grad[0]:
+            da, _ = _matmul._call(dpre, b.transpose(-1, -2), alpha=ctx.alpha, out_dtype=dtype, prologue=activation, x=x)
+            da = _reduce_to(da, ctx.a_shape)
+        if ctx.needs_input_grad[1]:
+            K, N = ctx.b_shape[-2:]
+            if a.dim() > 2 and ctx.b_shape.numel() == K * N:
+                # the weight is shared across the batch: the batch is folded into the
+                # reduction rather than reduced afterwards, and the resulting long and
+                # narrow problem is left to the auto-tuner, which enables split-k
+                # only when the output tiles alone cannot fill the GPU
+                db, _ = _matmul._call(a.reshape(-1, K).t(), dpre.reshape(-1, N), alpha=ctx.alpha, out_dtype=dtype,
+                                      prologue=activation, x=None if x is None else x.reshape(-1, N), prologue_b=True)
+                db = db.reshape(ctx.b_shape)
+            else:
+                db, _ = _matmul._call(a.transpose(-1, -2), dpre, alpha=ctx.alpha, out_dtype=dtype,
+                                      prologue=activation, x=x, prologue_b=True)
+                db = _reduce_to(db, ctx.b_shape)
+        if ctx.needs_input_grad[2]:
+            dbias = dpre.float().reshape(-1, dpre.shape[-1]).sum(0).to(ctx.bias_dtype)
+        if ctx.needs_input_grad[6]:
+            dc = _reduce_to(dpre * ctx.beta, ctx.c_shape)
+        if ctx.needs_input_grad[7]:
+            dresidual = _reduce_to(dout, ctx.residual_shape)
+        return da, db, dbias, None, None, None, dc, dresidual, None, None
+
+
+def matmul(a, b, bias=None, activation=None, alpha=1., beta=0., c=None, residual=None, out_dtype=None, out=None):
+    """
+    Computes :code:`activation(alpha * (a @ b) + beta * c + bias) + residual`, where every
+    term after the matrix product is optional and fused into the kernel's epilogue.
+    Inputs with up to two leading batch dimensions are multiplied in a single launch,
+    with batch dimensions of size one broadcast as in :code:`torch.matmul`.
+    Inputs may be :code:`float16`, :code:`bfloat16` or :code:`float32`;
+    products are accumulated in :code:`float32`.
+
+    :param a: the left-hand side matrix, of shape (..., M, K)
+    :param b: the right-hand side matrix, of shape (..., K, N)
+    :param bias: a vector of shape (N, ) added to every row
+    :param activation: :code:`None`, :code:`'relu'` or :code:`'gelu'`
+    :param alpha: the scale of :code:`a @ b`
+    :param beta: the scale of :code:`c`
+    :param c: an existing matrix, broadcastable to the shape of the output
+    :param residual: a matrix broadcastable to the shape of the output, added after the activation
+    :param out_dtype: the floating-point data-type of the output; defaults to the data-type of the inputs
+    :param out: an optional pre-allocated row- or column-major output, written in-place, which must not overlap with any input;
+        e.g., to reuse buffers across calls or to capture steady-state loops in CUDA graphs
+    """
+    return _matmul.apply(a, b, bias, activation, alpha, beta, c, residual, out_dtype, out)
+
+
+# -----------------------------
+# grouped matrix multiplication
+# -----------------------------
 
 
-matmul = _matmul.apply
+def get_configs_grouped():
+    configs = []
+    for block_m, block_n, num_stages, num_warps in [
+        (128, 128, 3, 4), (128, 64, 4, 4), (64, 128, 4, 4), (64, 64, 4, 4), (32, 64, 4, 2), (16, 64, 4, 2),
+    ]:
+        meta = {'BLOCK_M': block_m, 'BLOCK_N': block_n, 'BLOCK_K': 32, 'GROUP_M': 8}
+        configs.append(triton.Config(meta, num_stages=num_stages, num_warps=num_warps))
+    return configs
+
+
+def prune_configs_grouped(configs, named_args):
+    # tiles larger than the largest problem only compute padding
+    pruned = [c for c in configs if c.meta['BLOCK_M'] <= max(16, named_args['MAX_M']) \
+              and c.meta['BLOCK_N'] <= max(64, named_args['MAX_N'])]
+    return pruned or configs[-1:]
+
+
+@triton.autotune(
+    configs=get_configs_grouped(),
+    # problem sizes are rounded to powers of two, so that groups whose shapes
+    # vary slightly from call to call (e.g., tokens routed to experts) reuse their configuration
+    key=['G', 'MAX_M', 'MAX_N', 'MAX_K'],
+    prune_configs_by=prune_configs_grouped,
+)
+@triton.jit
+def _grouped_kernel(A, B, C, TABLE, G, MAX_M, MAX_N, MAX_K, **META):
+    # TABLE holds 9 int64 entries per problem: the element offsets of A, B and C with
+    # respect to the given base pointers; M, N and K; the leading strides of A, B and C
+    # extract meta-parameters
+    BLOCK_M = META['BLOCK_M']
+    BLOCK_N = META['BLOCK_N']
+    BLOCK_K = META['BLOCK_K']
+    GROUP_M = META['GROUP_M']
+    # finds the problem whose tiles contain this program
+    pid = tl.program_id(0)
+    DESC = TABLE
+    M = tl.load(DESC + 3).to(tl.int32)
+    N = tl.load(DESC + 4).to(tl.int32)
+    start = 0
+    end = ((M + BLOCK_M - 1) // BLOCK_M) * ((N + BLOCK_N - 1) // BLOCK_N)
+    while end <= pid:
+        DESC += 9
+        M = tl.load(DESC + 3).to(tl.int32)
+        N = tl.load(DESC + 4).to(tl.int32)
+        start = end
+        end += ((M + BLOCK_M - 1) // BLOCK_M) * ((N + BLOCK_N - 1) // BLOCK_N)
+    # problem descriptor; row-major operands whose offsets and
+    # leading strides are multiples of 8 elements when ALIGNED is set
+    K = tl.load(DESC + 5).to(tl.int32)
+    off_a = tl.load(DESC + 0)
+    off_b = tl.load(DESC + 1)
+    off_c = tl.load(DESC + 2)
+    stride_am = tl.load(DESC + 6).to(tl.int32)
+    stride_bk = tl.load(DESC + 7).to(tl.int32)
+    stride_cm = tl.load(DESC + 8).to(tl.int32)
+    if META['ALIGNED']:
+        off_a = tl.multiple_of(off_a, 8)
+        off_b = tl.multiple_of(off_b, 8)
+        off_c = tl.multiple_of(off_c, 8)
+        stride_am = tl.multiple_of(stride_am, 8)
+        stride_bk = tl.multiple_of(stride_bk, 8)
+        stride_cm = tl.multiple_of(stride_cm, 8)
+    # re-order tile index for better L2 performance
+    pid = pid - start
+    grid_m = (M + BLOCK_M - 1) // BLOCK_M
+    grid_n = (N + BLOCK_N - 1) // BLOCK_N
+    width = GROUP_M * grid_n
+    group_id = pid // width
+    group_size = min(grid_m - group_id * GROUP_M, GROUP_M)
+    pid_m = group_id * GROUP_M + (pid % group_size)
+    pid_n = (pid % width) // (group_size)
+    # do matrix multiplication; out-of-bounds rows and columns
+    # wrap around and are masked when writing back
+    rm = pid_m * BLOCK_M + tl.arange(0, BLOCK_M)
+    rn = pid_n * BLOCK_N + tl.arange(0, BLOCK_N)
+    rk = tl.arange(0, BLOCK_K)
+    A = A + (off_a + (rm % M)[:, None] * stride_am + rk[None, :])
+    B = B + (off_b + rk[:, None] * stride_bk + (rn % N)[None, :])
+    acc = tl.zeros((BLOCK_M, BLOCK_N), dtype=tl.float32)
+    for k in range(K, 0, -BLOCK_K):
+        a = tl.load(A, mask=rk[None, :] < k, other=0.)
+        b = tl.load(B, mask=rk[:, None] < k, other=0.)
+        acc += tl.dot(a, b)
+        A += BLOCK_K
+        B += BLOCK_K * stride_bk
+    # write-back
+    C = C + (off_c + rm[:, None] * stride_cm + rn[None, :])
+    mask = (rm < M)[:, None] & (rn < N)[None, :]
+    tl.store(C, acc, mask=mask)
+
+
+def grouped_matmul(list_a, list_b):
+    """
+    Computes :code:`[a @ b for a, b in zip(list_a, list_b)]` in a single kernel launch, for
+    independent problems of different sizes (e.g., the experts of a mixture-of-experts layer).
+    Problem descriptors are packed into a table in device memory, and programs are mapped
+    to output tiles across all problems.
+
+    :param list_a: left-hand side matrices, of shapes (M_i, K_i)
+    :param list_b: right-hand side matrices, of shapes (K_i, N_i)
+    :return: the list of products, of shapes (M_i, N_i)
+    """
+    assert len(list_a) == len(list_b) and len(list_a) > 0, "expected as many left-hand side as right-hand side matrices"
+    device, dtype = list_a[0].device, list_a[0].dtype
+    for a, b in zip(list_a, list_b):
+        assert a.dim() == 2 and b.dim() == 2, "only 2D inputs are supported"
+        assert a.shape[1] == b.shape[0], "incompatible dimensions"
+        assert a.dtype == dtype and b.dtype == dtype, "all inputs must have the same data-type"
+        assert a.device == device and b.device == device, "all inputs must be on the same device"
+    # the kernel addresses row-major operands from the first matrix of each list
+    list_a = [a if a.stride(1) == 1 else a.contiguous() for a in list_a]
+    list_b = [b if b.stride(1) == 1 else b.contiguous() for b in list_b]
+    list_c = [torch.empty((a.shape[0], b.shape[1]), device=device, dtype=dtype) for a, b in zip(list_a, list_b)]
+    base_a, base_b, base_c = list_a[0], list_b[0], list_c[0]
+    offset = lambda x, base: (x.data_ptr() - base.data_ptr()) // x.element_size()
+    desc = []
+    for a, b, c in zip(list_a, list_b, list_c):
+        desc += [offset(a, base_a), offset(b, base_b), offset(c, base_c), a.shape[0], b.shape[1], a.shape[1],
+                 a.stride(0), b.stride(0), c.stride(0)]
+    table = torch.tensor(desc, dtype=torch.int64, device=device)
+    aligned = all(x % 8 == 0 for i, x in enumerate(desc) if i % 9 not in [3, 4, 5])
+    # launch kernel
+    shapes = [(a.shape[0], b.shape[1]) for a, b in zip(list_a, list_b)]
+    grid = lambda META: (sum(triton.cdiv(M, META['BLOCK_M']) * triton.cdiv(N, META['BLOCK_N']) for M, N in shapes), )
+    max_m, max_n, max_k = [next_power_of_2(max(max(x.shape[d] for x in xs), 1)) \
+                           for xs, d in [(list_a, 0), (list_b, 1), (list_a, 1)]]
+    if any(M * N > 0 for M, N in shapes):
+        _grouped_kernel[grid](base_a, base_b, base_c, table, len(list_a), max_m, max_n, max_k, ALIGNED=aligned)
+    return list_c